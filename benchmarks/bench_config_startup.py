@@ -0,0 +1,65 @@
+"""Benchmark cold session startup with and without the config snapshot.
+
+Each sample runs a fresh interpreter that loads the same configs as the
+session fixtures in conftest.py, so import and parse costs are included.
+
+    python benchmarks/bench_config_startup.py --runs 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+STARTUP_SCRIPT = """
+import sys, time
+sys.path.insert(0, {base_dir!r})
+from core import config_loader
+if not {use_snapshot}:
+    config_loader.SNAPSHOT_PATH = None
+from core.config_loader import load_env_config, load_run_config, load_data_config
+start = time.perf_counter()
+load_env_config("dev")
+load_run_config("chrome_local")
+for name in ("login_users", "users", "forms", "test_scenarios",
+             "api/endpoints", "api/payloads", "api/headers", "api/test_data",
+             "api/expected_responses", "db/connections", "db/queries", "db/test_data"):
+    load_data_config(name)
+print(time.perf_counter() - start)
+"""
+
+
+def run_samples(use_snapshot: bool, runs: int):
+    script = STARTUP_SCRIPT.format(base_dir=str(BASE_DIR), use_snapshot=use_snapshot)
+    load_times, process_times = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+        process_times.append(time.perf_counter() - start)
+        load_times.append(float(output.stdout.strip()))
+    return load_times, process_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BASE_DIR))
+    from core.config_snapshot import compile_snapshot
+    compile_snapshot()
+
+    for label, use_snapshot in (("yaml", False), ("snapshot", True)):
+        load_times, process_times = run_samples(use_snapshot, args.runs)
+        print(
+            f"{label:>9}: config load median {statistics.median(load_times) * 1000:.2f} ms, "
+            f"process median {statistics.median(process_times) * 1000:.1f} ms ({args.runs} runs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark per-row execute_insert against bulk seeding (execute_values and COPY).
+
+Needs a reachable database for the chosen environment. Rows are generated
+from the first users_to_insert entry with unique emails and removed again.
+
+    python benchmarks/bench_db_seeding.py --env dev --rows 5000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.db_helper import (  # noqa: E402
+    get_query,
+    get_test_data,
+    execute_insert,
+    seed_test_data,
+    cleanup_seeded_data,
+    close_all_pools
+)
+
+
+def generate_users(count: int, run_id: str):
+    template = get_test_data("users_to_insert")[0]
+    return [
+        {**template, "email": f"bench_{run_id}_{i}@test.example.com"}
+        for i in range(count)
+    ]
+
+
+def seed_per_row(rows, env):
+    insert_query = get_query("insert_queries", "insert_user")
+    return [
+        execute_insert(insert_query, params={key: row[key] for key in ("name", "email", "password_hash", "role")}, env=env)
+        for row in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--env", default="dev")
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    strategies = (
+        ("per-row", lambda rows: seed_per_row(rows, args.env)),
+        ("values", lambda rows: seed_test_data("users_to_insert", env=args.env, method="values", rows=rows)),
+        ("copy", lambda rows: seed_test_data("users_to_insert", env=args.env, method="copy", rows=rows)),
+    )
+    try:
+        for name, seed in strategies:
+            rows = generate_users(args.rows, f"{name}_{int(time.time())}")
+            start = time.perf_counter()
+            ids = seed(rows)
+            elapsed = time.perf_counter() - start
+            cleanup_seeded_data("users_to_insert", ids, env=args.env)
+            print(f"{name:>8}: {len(ids)} rows in {elapsed:.2f}s ({len(ids) / elapsed:,.0f} rows/sec)")
+    finally:
+        close_all_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark per-test UI login against injecting a cached session state.
+
+Needs Chrome and a reachable environment. Each iteration simulates the
+setup of one authenticated test on a fresh driver.
+
+    python benchmarks/bench_session_cache.py --env dev --run chrome_local --iterations 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.config_loader import load_env_config, load_run_config  # noqa: E402
+from core.driver_factory import create_driver  # noqa: E402
+from core.data_helper import get_role_credentials  # noqa: E402
+from core.session_cache import (  # noqa: E402
+    get_session_cache_options,
+    get_session_state,
+    inject_session_state,
+    invalidate_session_state,
+    ui_login
+)
+
+
+def time_setup(run_config, setup) -> float:
+    driver = create_driver(run_config)
+    try:
+        start = time.perf_counter()
+        setup(driver)
+        return time.perf_counter() - start
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--env", default="dev")
+    parser.add_argument("--run", default="chrome_local")
+    parser.add_argument("--role", default="valid_user")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    run_config = load_run_config(args.run)
+    base_url = load_env_config(args.env)["base_url"]
+    options = get_session_cache_options(run_config)
+    credentials = get_role_credentials(args.role)
+
+    invalidate_session_state(args.env, args.role)
+    state = {}
+    warm_up = time_setup(run_config, lambda driver: state.update(
+        get_session_state(args.env, args.role, base_url, driver=driver, run_config=run_config)
+    ))
+    print(f"first login + capture: {warm_up:.2f}s")
+
+    strategies = (
+        ("ui login", lambda driver: ui_login(driver, base_url, credentials)),
+        ("cached", lambda driver: inject_session_state(driver, state, options["inject_path"])),
+    )
+    for name, setup in strategies:
+        times = [time_setup(run_config, setup) for _ in range(args.iterations)]
+        print(f"{name:>9}: mean {statistics.mean(times):.2f}s, min {min(times):.2f}s per test")
+
+
+if __name__ == "__main__":
+    main()
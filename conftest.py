@@ -1,14 +1,36 @@
+import json
+import os
+from pathlib import Path
+
 import pytest
-from core.config_loader import load_env_config, load_run_config, load_data_config, load_api_config, load_db_config
+from core.config_loader import (
+    load_env_config,
+    load_run_config,
+    load_data_config,
+    load_api_config,
+    load_db_config,
+    get_cache_stats
+)
 from core.driver_factory import create_driver
+from core.driver_pool import DriverPool, apply_worker_count
+from core.session_cache import get_session_cache_options, get_session_state, inject_session_state
 from core.api_helper import (
     load_api_endpoints,
     load_api_payloads,
     load_api_headers,
     load_api_test_data,
     get_api_base_url,
-    get_headers
+    get_headers,
+    get_session,
+    get_session_stats,
+    get_latency_records,
+    get_latency_stats,
+    merge_latency_records,
+    close_all_sessions
 )
+from core.auth_tokens import get_token_stats, stop_token_refresh
+from core.env_fanout import FANOUT_ENV_VAR, parse_env_option, run_environments
+from core.load_runner import parse_load_option
 from core.db_helper import (
     load_db_connections,
     load_db_queries,
@@ -16,13 +38,24 @@ from core.db_helper import (
     get_db_config,
     create_connection,
     return_connection,
-    close_all_pools
+    transaction_scope,
+    get_pool_metrics,
+    close_all_pools,
+    set_db_override
 )
 from core.data_helper import (
     load_users,
     load_forms,
     load_test_scenarios
 )
+from core.browser_metrics import (
+    configure_browser_metrics,
+    drain_page_metrics,
+    get_browser_metrics_summary
+)
+from core.data_matrix import get_matrix_plan
+from core.cassettes import CASSETTE_MODES, configure_cassettes, save_cassettes
+from pages.base_page import get_locator_stats
 
 
 def pytest_addoption(parser):
@@ -30,7 +63,7 @@ def pytest_addoption(parser):
         "--env",
         action="store",
         default="dev",
-        help="Environment name: dev, stage, prod, etc.",
+        help="Environment name: dev, stage, prod, etc. A list (dev,stage) runs each concurrently and compares them",
     )
     parser.addoption(
         "--run",
@@ -38,6 +71,89 @@ def pytest_addoption(parser):
         default="chrome_local",
         help="Run config name: chrome_local, etc.",
     )
+    parser.addoption(
+        "--load",
+        action="store",
+        default=None,
+        help="Enable API load mode, e.g. rps:200,duration:60[,profile:default]",
+    )
+    parser.addoption(
+        "--cassettes",
+        action="store",
+        default="off",
+        choices=CASSETTE_MODES,
+        help="Record/replay API traffic from cassettes/{env}/: off, record, replay or auto",
+    )
+    parser.addoption(
+        "--cassette-latency",
+        action="store",
+        default="0",
+        help="Latency injected into replayed responses: milliseconds or 'recorded'",
+    )
+    parser.addoption(
+        "--db",
+        action="store",
+        default=None,
+        help="connections.yaml entry used for every environment, e.g. sqlite_example for an embedded database",
+    )
+    parser.addoption(
+        "--latency-report",
+        action="store",
+        default=None,
+        help="Write the per-endpoint API latency JSON report to this path, e.g. reports/api_latency.json",
+    )
+
+
+_previous_latency_key = pytest.StashKey[dict]()
+_db_pool_metrics_key = pytest.StashKey[dict]()
+_driver_pool_metrics_key = pytest.StashKey[dict]()
+
+
+def pytest_configure(config):
+    latency = config.getoption("--cassette-latency")
+    configure_cassettes(config.getoption("--cassettes"), latency if latency == "recorded" else float(latency))
+    set_db_override(config.getoption("--db"))
+    config.addinivalue_line("markers", "smoke: small subset run on a real browser")
+    config.addinivalue_line(
+        "markers", "auth_role(role): user role the authenticated_driver and authenticated_api_headers fixtures log in as"
+    )
+    config.addinivalue_line(
+        "markers",
+        "data_matrix(mode='product'|'pairwise', **axes): run the test once per combination of YAML data "
+        "axes, received through the matrix_case fixture",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize data_matrix tests with case numbers; values are decoded by matrix_case"""
+    marker = metafunc.definition.get_closest_marker("data_matrix")
+    if marker is None:
+        return
+    if "matrix_case" not in metafunc.fixturenames:
+        raise ValueError(f"{metafunc.definition.nodeid}: data_matrix tests must request the matrix_case fixture")
+    axes = dict(marker.kwargs)
+    mode = axes.pop("mode", "product")
+    plan = get_matrix_plan(axes, mode)
+    metafunc.parametrize("matrix_case", plan.refs(), ids=repr, indirect=True)
+
+
+def pytest_cmdline_main(config):
+    """Fan out over a list of --env values, and default the pytest-xdist worker
+    count from the run config's `workers` key"""
+    envs = parse_env_option(config.getoption("--env"))
+    if len(envs) > 1 and not os.environ.get(FANOUT_ENV_VAR):
+        latency_report = config.getoption("--latency-report")
+        report_dir = config.invocation_params.dir / (Path(latency_report).parent if latency_report else Path("reports"))
+        return run_environments(envs, config.invocation_params.args, report_dir, cwd=config.invocation_params.dir)
+
+    if not hasattr(config.option, "numprocesses") or os.environ.get("PYTEST_XDIST_WORKER"):
+        return None
+    if config.option.numprocesses or config.getoption("collectonly"):
+        return None
+    workers = load_run_config(config.getoption("--run")).get("workers")
+    if workers and int(workers) > 1:
+        apply_worker_count(config.option, int(workers))
+    return None
 
 
 @pytest.fixture(scope="session")
@@ -52,6 +168,22 @@ def run_config(pytestconfig):
     return load_run_config(run)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def browser_metrics_config(run_config):
+    """Enable browser metrics capture in page objects per the run config"""
+    configure_browser_metrics(run_config)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Attach browser metrics captured during the test to its report"""
+    if call.when == "call":
+        records = drain_page_metrics()
+        if records:
+            item.user_properties.append(("browser_metrics", records))
+    yield
+
+
 @pytest.fixture(scope="session")
 def base_url(env_config):
     return env_config["base_url"]
@@ -62,11 +194,45 @@ def login_users():
     return load_data_config("login_users")
 
 
+@pytest.fixture(scope="session")
+def driver_pool(pytestconfig, run_config, base_url):
+    """Warm browsers reused across this worker's tests (run config `driver_pool`)"""
+    origins = [base_url, get_api_base_url(pytestconfig.getoption("--env"))]
+    pool = DriverPool(run_config, origins=origins)
+    if run_config["driver_pool"].get("warm_up", False):
+        pool.warm_up()
+    yield pool
+    pytestconfig.stash[_driver_pool_metrics_key] = pool.metrics()
+    pool.close()
+
+
 @pytest.fixture
-def driver(run_config):
-    driver = create_driver(run_config)
+def driver(request, pytestconfig, run_config):
+    if not run_config.get("driver_pool") or run_config.get("backend") == "http":
+        driver = create_driver(run_config, env=pytestconfig.getoption("--env"))
+        yield driver
+        driver.quit()
+        return
+
+    pool = request.getfixturevalue("driver_pool")
+    driver = pool.acquire()
     yield driver
-    driver.quit()
+    pool.release(driver)
+
+
+@pytest.fixture
+def authenticated_driver(request, pytestconfig, driver, run_config, base_url):
+    """Driver that starts logged in, using the cached session state of its role.
+
+    The role comes from @pytest.mark.auth_role("...") or session_cache.default_role.
+    """
+    options = get_session_cache_options(run_config)
+    marker = request.node.get_closest_marker("auth_role")
+    role = marker.args[0] if marker else options["default_role"]
+    env = pytestconfig.getoption("--env")
+    state = get_session_state(env, role, base_url, driver=driver, run_config=run_config)
+    inject_session_state(driver, state, options["inject_path"])
+    return driver
 
 
 # API Testing Fixtures
@@ -76,6 +242,20 @@ def api_base_url(env_config):
     return env_config.get("api_base_url", "")
 
 
+@pytest.fixture(scope="session")
+def api_session(pytestconfig):
+    """Pooled keep-alive HTTP session for the current environment"""
+    env = pytestconfig.getoption("--env")
+    return get_session(env)
+
+
+@pytest.fixture(scope="session")
+def load_options(pytestconfig):
+    """Parsed --load options, or None when load mode is disabled"""
+    value = pytestconfig.getoption("--load")
+    return parse_load_option(value) if value else None
+
+
 @pytest.fixture(scope="session")
 def api_endpoints():
     """Load API endpoints configuration"""
@@ -95,6 +275,15 @@ def api_headers(pytestconfig):
     return get_headers(env=env)
 
 
+@pytest.fixture
+def authenticated_api_headers(request, pytestconfig):
+    """Authenticated API headers carrying the shared bearer token of the test's auth_role"""
+    env = pytestconfig.getoption("--env", default="dev")
+    marker = request.node.get_closest_marker("auth_role")
+    role = marker.args[0] if marker else None
+    return get_headers(env=env, header_type="authenticated_headers", role=role)
+
+
 @pytest.fixture(scope="session")
 def api_test_data():
     """Load API test data"""
@@ -137,13 +326,43 @@ def db_connection(pytestconfig):
     return_connection(conn, env=env)
 
 
+@pytest.fixture(scope="session")
+def db_session_connection(pytestconfig):
+    """Connection held for the whole session by transactional tests"""
+    env = pytestconfig.getoption("--env", default="dev")
+    conn = create_connection(env=env)
+    yield conn
+    conn.rollback()
+    return_connection(conn, env=env)
+
+
+@pytest.fixture(scope="function")
+def db_transaction(pytestconfig, db_session_connection):
+    """Run the test inside a SAVEPOINT that is rolled back at teardown.
+    
+    execute_query, execute_insert and the bulk helpers join this transaction,
+    so nothing the test writes is committed and no DELETE cleanup is needed.
+    """
+    env = pytestconfig.getoption("--env", default="dev")
+    with transaction_scope(env, db_session_connection) as conn:
+        yield conn
+
+
 @pytest.fixture(scope="session", autouse=True)
-def cleanup_db_pools():
-    """Cleanup database connection pools after all tests"""
+def cleanup_db_pools(pytestconfig):
+    """Cleanup database connection pools after all tests, keeping their metrics for the summary"""
     yield
+    pytestconfig.stash[_db_pool_metrics_key] = get_pool_metrics()
     close_all_pools()
 
 
+@pytest.fixture
+def matrix_case(request):
+    """Values of the current data_matrix case, keyed by axis name"""
+    ref = request.param
+    return ref.plan.case(ref.index)
+
+
 # UI Testing Fixtures
 @pytest.fixture(scope="session")
 def users():
@@ -162,3 +381,120 @@ def test_scenarios():
     """Load test scenarios"""
     return load_test_scenarios()
 
+
+
+def pytest_sessionfinish(session):
+    """Save recorded cassettes and write per-endpoint API latency stats for trend tracking"""
+    save_cassettes()
+    if hasattr(session.config, "workeroutput"):
+        # xdist worker: hand the raw timings to the controller (see pytest_testnodedown)
+        session.config.workeroutput["api_latency"] = get_latency_records()
+        return
+
+    # Requests to local stub servers (unit tests) are not part of the trend
+    stats = get_latency_stats(include_loopback=False)
+    report_path = session.config.getoption("--latency-report")
+    if not stats or not report_path:
+        return
+
+    path = Path(report_path)
+    if path.exists():
+        try:
+            session.config.stash[_previous_latency_key] = json.loads(path.read_text())
+        except ValueError:
+            pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "env": session.config.getoption("--env"),
+        "endpoints": stats
+    }, indent=2))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge the latency records of a finished xdist worker into the controller's stats"""
+    merge_latency_records(getattr(node, "workeroutput", {}).get("api_latency", {}))
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report how often config lookups were served from the YAML cache"""
+    stats = get_cache_stats()
+    terminalreporter.write_sep("-", "config cache")
+    terminalreporter.write_line(
+        f"hits: {stats['hits']}, misses: {stats['misses']}, cached files: {stats['entries']}"
+    )
+
+    session_stats = get_session_stats()
+    if session_stats:
+        terminalreporter.write_sep("-", "api sessions")
+        for env, env_stats in session_stats.items():
+            terminalreporter.write_line(
+                f"{env}: requests: {env_stats['requests']}, connections opened: {env_stats['connections']}, "
+                f"reused: {env_stats['reused']}"
+            )
+
+    token_stats = get_token_stats()
+    if token_stats["logins"] or token_stats["refreshes"] or token_stats["disk_hits"]:
+        terminalreporter.write_sep("-", "auth tokens")
+        terminalreporter.write_line(
+            f"logins: {token_stats['logins']}, refreshes: {token_stats['refreshes']}, "
+            f"memory hits: {token_stats['memory_hits']}, shared from disk: {token_stats['disk_hits']}"
+        )
+
+    latency_stats = get_latency_stats(include_loopback=False)
+    if latency_stats:
+        previous = terminalreporter.config.stash.get(_previous_latency_key, {}).get("endpoints", {})
+        terminalreporter.write_sep("-", "api latency (total ms)")
+        for endpoint, endpoint_stats in sorted(latency_stats.items()):
+            total = endpoint_stats["total_ms"]
+            line = f"{endpoint}: n={total['count']} p50={total['p50']:.1f} p95={total['p95']:.1f} max={total['max']:.1f}"
+            previous_p95 = previous.get(endpoint, {}).get("total_ms", {}).get("p95")
+            if previous_p95 is not None:
+                line += f" (previous p95={previous_p95:.1f})"
+            terminalreporter.write_line(line)
+
+    pool_metrics = terminalreporter.config.stash.get(_db_pool_metrics_key, {})
+    if pool_metrics:
+        terminalreporter.write_sep("-", "db pools")
+        for pool_key, metrics in pool_metrics.items():
+            terminalreporter.write_line(
+                f"{pool_key}: checkouts: {metrics['checkouts']}, in-use high water: {metrics['in_use_high_water']}, "
+                f"created: {metrics['connections_created']} (overflow {metrics['overflow_created']}), "
+                f"wait avg/max: {metrics['wait_time_avg_ms']:.1f}/{metrics['wait_time_max_ms']:.1f} ms, "
+                f"timeouts: {metrics['timeouts']}, recycled: {metrics['recycled']}, invalidated: {metrics['invalidated']}"
+            )
+
+    driver_metrics = terminalreporter.config.stash.get(_driver_pool_metrics_key, {})
+    if driver_metrics:
+        terminalreporter.write_sep("-", "driver pool")
+        terminalreporter.write_line(
+            f"launched: {driver_metrics['launched']}, reused: {driver_metrics['reused']}, "
+            f"recycled: {driver_metrics['recycled']}, crashed: {driver_metrics['crashed']}"
+        )
+
+    metrics_summary = get_browser_metrics_summary()
+    if metrics_summary:
+        terminalreporter.write_sep("-", "browser metrics (p50/p95 ms)")
+        for label, label_summary in metrics_summary.items():
+            parts = [
+                f"{metric}={label_summary[metric]['p50']:.0f}/{label_summary[metric]['p95']:.0f}"
+                for metric in ("fcp_ms", "lcp_ms", "load_ms", "duration_ms") if metric in label_summary
+            ]
+            terminalreporter.write_line(
+                f"{label}: n={label_summary['count']} {' '.join(parts)} budget violations: {label_summary['violations']}"
+            )
+
+    locator_stats = get_locator_stats()
+    if locator_stats["lookups"]:
+        terminalreporter.write_sep("-", "locators")
+        terminalreporter.write_line(
+            f"lookups: {locator_stats['lookups']}, learned strategy hits: {locator_stats['cache_hits']}, "
+            f"slow: {locator_stats['slow']}"
+        )
+
+
+def pytest_unconfigure(config):
+    """Close pooled API sessions and stop token refresh once reporting is done"""
+    stop_token_refresh()
+    close_all_sessions()
@@ -1,11 +1,41 @@
 """API helper functions for loading API configs and making API calls"""
 
+import ipaddress
+import re
+import threading
+import time
 import requests
-from typing import Dict, Any, Optional
-from core.config_loader import load_data_config, load_env_config, BASE_DIR
+from urllib3.util.retry import Retry
+from typing import Callable, Dict, Any, Optional, List, Tuple
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from core.config_loader import config_stamp, data_config_path, load_data_config, load_env_config, BASE_DIR
+from core.http_timing import TimingHTTPAdapter, start_timing, stop_timing
+from core.latency import summarize_latencies
+from core.templating import get_template_tree, render_template
 from pathlib import Path
 
 
+SUPPORTED_METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH")
+HEADERS_CONFIG = "api/headers"
+EXPECTED_RESPONSES_CONFIG = "api/expected_responses"
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Pooled HTTP sessions keyed by environment name
+_sessions: Dict[str, requests.Session] = {}
+_session_requests: Dict[str, int] = {}
+_session_lock = threading.Lock()
+
+# Per-endpoint request timings collected by make_api_request
+TIMING_PHASES = ("dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "total_ms")
+_latency_records: Dict[str, List[Dict[str, Any]]] = {}
+_latency_lock = threading.Lock()
+_endpoint_patterns: Optional[List[Tuple[re.Pattern, str]]] = None
+
+# Optional replacement for TimingHTTPAdapter in new sessions (see core/cassettes.py)
+_adapter_factory: Optional[Callable[..., HTTPAdapter]] = None
+
+
 def load_api_endpoints() -> Dict[str, Any]:
     """Load API endpoints configuration"""
     return load_data_config("api/endpoints")
@@ -18,7 +48,7 @@ def load_api_payloads() -> Dict[str, Any]:
 
 def load_api_headers() -> Dict[str, Any]:
     """Load API headers configuration"""
-    return load_data_config("api/headers")
+    return load_data_config(HEADERS_CONFIG)
 
 
 def load_api_test_data() -> Dict[str, Any]:
@@ -28,7 +58,7 @@ def load_api_test_data() -> Dict[str, Any]:
 
 def load_expected_responses() -> Dict[str, Any]:
     """Load expected API responses"""
-    return load_data_config("api/expected_responses")
+    return load_data_config(EXPECTED_RESPONSES_CONFIG)
 
 
 def get_api_base_url(env: str = "dev") -> str:
@@ -52,12 +82,12 @@ def get_full_url(env: str, endpoint_group: str, endpoint_name: str, **path_param
     if not endpoint:
         raise ValueError(f"Endpoint {endpoint_group}.{endpoint_name} not found")
     
-    # Replace path parameters in endpoint
-    full_url = base_url + endpoint
-    for key, value in path_params.items():
-        full_url = full_url.replace(f"{{{key}}}", str(value))
-    
-    return full_url
+    return build_url(base_url, endpoint, path_params)
+
+
+def build_url(base_url: str, endpoint: str, path_params: Optional[Dict[str, Any]] = None) -> str:
+    """Join base URL and endpoint, replacing {name} path parameters"""
+    return base_url + render_template(endpoint, path_params)
 
 
 def get_payload(payload_name: str, payload_type: str = "valid") -> Optional[Dict[str, Any]]:
@@ -67,18 +97,34 @@ def get_payload(payload_name: str, payload_type: str = "valid") -> Optional[Dict
     return payload_data.get(payload_type)
 
 
-def get_headers(env: str = "dev", header_type: str = "default_headers") -> Dict[str, str]:
-    """Get headers for API requests"""
+def _load_header_set(env: str, header_type: str) -> Dict[str, str]:
     headers_config = load_api_headers()
     
     if header_type == "authenticated_headers":
-        headers = headers_config.get("authenticated_headers", {}).get(env, {})
+        return headers_config.get("authenticated_headers", {}).get(env, {})
     elif header_type == "default_headers":
-        headers = headers_config.get("default_headers", {})
+        return headers_config.get("default_headers", {})
     else:
-        headers = headers_config.get(header_type, {})
-    
-    return headers.copy()
+        return headers_config.get(header_type, {})
+
+
+def get_headers(
+    env: str = "dev",
+    header_type: str = "default_headers",
+    values: Optional[Dict[str, Any]] = None,
+    role: Optional[str] = None
+) -> Dict[str, str]:
+    """Get headers for API requests with {timestamp}, {token}, {trace_id}, ... rendered
+
+    role picks whose token fills {token} when the env logs in for tokens
+    (auth_token_source: login); by default the valid_user role is used.
+    """
+    template = get_template_tree(
+        f"headers:{env}:{header_type}",
+        lambda: _load_header_set(env, header_type),
+        version=config_stamp(data_config_path(HEADERS_CONFIG)),
+    )
+    return dict(template.render(values, context={"env": env, "role": role}))
 
 
 def get_auth_token(env: str = "dev", token_type: str = "bearer_token") -> Optional[str]:
@@ -101,30 +147,223 @@ def get_expected_response(response_name: str) -> Optional[Dict[str, Any]]:
     return expected_responses.get(response_name)
 
 
+def create_session(env: str = "dev", pool_size: Optional[int] = None) -> requests.Session:
+    """Create a keep-alive session with a connection pool and retries sized from env config"""
+    env_config = load_env_config(env)
+    if pool_size is None:
+        pool_size = env_config.get("http_pool_size", 10)
+    retries = Retry(
+        total=env_config.get("retry_count", 0),
+        backoff_factor=env_config.get("retry_backoff", 0.5),
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False
+    )
+    if _adapter_factory is not None:
+        adapter = _adapter_factory(env, pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    else:
+        adapter = TimingHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def set_adapter_factory(factory: Optional[Callable[..., HTTPAdapter]]):
+    """Build session adapters with factory(env, **adapter_kwargs); existing sessions are closed"""
+    global _adapter_factory
+    close_all_sessions()
+    _adapter_factory = factory
+
+
+def get_session(env: str = "dev") -> requests.Session:
+    """Get the shared pooled session for the specified environment"""
+    with _session_lock:
+        if env not in _sessions:
+            _sessions[env] = create_session(env)
+            _session_requests[env] = 0
+        return _sessions[env]
+
+
+def get_session_stats() -> Dict[str, Dict[str, int]]:
+    """Get per-environment request and connection counts for the pooled sessions.
+    
+    connections and reused come from the urllib3 pool checkouts, so retries are
+    counted as the extra attempts they are.
+    """
+    stats = {}
+    with _session_lock:
+        for env, session in _sessions.items():
+            checkouts = reused = 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    checkouts += getattr(pools[key], "checkouts", 0)
+                    reused += getattr(pools[key], "reused", 0)
+            stats[env] = {
+                "requests": _session_requests.get(env, 0),
+                "connections": checkouts - reused,
+                "reused": reused
+            }
+    return stats
+
+
+def close_all_sessions():
+    """Close all pooled sessions (useful for cleanup)"""
+    with _session_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _session_requests.clear()
+
+
 def make_api_request(
     method: str,
     url: str,
     headers: Optional[Dict[str, str]] = None,
     payload: Optional[Dict[str, Any]] = None,
     params: Optional[Dict[str, Any]] = None,
-    timeout: int = 30
+    timeout: int = 30,
+    env: str = "dev",
+    session: Optional[requests.Session] = None,
+    record: bool = True
 ) -> requests.Response:
-    """Make an API request using requests library"""
+    """Make an API request over the pooled session for the environment.
+
+    record=False keeps the request out of the per-endpoint latency stats, e.g.
+    synthetic load-mode traffic.
+    """
     if headers is None:
-        headers = get_headers()
+        headers = get_headers(env=env)
     
-    if method.upper() == "GET":
-        response = requests.get(url, headers=headers, params=params, timeout=timeout)
-    elif method.upper() == "POST":
-        response = requests.post(url, headers=headers, json=payload, params=params, timeout=timeout)
-    elif method.upper() == "PUT":
-        response = requests.put(url, headers=headers, json=payload, params=params, timeout=timeout)
-    elif method.upper() == "DELETE":
-        response = requests.delete(url, headers=headers, params=params, timeout=timeout)
-    elif method.upper() == "PATCH":
-        response = requests.patch(url, headers=headers, json=payload, params=params, timeout=timeout)
-    else:
+    method = method.upper()
+    if method not in SUPPORTED_METHODS:
         raise ValueError(f"Unsupported HTTP method: {method}")
     
+    pooled = session is None
+    if pooled:
+        session = get_session(env)
+    
+    # GET and DELETE requests are sent without a body
+    json_body = None if method in ("GET", "DELETE") else payload
+    timings = start_timing()
+    start = time.perf_counter()
+    try:
+        response = session.request(method, url, headers=headers, json=json_body, params=params, timeout=timeout)
+    finally:
+        stop_timing()
+    # response.elapsed runs from sending to parsed headers, connection setup included
+    setup_ms = sum(timings.get(phase, 0.0) for phase in ("dns_ms", "connect_ms", "tls_ms"))
+    timings["ttfb_ms"] = max(response.elapsed.total_seconds() * 1000 - setup_ms, 0.0)
+    timings["total_ms"] = (time.perf_counter() - start) * 1000
+    response.timings = timings
+    
+    if pooled:
+        with _session_lock:
+            _session_requests[env] = _session_requests.get(env, 0) + 1
+    # Cassette replays (core/cassettes.py) say nothing about the live API's latency
+    if record and not getattr(response, "replayed", False):
+        record_latency(method, url, timings, response.status_code)
+    
     return response
 
+
+def resolve_endpoint_path(url: str) -> str:
+    """Map a request URL back to its endpoints.yaml template, e.g. /api/v1/users/{user_id}"""
+    global _endpoint_patterns
+    if _endpoint_patterns is None:
+        patterns = []
+        for group_endpoints in load_api_endpoints().get("endpoints", {}).values():
+            for template in group_endpoints.values():
+                regex = re.sub(r"\\\{[^}]+\\\}", "[^/]+", re.escape(template))
+                patterns.append((template.count("{"), re.compile(regex + "$"), template))
+        # Literal paths (/users/search) win over parameterized ones (/users/{user_id})
+        _endpoint_patterns = [(regex, template) for _, regex, template in sorted(patterns, key=lambda p: p[0])]
+    
+    path = urlsplit(url).path
+    for regex, template in _endpoint_patterns:
+        if regex.search(path):
+            return template
+    return path
+
+
+def is_loopback_url(url: str) -> bool:
+    """True for localhost / 127.x / ::1 URLs, e.g. stub servers in unit tests"""
+    host = urlsplit(url).hostname or ""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def record_latency(method: str, url: str, timings: Dict[str, float], status_code: int):
+    """Add one request's timings to the per-endpoint latency stats"""
+    key = f"{method.upper()} {resolve_endpoint_path(url)}"
+    record = {**timings, "status_code": status_code, "loopback": is_loopback_url(url)}
+    with _latency_lock:
+        _latency_records.setdefault(key, []).append(record)
+
+
+def get_latency_records() -> Dict[str, List[Dict[str, Any]]]:
+    """Copy of the raw per-endpoint records, e.g. to send from an xdist worker to the controller"""
+    with _latency_lock:
+        return {key: list(values) for key, values in _latency_records.items()}
+
+
+def merge_latency_records(records: Dict[str, List[Dict[str, Any]]]):
+    """Add records collected by another process (see get_latency_records)"""
+    with _latency_lock:
+        for key, values in records.items():
+            _latency_records.setdefault(key, []).extend(values)
+
+
+def get_latency_stats(include_loopback: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Summarize recorded timings per endpoint and phase.
+
+    include_loopback=False leaves out requests to local stub servers.
+    """
+    stats = {}
+    for key, values in get_latency_records().items():
+        if not include_loopback:
+            values = [record for record in values if not record.get("loopback")]
+            if not values:
+                continue
+        status_codes: Dict[str, int] = {}
+        for record in values:
+            code = str(record["status_code"])
+            status_codes[code] = status_codes.get(code, 0) + 1
+        stats[key] = {
+            "count": len(values),
+            "status_codes": status_codes,
+            # Connection phases are missing when http_timing cannot hook urllib3
+            **{phase: summarize_latencies(r[phase] for r in values if phase in r) for phase in TIMING_PHASES}
+        }
+    return stats
+
+
+def reset_latency_stats():
+    """Clear recorded request timings"""
+    with _latency_lock:
+        _latency_records.clear()
+
+
+def assert_response_time(response: requests.Response, response_name: str, phase: str = "total_ms"):
+    """Assert a response met the response_time_ms budget of its expected response.
+
+    Responses replayed from cassettes are not checked.
+    """
+    expected = get_expected_response(response_name)
+    if expected is None:
+        raise ValueError(f"Expected response '{response_name}' not found")
+    budget = expected.get("response_time_ms")
+    if budget is None or getattr(response, "replayed", False):
+        return
+    
+    timings = getattr(response, "timings", None)
+    elapsed = timings[phase] if timings and phase in timings else response.elapsed.total_seconds() * 1000
+    assert elapsed <= budget, \
+        f"{response_name}: {phase} {elapsed:.1f} ms exceeds response_time_ms budget {budget} ms"
+
@@ -0,0 +1,119 @@
+"""Asyncio API client and concurrent batch runner.
+
+Requests run on a thread pool over the same pooled sessions as
+make_api_request, so keep-alive, retries and stats behave identically.
+Set http_pool_size in the env config to at least the batch concurrency,
+otherwise extra connections are opened and discarded after each call.
+"""
+
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, NamedTuple, Sequence
+
+import requests
+
+from core.api_helper import (
+    make_api_request,
+    get_api_base_url,
+    get_endpoint,
+    build_url
+)
+
+
+class ApiRequestSpec(NamedTuple):
+    """One request in a batch, addressed by its endpoints.yaml group and name"""
+    method: str
+    endpoint_group: str
+    endpoint_name: str
+    path_params: Optional[Dict[str, Any]] = None
+    payload: Optional[Dict[str, Any]] = None
+
+
+class ApiBatchResult(NamedTuple):
+    """Outcome of one batch request; error is set instead of response on failure"""
+    spec: ApiRequestSpec
+    url: str
+    response: Optional[requests.Response]
+    error: Optional[BaseException]
+    elapsed_ms: float
+
+
+async def async_api_request(
+    method: str,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    payload: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: int = 30,
+    env: str = "dev",
+    executor: Optional[ThreadPoolExecutor] = None,
+    session: Optional[requests.Session] = None,
+    record: bool = True
+) -> requests.Response:
+    """Awaitable counterpart of make_api_request"""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(
+        make_api_request, method, url,
+        headers=headers, payload=payload, params=params, timeout=timeout, env=env, session=session,
+        record=record
+    )
+    return await loop.run_in_executor(executor, call)
+
+
+def resolve_spec_url(spec: ApiRequestSpec, base_url: str) -> str:
+    """Build the full URL for a batch spec"""
+    endpoint = get_endpoint(spec.endpoint_group, spec.endpoint_name)
+    if not endpoint:
+        raise ValueError(f"Endpoint {spec.endpoint_group}.{spec.endpoint_name} not found")
+    return build_url(base_url, endpoint, spec.path_params)
+
+
+async def run_api_batch_async(
+    specs: Sequence[ApiRequestSpec],
+    env: str = "dev",
+    concurrency: int = 10,
+    headers: Optional[Dict[str, str]] = None,
+    base_url: Optional[str] = None,
+    timeout: int = 30
+) -> List[ApiBatchResult]:
+    """Run specs with at most `concurrency` in flight; results keep the input order"""
+    specs = [spec if isinstance(spec, ApiRequestSpec) else ApiRequestSpec(*spec) for spec in specs]
+    if base_url is None:
+        base_url = get_api_base_url(env)
+    urls = [resolve_spec_url(spec, base_url) for spec in specs]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        async def run_one(spec: ApiRequestSpec, url: str) -> ApiBatchResult:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await async_api_request(
+                        spec.method, url, headers=headers, payload=spec.payload,
+                        timeout=timeout, env=env, executor=executor
+                    )
+                    error = None
+                except Exception as e:
+                    response, error = None, e
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                return ApiBatchResult(spec, url, response, error, elapsed_ms)
+
+        return await asyncio.gather(*(run_one(spec, url) for spec, url in zip(specs, urls)))
+
+
+def run_api_batch(
+    specs: Sequence[ApiRequestSpec],
+    env: str = "dev",
+    concurrency: int = 10,
+    headers: Optional[Dict[str, str]] = None,
+    base_url: Optional[str] = None,
+    timeout: int = 30
+) -> List[ApiBatchResult]:
+    """Synchronous wrapper around run_api_batch_async for use in plain tests"""
+    return asyncio.run(run_api_batch_async(
+        specs, env=env, concurrency=concurrency, headers=headers, base_url=base_url, timeout=timeout
+    ))
+
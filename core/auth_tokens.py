@@ -0,0 +1,219 @@
+"""Bearer tokens shared by all tests of a run: one login per environment and role.
+
+With `auth_token_source: login` in the env config, get_bearer_token logs in
+through authentication.login the first time a role needs a token. The token,
+its refresh token and expiry are kept in memory and in
+.cache/tokens/{env}_{role}.json, so xdist workers and later runs reuse them.
+A lock file makes sure only one process logs in at a time. Before the token
+expires, a background timer refreshes it through authentication.refresh
+(logging in again if that fails). `auth_token_source: static` (the default)
+keeps using the fixed tokens from headers.yaml.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+
+from core.config_loader import BASE_DIR, file_lock, load_env_config
+from core.api_helper import get_auth_token, get_full_url, make_api_request
+from core.data_helper import get_role_credentials
+
+TOKEN_CACHE_DIR = BASE_DIR / ".cache" / "tokens"
+DEFAULT_ROLE = "valid_user"
+DEFAULT_EXPIRES_IN = 3600
+# Seconds before expiry at which a token is refreshed
+DEFAULT_REFRESH_MARGIN = 60
+LOCK_TIMEOUT = 30.0
+STALE_LOCK_AGE = 60.0
+
+_tokens: Dict[str, Dict[str, Any]] = {}
+_refresh_timers: Dict[str, threading.Timer] = {}
+# Guards _tokens, _refresh_timers and _token_stats; never held during network I/O
+_tokens_lock = threading.RLock()
+# One lock per env/role, held while that token is renewed
+_key_locks: Dict[str, threading.RLock] = {}
+_token_stats = {"logins": 0, "refreshes": 0, "memory_hits": 0, "disk_hits": 0}
+
+
+def token_cache_path(env: str, role: str) -> Path:
+    return TOKEN_CACHE_DIR / f"{env}_{role}.json"
+
+
+def _count(stat: str):
+    with _tokens_lock:
+        _token_stats[stat] += 1
+
+
+def _key_lock(key: str) -> threading.RLock:
+    with _tokens_lock:
+        return _key_locks.setdefault(key, threading.RLock())
+
+
+def _refresh_margin(env: str) -> float:
+    return load_env_config(env).get("auth_refresh_margin", DEFAULT_REFRESH_MARGIN)
+
+
+def _is_fresh(entry: Optional[Dict[str, Any]], margin: float) -> bool:
+    return bool(entry) and entry.get("expires_at", 0) - margin > time.time()
+
+
+def _token_entry(response: requests.Response) -> Dict[str, Any]:
+    body = response.json()
+    data = body.get("data") if isinstance(body.get("data"), dict) else body
+    token = data.get("token") or data.get("access_token")
+    if not token:
+        raise ValueError("Authentication response did not contain a token")
+    now = time.time()
+    return {
+        "access_token": token,
+        "refresh_token": data.get("refresh_token"),
+        "obtained_at": now,
+        "expires_at": now + float(data.get("expires_in") or DEFAULT_EXPIRES_IN),
+    }
+
+
+def _login(env: str, role: str) -> Dict[str, Any]:
+    credentials = get_role_credentials(role)
+    url = get_full_url(env, "authentication", "login")
+    payload = {"email": credentials["email"], "password": credentials["password"]}
+    response = make_api_request("POST", url, payload=payload, env=env)
+    if not response.ok:
+        raise ValueError(f"Login failed for {env}/{role}: {response.status_code}")
+    _count("logins")
+    return _token_entry(response)
+
+
+def _refresh(env: str, role: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Exchange the refresh token for a new token, logging in again if that is not possible"""
+    if entry.get("refresh_token"):
+        url = get_full_url(env, "authentication", "refresh_token")
+        try:
+            response = make_api_request("POST", url, payload={"refresh_token": entry["refresh_token"]}, env=env)
+            if response.ok:
+                _count("refreshes")
+                refreshed = _token_entry(response)
+                refreshed["refresh_token"] = refreshed["refresh_token"] or entry["refresh_token"]
+                return refreshed
+        except (requests.RequestException, ValueError):
+            pass
+    return _login(env, role)
+
+
+def _read_cached_entry(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_entry(path: Path, entry: Dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(entry))
+    os.replace(tmp_path, path)
+
+
+def _renew(env: str, role: str, force: bool = False, known: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Get a usable token from disk or the API, under the cross-process lock.
+
+    A forced renewal still takes the disk entry when another worker obtained it
+    after known (the caller's in-memory entry), so N workers refresh once.
+    """
+    margin = _refresh_margin(env)
+    path = token_cache_path(env, role)
+    with file_lock(path.with_suffix(".lock"), LOCK_TIMEOUT, STALE_LOCK_AGE):
+        entry = _read_cached_entry(path)
+        renewed_elsewhere = entry is not None and entry.get("obtained_at", 0) > (known or {}).get("obtained_at", 0)
+        if _is_fresh(entry, margin) and (not force or renewed_elsewhere):
+            _count("disk_hits")
+        else:
+            current = entry or known
+            entry = _refresh(env, role, current) if current else _login(env, role)
+            _write_cached_entry(path, entry)
+    return entry
+
+
+def _schedule_refresh(env: str, role: str, entry: Dict[str, Any]):
+    key = f"{env}_{role}"
+    delay = max(entry["expires_at"] - _refresh_margin(env) - time.time(), 1.0)
+    timer = threading.Timer(delay, _background_refresh, args=(env, role))
+    timer.daemon = True
+    with _tokens_lock:
+        previous = _refresh_timers.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+        _refresh_timers[key] = timer
+    timer.start()
+
+
+def _background_refresh(env: str, role: str):
+    try:
+        get_token(env, role, force_refresh=True)
+    except Exception:
+        # The next get_token call retries synchronously
+        pass
+
+
+def get_token(env: str = "dev", role: str = DEFAULT_ROLE, force_refresh: bool = False) -> str:
+    """Access token for env/role, logging in or refreshing only when needed"""
+    key = f"{env}_{role}"
+    margin = _refresh_margin(env)
+    with _tokens_lock:
+        seen = _tokens.get(key)
+    if not force_refresh and _is_fresh(seen, margin):
+        _count("memory_hits")
+        return seen["access_token"]
+
+    # Only callers of the same env/role wait for each other's login or refresh
+    with _key_lock(key):
+        with _tokens_lock:
+            entry = _tokens.get(key)
+        if _is_fresh(entry, margin) and (not force_refresh or entry is not seen):
+            # Renewed by another thread while this one waited
+            _count("memory_hits")
+            return entry["access_token"]
+
+        entry = _renew(env, role, force=force_refresh, known=entry)
+        with _tokens_lock:
+            _tokens[key] = entry
+        _schedule_refresh(env, role, entry)
+        return entry["access_token"]
+
+
+def get_bearer_token(env: str = "dev", role: Optional[str] = None) -> Optional[str]:
+    """Token for the Authorization header, from the source set by auth_token_source"""
+    source = load_env_config(env).get("auth_token_source", "static")
+    if source == "static":
+        return get_auth_token(env)
+    if source == "login":
+        return get_token(env, role or DEFAULT_ROLE)
+    raise ValueError(f"Unsupported auth_token_source: {source}")
+
+
+def get_token_stats() -> Dict[str, int]:
+    with _tokens_lock:
+        return {**_token_stats, "cached_tokens": len(_tokens)}
+
+
+def stop_token_refresh():
+    """Cancel background refresh timers"""
+    with _tokens_lock:
+        for timer in _refresh_timers.values():
+            timer.cancel()
+        _refresh_timers.clear()
+
+
+def clear_token_cache(remove_files: bool = False):
+    """Forget in-memory tokens (and optionally the on-disk cache)"""
+    stop_token_refresh()
+    with _tokens_lock:
+        _tokens.clear()
+        _key_locks.clear()
+    if remove_files:
+        for path in TOKEN_CACHE_DIR.glob("*.json"):
+            path.unlink(missing_ok=True)
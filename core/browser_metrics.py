@@ -0,0 +1,148 @@
+"""Frontend performance metrics captured from the browser during UI tests.
+
+Page objects call capture_page_metrics (BasePage.open) or measure an action
+(BasePage.measure_action) when metrics are enabled through the run config's
+`browser_metrics` section. Navigation Timing, paint and largest contentful
+paint, and resource timing are read from the Performance API. Each record is
+checked against config/data/perf_budgets.yaml and attached to the test report
+by conftest.py.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.config_loader import load_data_config
+from core.latency import summarize_latencies
+
+# Read in an async script because LCP is only exposed to a buffered
+# PerformanceObserver. arguments[0] is the performance.now() value resources
+# must have started after (0 for the whole page).
+CAPTURE_SCRIPT = """
+const since = arguments[0], done = arguments[arguments.length - 1];
+const round = (value) => Math.round(value * 10) / 10;
+const result = {};
+
+const nav = performance.getEntriesByType("navigation")[0];
+if (nav && since === 0) {
+    result.ttfb_ms = round(nav.responseStart - nav.startTime);
+    result.dom_interactive_ms = round(nav.domInteractive - nav.startTime);
+    result.dom_content_loaded_ms = round(nav.domContentLoadedEventEnd - nav.startTime);
+    if (nav.loadEventEnd > 0) result.load_ms = round(nav.loadEventEnd - nav.startTime);
+    for (const paint of performance.getEntriesByType("paint")) {
+        if (paint.name === "first-paint") result.fp_ms = round(paint.startTime);
+        if (paint.name === "first-contentful-paint") result.fcp_ms = round(paint.startTime);
+    }
+}
+
+const resources = performance.getEntriesByType("resource").filter((r) => r.startTime >= since);
+result.resource_count = resources.length;
+result.transfer_kb = round(resources.reduce((sum, r) => sum + (r.transferSize || 0), 0) / 1024);
+result.slowest_resources = resources
+    .sort((a, b) => b.duration - a.duration)
+    .slice(0, 5)
+    .map((r) => ({name: r.name, type: r.initiatorType, duration_ms: round(r.duration)}));
+
+if (since !== 0 || !("PerformanceObserver" in window)) return done(result);
+try {
+    new PerformanceObserver((list) => {
+        const entries = list.getEntries();
+        if (entries.length) result.lcp_ms = round(entries[entries.length - 1].startTime);
+    }).observe({type: "largest-contentful-paint", buffered: true});
+} catch (e) {}
+// Buffered entries are delivered asynchronously
+setTimeout(() => done(result), 50);
+"""
+
+# Metrics summarized in the terminal report
+SUMMARY_METRICS = ("fcp_ms", "lcp_ms", "load_ms", "duration_ms")
+
+_metrics_options = {"enabled": False, "enforce_budgets": False}
+_pending_records: List[Dict[str, Any]] = []
+_all_records: List[Dict[str, Any]] = []
+_metrics_lock = threading.Lock()
+
+
+def configure_browser_metrics(run_config: dict):
+    """Enable capture from the run config's `browser_metrics` section (true or a mapping)"""
+    options = run_config.get("browser_metrics") or {}
+    if options is True:
+        options = {"enabled": True}
+    _metrics_options["enabled"] = bool(options.get("enabled", False))
+    _metrics_options["enforce_budgets"] = bool(options.get("enforce_budgets", False))
+
+
+def metrics_enabled() -> bool:
+    return _metrics_options["enabled"]
+
+
+def load_perf_budgets() -> Dict[str, Dict[str, float]]:
+    """Load per-page metric budgets"""
+    return load_data_config("perf_budgets").get("budgets", {})
+
+
+def check_budgets(label: str, metrics: Dict[str, Any]) -> List[str]:
+    """Return a message for every metric over its budget for this page/action label"""
+    budget = load_perf_budgets().get(label, {})
+    return [
+        f"{label}: {metric} {metrics[metric]:.0f} ms exceeds budget {limit} ms"
+        if metric.endswith("_ms") else f"{label}: {metric} {metrics[metric]} exceeds budget {limit}"
+        for metric, limit in budget.items()
+        if metric in metrics and metrics[metric] > limit
+    ]
+
+
+def capture_page_metrics(
+    driver: WebDriver,
+    label: str,
+    since: float = 0,
+    duration_ms: Optional[float] = None
+) -> Dict[str, Any]:
+    """Read browser metrics, check them against the label's budget and record them"""
+    metrics = driver.execute_async_script(CAPTURE_SCRIPT, since) or {}
+    if duration_ms is not None:
+        metrics["duration_ms"] = round(duration_ms, 1)
+    violations = check_budgets(label, metrics)
+    record = {"label": label, "url": driver.current_url, "metrics": metrics, "violations": violations}
+
+    with _metrics_lock:
+        _pending_records.append(record)
+        _all_records.append(record)
+    if violations and _metrics_options["enforce_budgets"]:
+        raise AssertionError("; ".join(violations))
+    return record
+
+
+def drain_page_metrics() -> List[Dict[str, Any]]:
+    """Return and forget the records captured since the last call (one test's worth)"""
+    with _metrics_lock:
+        records = list(_pending_records)
+        _pending_records.clear()
+    return records
+
+
+def get_browser_metrics_summary() -> Dict[str, Dict[str, Any]]:
+    """Summarize captured metrics per label, with the number of budget violations"""
+    with _metrics_lock:
+        records = list(_all_records)
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    for label in sorted({record["label"] for record in records}):
+        label_records = [record for record in records if record["label"] == label]
+        label_summary = {
+            "count": len(label_records),
+            "violations": sum(len(record["violations"]) for record in label_records),
+        }
+        for metric in SUMMARY_METRICS:
+            values = [record["metrics"][metric] for record in label_records if metric in record["metrics"]]
+            if values:
+                label_summary[metric] = summarize_latencies(values)
+        summary[label] = label_summary
+    return summary
+
+
+def reset_browser_metrics():
+    with _metrics_lock:
+        _pending_records.clear()
+        _all_records.clear()
@@ -0,0 +1,379 @@
+"""Record and replay API traffic with cassette files, one per env and endpoint group.
+
+Modes (pytest --cassettes, or configure_cassettes):
+    off     talk to the live API (default)
+    record  talk to the live API and save every interaction
+    replay  answer only from cassettes; a missing interaction raises CassetteMissError
+    auto    replay what is recorded, record the rest
+
+Interactions are matched in O(1) on
+"METHOD /path?sorted=query#body-sha1#headers-sha1", so the host does not
+matter and request bodies (passwords included) are stored only as a hash. The
+header hash covers Authorization, Accept and Content-Type, so responses that
+depend on who asks or in which format are kept apart. Cassettes live in
+cassettes/{env}/{group}.json, where group is the endpoints.yaml group of the
+request path.
+
+Credentials are redacted before writing: Set-Cookie headers and token fields
+of JSON bodies are replaced with "redacted-<hash>" values. Authorization
+headers are matched through the same redaction, so a replayed login token
+still matches the requests that were recorded with the live one.
+
+Replay runs in-process through CassetteAdapter, which is mounted on the pooled
+sessions from core.api_helper. For other clients, serve the same cassettes over
+HTTP with `python -m core.cassettes serve --env dev --port 8081`. Both can
+inject latency: a fixed number of milliseconds, or "recorded" to replay the
+recorded timing. Replayed responses are flagged (`response.replayed`) and left
+out of the latency stats and response time budgets.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from core.config_loader import BASE_DIR
+from core.api_helper import load_api_endpoints, resolve_endpoint_path, set_adapter_factory
+from core.http_timing import TimingHTTPAdapter
+
+CASSETTE_DIR = BASE_DIR / "cassettes"
+CASSETTE_VERSION = 2
+CASSETTE_MODES = ("off", "record", "replay", "auto")
+
+# Headers that describe the original transfer rather than the content
+_DROPPED_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length", "date"}
+
+# Request headers that select a different response and so are part of the match key
+KEY_HEADERS = ("authorization", "accept", "content-type")
+
+# Response headers and JSON body fields holding credentials, redacted before writing
+SECRET_HEADERS = {"set-cookie"}
+SECRET_BODY_FIELDS = {"token", "access_token", "refresh_token", "id_token"}
+REDACTED_PREFIX = "redacted-"
+
+Latency = Union[int, float, str]
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """No recorded interaction matches a request in replay mode"""
+
+
+def redact_secret(value: str) -> str:
+    """Stable stand-in for a credential; already redacted values are returned as-is"""
+    if value.startswith(REDACTED_PREFIX):
+        return value
+    return REDACTED_PREFIX + hashlib.sha1(value.encode()).hexdigest()[:16]
+
+
+def _key_header_value(name: str, value: str) -> str:
+    if name == "authorization":
+        # "Bearer <token>": match on the redacted token, as stored in cassettes
+        scheme, _, credentials = value.partition(" ")
+        return f"{scheme} {redact_secret(credentials)}" if credentials else redact_secret(value)
+    return value
+
+
+def request_key(
+    method: str,
+    url: str,
+    body: Optional[Union[bytes, str]] = None,
+    headers: Optional[Mapping[str, str]] = None
+) -> str:
+    """Match key of a request: method, path, sorted query and hashes of the body and KEY_HEADERS"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    if isinstance(body, bytes) and body[:1] in (b"{", b"["):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            pass
+    if isinstance(body, str):
+        # JSON bodies are matched with their tokens redacted, e.g. a refresh request
+        # carrying the (redacted) token of a replayed login
+        body = (redact_body(body) if body[:1] in ("{", "[") else body).encode()
+    digest = hashlib.sha1(body).hexdigest()[:16] if body else "-"
+    lowered = {name.lower(): value for name, value in (headers or {}).items()}
+    selected = [f"{name}:{_key_header_value(name, lowered[name])}" for name in KEY_HEADERS if name in lowered]
+    header_digest = hashlib.sha1("\n".join(selected).encode()).hexdigest()[:16] if selected else "-"
+    return f"{method.upper()} {parts.path}{'?' + query if query else ''}#{digest}#{header_digest}"
+
+
+def _redact_fields(data: Any) -> Any:
+    if isinstance(data, dict):
+        return {
+            key: redact_secret(value) if key in SECRET_BODY_FIELDS and isinstance(value, str) else _redact_fields(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [_redact_fields(item) for item in data]
+    return data
+
+
+def redact_body(body: str) -> str:
+    """Replace token fields of a JSON body; other bodies are returned unchanged"""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    redacted = _redact_fields(data)
+    return body if redacted == data else json.dumps(redacted)
+
+
+_group_by_template: Optional[Dict[str, str]] = None
+
+
+def endpoint_group(url: str) -> str:
+    """endpoints.yaml group of a request URL; 'other' for unknown paths"""
+    global _group_by_template
+    if _group_by_template is None:
+        _group_by_template = {
+            template: group
+            for group, group_endpoints in load_api_endpoints().get("endpoints", {}).items()
+            for template in group_endpoints.values()
+        }
+    return _group_by_template.get(resolve_endpoint_path(url), "other")
+
+
+class CassetteLibrary:
+    """Cassettes of one environment, indexed by request key"""
+
+    def __init__(self, env: str = "dev", directory: Optional[Path] = None):
+        self.env = env
+        self.directory = (directory or CASSETTE_DIR) / env
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._groups: Dict[str, str] = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        for path in sorted(self.directory.glob("*.json")):
+            cassette = json.loads(path.read_text())
+            if cassette.get("version") != CASSETTE_VERSION:
+                continue
+            for interaction in cassette["interactions"]:
+                self._index[interaction["key"]] = interaction
+                self._groups[interaction["key"]] = path.stem
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._index.get(key)
+
+    def record(self, key: str, url: str, response: requests.Response, elapsed_ms: float):
+        content = response.content or b""
+        try:
+            body, encoding = redact_body(content.decode("utf-8")), "text"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode("ascii"), "base64"
+        headers = {
+            name: redact_secret(value) if name.lower() in SECRET_HEADERS else value
+            for name, value in response.headers.items() if name.lower() not in _DROPPED_HEADERS
+        }
+        interaction = {
+            "key": key,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": headers,
+            "body": body,
+            "body_encoding": encoding,
+            "elapsed_ms": round(elapsed_ms, 1),
+        }
+        group = endpoint_group(url)
+        with self._lock:
+            self._index[key] = interaction
+            self._groups[key] = group
+            self._dirty.add(group)
+
+    def save(self):
+        """Write changed groups, merging with what is on disk (other workers may have recorded too)"""
+        with self._lock:
+            groups, self._dirty = self._dirty, set()
+            by_group: Dict[str, Dict[str, Any]] = {group: {} for group in groups}
+            for key, group in self._groups.items():
+                if group in by_group:
+                    by_group[group][key] = self._index[key]
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for group, interactions in by_group.items():
+            path = self.directory / f"{group}.json"
+            if path.exists():
+                on_disk = json.loads(path.read_text()).get("interactions", [])
+                interactions = {**{i["key"]: i for i in on_disk}, **interactions}
+            cassette = {
+                "version": CASSETTE_VERSION,
+                "env": self.env,
+                "group": group,
+                "interactions": [interactions[key] for key in sorted(interactions)],
+            }
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(cassette, indent=1))
+            os.replace(tmp_path, path)
+
+
+def latency_seconds(interaction: Dict[str, Any], latency: Latency) -> float:
+    if latency == "recorded":
+        return interaction.get("elapsed_ms", 0) / 1000
+    return float(latency or 0) / 1000
+
+
+def interaction_body(interaction: Dict[str, Any]) -> bytes:
+    if interaction.get("body_encoding") == "base64":
+        return base64.b64decode(interaction["body"])
+    return interaction["body"].encode("utf-8")
+
+
+class CassetteAdapter(TimingHTTPAdapter):
+    """Transport adapter that replays and/or records interactions of a CassetteLibrary"""
+
+    def __init__(self, library: CassetteLibrary, mode: str = "replay", latency: Latency = 0, **kwargs):
+        if mode not in CASSETTE_MODES or mode == "off":
+            raise ValueError(f"Unsupported cassette mode: {mode}")
+        super().__init__(**kwargs)
+        self.library = library
+        self.mode = mode
+        self.latency = latency
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url, request.body, request.headers)
+        if self.mode in ("replay", "auto"):
+            interaction = self.library.lookup(key)
+            if interaction is not None:
+                return self._replay(request, interaction)
+            if self.mode == "replay":
+                raise CassetteMissError(f"No recorded interaction for {key} in {self.library.directory}", request=request)
+
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        self.library.record(key, request.url, response, (time.perf_counter() - start) * 1000)
+        return response
+
+    def _replay(self, request, interaction: Dict[str, Any]) -> requests.Response:
+        delay = latency_seconds(interaction, self.latency)
+        if delay:
+            time.sleep(delay)
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction.get("reason")
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response._content = interaction_body(interaction)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=delay)
+        response.replayed = True
+        return response
+
+
+_libraries: Dict[str, CassetteLibrary] = {}
+
+
+def configure_cassettes(mode: str = "off", latency: Latency = 0, directory: Optional[Path] = None):
+    """Route the pooled API sessions through cassettes in the given mode"""
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"Unsupported cassette mode: {mode}")
+    _libraries.clear()
+    if mode == "off":
+        set_adapter_factory(None)
+        return
+
+    def factory(env: str, **adapter_kwargs) -> CassetteAdapter:
+        if env not in _libraries:
+            _libraries[env] = CassetteLibrary(env, directory)
+        return CassetteAdapter(_libraries[env], mode=mode, latency=latency, **adapter_kwargs)
+
+    set_adapter_factory(factory)
+
+
+def save_cassettes():
+    """Persist interactions recorded in this process"""
+    for library in _libraries.values():
+        library.save()
+
+
+class StubServer:
+    """Localhost HTTP server answering from a CassetteLibrary"""
+
+    def __init__(self, library: CassetteLibrary, host: str = "127.0.0.1", port: int = 0, latency: Latency = 0):
+        library_ref, latency_ref = library, latency
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else None
+                interaction = library_ref.lookup(request_key(self.command, self.path, body, self.headers))
+                if interaction is None:
+                    content = json.dumps({"error": "No recorded interaction"}).encode()
+                    status, headers = 599, {"Content-Type": "application/json"}
+                else:
+                    time.sleep(latency_seconds(interaction, latency_ref))
+                    content = interaction_body(interaction)
+                    status, headers = interaction["status"], interaction["headers"]
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve recorded API cassettes over HTTP")
+    parser.add_argument("command", choices=["serve"])
+    parser.add_argument("--env", default="dev", help="Environment name: dev, stage, prod, etc.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", default="0", help="Injected latency in ms, or 'recorded'")
+    args = parser.parse_args(argv)
+
+    library = CassetteLibrary(args.env)
+    server = StubServer(library, args.host, args.port, latency=args.latency)
+    print(f"Serving {len(library)} recorded interactions for {args.env} at {server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
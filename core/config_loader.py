@@ -1,12 +1,162 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
 import yaml
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Precompiled snapshot of every YAML file under config/ (see core/config_snapshot.py).
+# Set to None to always parse YAML.
+SNAPSHOT_PATH: Optional[Path] = BASE_DIR / "config" / ".config_snapshot.pickle"
+SNAPSHOT_VERSION = 1
 
-def load_yaml(path: Path) -> dict:
+# libyaml's C loader is several times faster than the pure-Python one
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed YAML keyed by resolved path; each entry remembers the (mtime_ns, size)
+# stamp it was parsed from so edits on disk invalidate it on the next load.
+_config_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+_cache_stats = {"hits": 0, "misses": 0}
+_cache_lock = threading.Lock()
+_snapshot: Optional[Dict[str, Any]] = None
+
+
+def copy_tree(data: Any) -> Any:
+    """Copy the dict/list skeleton of parsed YAML (scalars are immutable)"""
+    if isinstance(data, dict):
+        return {k: copy_tree(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [copy_tree(item) for item in data]
+    return data
+
+
+def file_digest(path: Path) -> str:
+    """Content hash used to decide whether a snapshot entry is still valid"""
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+@contextmanager
+def file_lock(path: Path, timeout: float = 30.0, stale_after: float = 60.0) -> Iterator[None]:
+    """Cross-process lock held by creating path exclusively.
+
+    A lock file older than stale_after seconds (a crashed holder) is removed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - path.stat().st_mtime > stale_after:
+                    path.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for lock {path}")
+            time.sleep(0.05)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        yield
+    finally:
+        os.close(fd)
+        path.unlink(missing_ok=True)
+
+
+def read_yaml_file(path: Path) -> Any:
+    """Parse a YAML file from disk, bypassing cache and snapshot"""
     with path.open() as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+def _load_snapshot() -> Dict[str, Any]:
+    """Read the config snapshot once per process; empty if missing or outdated"""
+    global _snapshot
+    if _snapshot is None:
+        snapshot = {}
+        if SNAPSHOT_PATH is not None and SNAPSHOT_PATH.exists():
+            try:
+                with SNAPSHOT_PATH.open("rb") as f:
+                    loaded = pickle.load(f)
+                if loaded.get("version") == SNAPSHOT_VERSION:
+                    snapshot = loaded["files"]
+            except Exception:
+                # A corrupt snapshot only costs us the fast path
+                snapshot = {}
+        _snapshot = snapshot
+    return _snapshot
+
+
+def _snapshot_lookup(path: Path, stamp: Tuple[int, int]) -> Tuple[bool, Any]:
+    """Return (found, data) for path if the snapshot entry matches the file"""
+    try:
+        key = path.relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return False, None
+    entry = _load_snapshot().get(key)
+    if entry is None:
+        return False, None
+    if tuple(entry["stamp"]) == stamp or entry["sha1"] == file_digest(path):
+        return True, entry["data"]
+    return False, None
+
+
+def _parse_yaml(path: Path, stamp: Tuple[int, int]) -> Any:
+    found, data = _snapshot_lookup(path, stamp)
+    if found:
+        return data
+    return read_yaml_file(path)
+
+
+def load_yaml(path: Path) -> dict:
+    """Load a YAML file through the process-wide cache.
+
+    Every call returns a private copy, so callers may mutate the result
+    without affecting other callers or the cached document.
+    """
+    path = Path(path).resolve()
+    stamp = config_stamp(path)
+
+    with _cache_lock:
+        entry = _config_cache.get(path)
+        if entry is not None and entry[0] == stamp:
+            _cache_stats["hits"] += 1
+            return copy_tree(entry[1])
+
+    data = _parse_yaml(path, stamp)
+    with _cache_lock:
+        _cache_stats["misses"] += 1
+        _config_cache[path] = (stamp, data)
+    return copy_tree(data)
+
+
+def config_stamp(path: Path) -> Tuple[int, int]:
+    """(mtime_ns, size) of a config file; changes whenever load_yaml would re-parse it"""
+    stat = Path(path).stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Return config cache hit/miss counters and the number of cached files"""
+    with _cache_lock:
+        return {**_cache_stats, "entries": len(_config_cache)}
+
+
+def clear_config_cache():
+    """Drop all cached configs and reset the counters"""
+    global _snapshot
+    with _cache_lock:
+        _snapshot = None
+        _config_cache.clear()
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
 
 
 def load_env_config(env: str) -> dict:
@@ -19,11 +169,20 @@ def load_run_config(run: str) -> dict:
     return load_yaml(path)
 
 
-def load_data_config(name: str) -> dict:
-    path = BASE_DIR / "config" / "data" / f"{name}.yaml"
+def load_profile_config(name: str) -> dict:
+    """Load a browser performance profile from config/run/profiles/"""
+    path = BASE_DIR / "config" / "run" / "profiles" / f"{name}.yaml"
     return load_yaml(path)
 
 
+def data_config_path(name: str) -> Path:
+    return BASE_DIR / "config" / "data" / f"{name}.yaml"
+
+
+def load_data_config(name: str) -> dict:
+    return load_yaml(data_config_path(name))
+
+
 def load_api_config(config_name: str) -> dict:
     """Load API configuration from config/data/api/"""
     path = BASE_DIR / "config" / "data" / "api" / f"{config_name}.yaml"
@@ -34,4 +193,3 @@ def load_db_config(config_name: str) -> dict:
     """Load database configuration from config/data/db/"""
     path = BASE_DIR / "config" / "data" / "db" / f"{config_name}.yaml"
     return load_yaml(path)
-
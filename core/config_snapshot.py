@@ -0,0 +1,62 @@
+"""Compile every YAML file under config/ into a single binary snapshot.
+
+Run ``python -m core.config_snapshot`` after editing configs (or in CI before
+pytest) so sessions and xdist workers load all configs with one file read.
+Stale entries are detected per file and fall back to parsing the YAML.
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core import config_loader
+from core.config_loader import BASE_DIR, SNAPSHOT_VERSION, file_digest, read_yaml_file
+
+
+CONFIG_DIR = BASE_DIR / "config"
+
+
+def build_snapshot(config_dir: Path = CONFIG_DIR) -> Dict[str, Any]:
+    """Parse all YAML files under config_dir into a snapshot dictionary"""
+    files = {}
+    for path in sorted(config_dir.rglob("*.yaml")):
+        path = path.resolve()
+        stat = path.stat()
+        files[path.relative_to(BASE_DIR).as_posix()] = {
+            "stamp": (stat.st_mtime_ns, stat.st_size),
+            "sha1": file_digest(path),
+            "data": read_yaml_file(path),
+        }
+
+    content_hash = hashlib.sha1(
+        "".join(f"{key}:{entry['sha1']};" for key, entry in files.items()).encode()
+    ).hexdigest()
+    return {"version": SNAPSHOT_VERSION, "content_hash": content_hash, "files": files}
+
+
+def compile_snapshot(output: Optional[Path] = None, config_dir: Path = CONFIG_DIR) -> Dict[str, Any]:
+    """Build the snapshot and write it atomically to output"""
+    output = Path(output or config_loader.SNAPSHOT_PATH)
+    snapshot = build_snapshot(config_dir)
+
+    tmp_path = output.with_suffix(output.suffix + f".{os.getpid()}.tmp")
+    with tmp_path.open("wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, output)
+    return snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile config/ YAML files into a snapshot")
+    parser.add_argument("--output", type=Path, default=None, help="Snapshot path (default: config/.config_snapshot.pickle)")
+    args = parser.parse_args(argv)
+
+    snapshot = compile_snapshot(args.output)
+    print(f"Compiled {len(snapshot['files'])} config files (content hash {snapshot['content_hash'][:12]})")
+
+
+if __name__ == "__main__":
+    main()
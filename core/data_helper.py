@@ -3,6 +3,7 @@
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from core.config_loader import load_data_config, BASE_DIR
+from core.templating import TemplateTree
 
 
 def load_users() -> Dict[str, Any]:
@@ -29,6 +30,16 @@ def get_user_by_role(role: str) -> Optional[Dict[str, Any]]:
     return None
 
 
+def get_role_credentials(role: str) -> Dict[str, Any]:
+    """Get credentials by key in login_users.yaml or users.yaml, then by role"""
+    login_users = load_data_config("login_users")
+    users = load_users()
+    user = login_users.get(role) or users.get(role) or get_user_by_role(role)
+    if not isinstance(user, dict) or "password" not in user:
+        raise ValueError(f"No credentials found for role: {role}")
+    return user
+
+
 def get_form_data(form_name: str, data_type: str = "valid_data") -> Optional[Dict[str, Any]]:
     """Get form data by form name and data type (valid_data or invalid_data)"""
     forms = load_forms()
@@ -51,18 +62,13 @@ def merge_data(base_data: Dict[str, Any], override_data: Dict[str, Any]) -> Dict
 
 
 def replace_placeholders(data: Any, replacements: Dict[str, str]) -> Any:
-    """Replace placeholders in data with actual values"""
-    if isinstance(data, dict):
-        return {k: replace_placeholders(v, replacements) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [replace_placeholders(item, replacements) for item in data]
-    elif isinstance(data, str):
-        result = data
-        for key, value in replacements.items():
-            result = result.replace(f"{{{key}}}", str(value))
-        return result
-    else:
-        return data
+    """Replace {placeholders} in data with replacements or template providers (e.g. {timestamp}).
+
+    Strings are parsed once per distinct text (compile_template), so repeated
+    renders of the same payload only walk it. The result is a new structure;
+    data is not modified.
+    """
+    return TemplateTree(data).render({str(key): value for key, value in (replacements or {}).items()})
 
 
 def validate_required_fields(data: Dict[str, Any], required_fields: List[str]) -> bool:
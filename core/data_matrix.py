@@ -0,0 +1,202 @@
+"""Expand YAML test data into parametrized test cases without materializing them.
+
+A test marked with
+
+    @pytest.mark.data_matrix(email="api/test_data:emails.invalid_emails",
+                             form="forms:registration_form.invalid_data",
+                             mode="product")
+
+and requesting the `matrix_case` fixture runs once per combination of the
+axes. An axis is a "<data config>:<dotted.path>" source, optionally followed by
+"[key1,key2]" to keep selected entries, or a literal list. Mappings give
+one case per key, and lists give one case per item. `mode` is "product" (every
+combination) or "pairwise" (every pair of values across two axes, in far fewer
+cases).
+
+Collection only loads each axis once and keeps case numbers. A case's values
+are decoded from its number when the fixture runs, so tens of thousands of
+combinations cost one small object each.
+"""
+
+import copy
+import json
+import re
+import threading
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.config_loader import load_data_config
+from core.data_helper import get_nested_value
+
+MATRIX_MODES = ("product", "pairwise")
+
+_AXIS_SOURCE = re.compile(r"^(?P<config>[\w/]+):(?P<path>[\w.]*)(?:\[(?P<keys>[^\]]*)\])?$")
+
+_matrix_plans: Dict[str, "MatrixPlan"] = {}
+_plans_lock = threading.Lock()
+
+
+class MatrixAxis:
+    """One dimension of a matrix: case ids plus the values they refer to"""
+
+    def __init__(self, name: str, ids: List[str], values: List[Any]):
+        self.name = name
+        self.ids = ids
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _scalar_id(value: Any) -> str:
+    text = str(value)
+    return text if text else "empty"
+
+
+def load_axis(name: str, source: Any) -> MatrixAxis:
+    """Resolve an axis source into ids and values"""
+    if isinstance(source, (list, tuple)):
+        data, keys = list(source), None
+    elif isinstance(source, str):
+        match = _AXIS_SOURCE.match(source.strip())
+        if not match:
+            raise ValueError(f"Invalid data_matrix source for {name}: {source!r}")
+        config = load_data_config(match.group("config"))
+        data = get_nested_value(config, match.group("path")) if match.group("path") else config
+        if data is None:
+            raise ValueError(f"data_matrix source not found for {name}: {source!r}")
+        keys = [key.strip() for key in match.group("keys").split(",")] if match.group("keys") else None
+    else:
+        raise ValueError(f"Unsupported data_matrix source for {name}: {source!r}")
+
+    if isinstance(data, dict):
+        selected = keys if keys is not None else list(data)
+        missing = [key for key in selected if key not in data]
+        if missing:
+            raise ValueError(f"data_matrix keys not found for {name}: {missing}")
+        return MatrixAxis(name, [str(key) for key in selected], [data[key] for key in selected])
+    if isinstance(data, list):
+        if keys is not None:
+            raise ValueError(f"Key selection needs a mapping source for {name}: {source!r}")
+        ids = [
+            _scalar_id(item) if not isinstance(item, (dict, list)) else f"{name}{index}"
+            for index, item in enumerate(data)
+        ]
+        return MatrixAxis(name, ids, data)
+    return MatrixAxis(name, [_scalar_id(data)], [data])
+
+
+def _pair(axis: int, value: int, other: int, other_value: int) -> Tuple[int, int, int, int]:
+    if axis < other:
+        return axis, value, other, other_value
+    return other, other_value, axis, value
+
+
+def pairwise_rows(sizes: Sequence[int]) -> List[Tuple[int, ...]]:
+    """Greedy covering array: index rows that contain every value pair of every two axes"""
+    if 0 in sizes:
+        # An empty axis has no values to combine, like an empty product
+        return []
+    if len(sizes) < 2:
+        return [(index,) for index in range(sizes[0])] if sizes else []
+
+    axis_pairs = list(combinations(range(len(sizes)), 2))
+    uncovered = {
+        (i, a, j, b)
+        for i, j in axis_pairs
+        for a in range(sizes[i])
+        for b in range(sizes[j])
+    }
+    rows = []
+    while uncovered:
+        # Seed with the smallest uncovered pair so the result is deterministic
+        i, a, j, b = min(uncovered)
+        row: List[Optional[int]] = [None] * len(sizes)
+        row[i], row[j] = a, b
+        for axis in range(len(sizes)):
+            if row[axis] is not None:
+                continue
+            row[axis] = max(
+                range(sizes[axis]),
+                key=lambda value: sum(
+                    1 for other, other_value in enumerate(row)
+                    if other_value is not None and _pair(axis, value, other, other_value) in uncovered
+                )
+            )
+        uncovered.difference_update((i, row[i], j, row[j]) for i, j in axis_pairs)
+        rows.append(tuple(row))
+    return rows
+
+
+class MatrixCaseRef:
+    """Parameter value of a matrix case: the shared plan and the case number"""
+
+    __slots__ = ("plan", "index")
+
+    def __init__(self, plan: "MatrixPlan", index: int):
+        self.plan = plan
+        self.index = index
+
+    def __repr__(self) -> str:
+        return self.plan.case_id(self.index)
+
+
+class MatrixPlan:
+    """Axes and combination mode of one data_matrix marker"""
+
+    def __init__(self, axes: List[MatrixAxis], mode: str = "product"):
+        if mode not in MATRIX_MODES:
+            raise ValueError(f"Unsupported data_matrix mode: {mode}")
+        if not axes:
+            raise ValueError("data_matrix needs at least one axis")
+        self.axes = axes
+        self.mode = mode
+        self._rows = pairwise_rows([len(axis) for axis in axes]) if mode == "pairwise" else None
+
+    def __len__(self) -> int:
+        if self._rows is not None:
+            return len(self._rows)
+        total = 1
+        for axis in self.axes:
+            total *= len(axis)
+        return total
+
+    def indexes(self, case: int) -> Tuple[int, ...]:
+        """Per-axis value indexes of a case (mixed-radix decoding in product mode)"""
+        if self._rows is not None:
+            return self._rows[case]
+        digits = []
+        for axis in reversed(self.axes):
+            case, digit = divmod(case, len(axis))
+            digits.append(digit)
+        return tuple(reversed(digits))
+
+    def case_id(self, case: int) -> str:
+        return "-".join(axis.ids[index] for axis, index in zip(self.axes, self.indexes(case)))
+
+    def case(self, case: int) -> Dict[str, Any]:
+        """The values of a case, copied so tests may modify them"""
+        return {
+            axis.name: copy.deepcopy(axis.values[index])
+            for axis, index in zip(self.axes, self.indexes(case))
+        }
+
+    def refs(self) -> List[MatrixCaseRef]:
+        return [MatrixCaseRef(self, case) for case in range(len(self))]
+
+
+def get_matrix_plan(axes: Dict[str, Any], mode: str = "product") -> MatrixPlan:
+    """Build (or reuse) the plan for a marker's axes; identical markers share one plan"""
+    key = json.dumps([axes, mode], sort_keys=True, default=str)
+    with _plans_lock:
+        plan = _matrix_plans.get(key)
+    if plan is None:
+        plan = MatrixPlan([load_axis(name, source) for name, source in axes.items()], mode)
+        with _plans_lock:
+            _matrix_plans[key] = plan
+    return plan
+
+
+def clear_matrix_plans():
+    with _plans_lock:
+        _matrix_plans.clear()
@@ -0,0 +1,166 @@
+"""Declarative DB state checks from config/data/db/assertions.yaml.
+
+All expected_counts and expected_states rules that target the same table
+are compiled into a single aggregate query (one SUM(CASE ...) column per
+rule), so validating a table costs one round trip however many rules it
+has. Compiled checks are cached per rule set.
+"""
+
+import json
+import re
+from typing import Dict, Any, Optional, List, NamedTuple, Sequence, Tuple
+
+from core.db_helper import execute_query, load_db_assertions, quote_identifier
+
+
+class AssertionResult(NamedTuple):
+    """Outcome of one assertion rule (or one column of a state rule)"""
+    rule: str
+    table: str
+    check: str
+    expected: Any
+    actual: Any
+    passed: bool
+
+
+class CompiledTableCheck(NamedTuple):
+    """Single aggregate query evaluating every rule for one table"""
+    table: str
+    query: str
+    params: Dict[str, Any]
+    checks: Tuple[Tuple[str, str, str, Any], ...]
+
+
+_COMPARISON = re.compile(r"^\s*(>=|<=|!=|<>|>|<|=)\s*(.+?)\s*$")
+
+# Compiled checks keyed by the serialized rule set
+_compiled_checks: Dict[str, List[CompiledTableCheck]] = {}
+
+
+def _parse_literal(raw: str) -> Any:
+    """Turn the right-hand side of a comparison like '>= 0' into a number when possible"""
+    for cast in (int, float):
+        try:
+            return cast(raw)
+        except ValueError:
+            pass
+    return raw.strip("'\"")
+
+
+def compile_predicate(column: str, expected: Any, params: Dict[str, Any]) -> Tuple[str, str]:
+    """Compile one column expectation to (SQL predicate, description), adding bind params"""
+    col = quote_identifier(column)
+    if expected is None:
+        return f"{col} IS NULL", f"{column} is null"
+    if expected == "not_null":
+        return f"{col} IS NOT NULL", f"{column} is not null"
+
+    operator = "="
+    value = expected
+    if isinstance(expected, str):
+        match = _COMPARISON.match(expected)
+        if match:
+            operator, value = match.group(1), _parse_literal(match.group(2))
+
+    param = f"p{len(params)}"
+    params[param] = value
+    return f"{col} {operator} :{param}", f"{column} {operator} {value!r}"
+
+
+def _count_table(rule_name: str, rule: Dict[str, Any]) -> str:
+    table = rule.get("table")
+    if table:
+        return table
+    return rule_name[:-len("_table")] if rule_name.endswith("_table") else rule_name
+
+
+def compile_assertions(assertions: Optional[Dict[str, Any]] = None,
+                       names: Optional[Sequence[str]] = None) -> List[CompiledTableCheck]:
+    """Compile count and state rules into one aggregate query per table"""
+    if assertions is None:
+        assertions = load_db_assertions()
+    rules = {
+        "expected_counts": {
+            name: rule for name, rule in (assertions.get("expected_counts") or {}).items()
+            if names is None or name in names
+        },
+        "expected_states": {
+            name: rule for name, rule in (assertions.get("expected_states") or {}).items()
+            if names is None or name in names
+        },
+    }
+    cache_key = json.dumps(rules, sort_keys=True, default=str)
+    if cache_key in _compiled_checks:
+        return _compiled_checks[cache_key]
+
+    tables: Dict[str, Dict[str, Any]] = {}
+
+    def table_entry(table: str) -> Dict[str, Any]:
+        return tables.setdefault(table, {"columns": [], "params": {}, "checks": []})
+
+    for name, rule in rules["expected_counts"].items():
+        entry = table_entry(_count_table(name, rule))
+        where = rule.get("where")
+        entry["columns"].append(f"SUM(CASE WHEN {where} THEN 1 ELSE 0 END)" if where else "COUNT(*)")
+        bounds = {key: rule.get(key) for key in ("min", "max", "exact") if rule.get(key) is not None}
+        entry["checks"].append(("count", name, "row count", bounds))
+
+    for name, rule in rules["expected_states"].items():
+        table = rule.get("table")
+        if not table:
+            raise ValueError(f"Expected state '{name}' has no table")
+        entry = table_entry(table)
+        scope = f"({rule['where']})" if rule.get("where") else "1 = 1"
+        for column, expected in rule.items():
+            if column in ("table", "where"):
+                continue
+            predicate, description = compile_predicate(column, expected, entry["params"])
+            entry["columns"].append(
+                f"SUM(CASE WHEN {scope} AND NOT COALESCE(({predicate}), FALSE) THEN 1 ELSE 0 END)"
+            )
+            entry["checks"].append(("state", name, description, 0))
+
+    compiled = []
+    for table, entry in tables.items():
+        columns = ", ".join(f"{column} AS check_{i}" for i, column in enumerate(entry["columns"]))
+        query = f"SELECT {columns} FROM {quote_identifier(table)}"
+        compiled.append(CompiledTableCheck(table, query, entry["params"], tuple(entry["checks"])))
+
+    _compiled_checks[cache_key] = compiled
+    return compiled
+
+
+def _count_passes(count: int, bounds: Dict[str, Any]) -> bool:
+    if "exact" in bounds and count != bounds["exact"]:
+        return False
+    if "min" in bounds and count < bounds["min"]:
+        return False
+    if "max" in bounds and count > bounds["max"]:
+        return False
+    return True
+
+
+def evaluate_db_assertions(env: str = "dev", names: Optional[Sequence[str]] = None) -> List[AssertionResult]:
+    """Run all (or the named) assertion rules with one query per table"""
+    results = []
+    for table_check in compile_assertions(names=names):
+        row = execute_query(table_check.query, params=table_check.params or None, env=env, fetch_one=True)
+        row = row or {}
+        for i, (kind, rule, check, expected) in enumerate(table_check.checks):
+            actual = int(row.get(f"check_{i}") or 0)
+            passed = _count_passes(actual, expected) if kind == "count" else actual == expected
+            results.append(AssertionResult(rule, table_check.table, check, expected, actual, passed))
+    return results
+
+
+def assert_db_state(env: str = "dev", names: Optional[Sequence[str]] = None):
+    """Raise AssertionError listing every violated rule"""
+    violations = [result for result in evaluate_db_assertions(env, names) if not result.passed]
+    if violations:
+        lines = []
+        for result in violations:
+            if result.check == "row count":
+                lines.append(f"{result.rule} ({result.table}): row count {result.actual} outside {result.expected}")
+            else:
+                lines.append(f"{result.rule} ({result.table}): {result.actual} row(s) violate {result.check}")
+        raise AssertionError("DB assertions failed:\n" + "\n".join(lines))
@@ -1,14 +1,80 @@
 """Database helper functions for loading DB configs and executing queries"""
 
-from typing import Dict, Any, Optional, List
+import csv
+import functools
+import hashlib
+import io
+import re
+import threading
+import uuid
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, NamedTuple, Tuple, Iterator
 import psycopg2
-from psycopg2 import pool, sql
-from psycopg2.extras import RealDictCursor
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor, NamedTupleCursor, execute_values
 from core.config_loader import load_data_config, load_env_config, BASE_DIR
+from core.db_pool import ConnectionPool
+from core.db_sqlite import SUPPORTS_RETURNING, close_sqlite_databases, connect_sqlite, quote_identifier
 
 
 # Connection pool (can be initialized per environment)
-_connection_pools: Dict[str, pool.ThreadedConnectionPool] = {}
+_connection_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+class CompiledQuery(NamedTuple):
+    """A queries.yaml statement compiled from :name placeholders to driver form"""
+    source: str
+    text: str
+    positional: str
+    param_names: Tuple[str, ...]
+    # SQLite only: `IN :name` lists expanded at execution, RETURNING emulated via lastrowid
+    expand_names: Tuple[str, ...] = ()
+    emulate_returning: bool = False
+
+
+DIALECTS = ("postgresql", "sqlite")
+_DIALECT_SCHEMES = {"postgresql": "postgresql", "postgres": "postgresql", "sqlite": "sqlite"}
+
+
+# String literals, quoted identifiers and :: casts are copied through untouched
+_QUERY_TOKENS = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|::)|(?<![\w:]):([A-Za-z_]\w*)|(%)""")
+
+# Compiled queries keyed by (dialect, source SQL)
+_compiled_queries: Dict[Tuple[str, str], CompiledQuery] = {}
+
+# Postgres constructs rewritten for SQLite, applied outside string literals
+_SQL_LITERALS = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")""")
+_SQLITE_REWRITES = [
+    (re.compile(r"\bNOW\s*\(\s*\)", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+    (re.compile(r"::\s*\w+(?:\s*\(\s*\d+(?:\s*,\s*\d+)?\s*\))?"), ""),
+    (re.compile(r"\bILIKE\b", re.IGNORECASE), "LIKE"),
+]
+_SQLITE_PARAM = re.compile(r"(?<![\w:]):([A-Za-z_]\w*)")
+_IN_PARAM = re.compile(r"\bIN\s+:([A-Za-z_]\w*)", re.IGNORECASE)
+_RETURNING = re.compile(r"\s+RETURNING\s+\w+\s*;?\s*$", re.IGNORECASE)
+
+# connections.yaml entry used for every environment (pytest --db)
+_db_override: Optional[str] = None
+
+# Row types supported by stream_query and their cursor factories
+_STREAM_CURSOR_FACTORIES = {"dict": RealDictCursor, "namedtuple": NamedTupleCursor, "tuple": None}
+
+# Connections of active test transactions per thread, keyed by env, as (connection, savepoint
+# depth). execute_* helpers join these instead of checking out a pooled connection; other
+# threads (e.g. concurrent API batches) keep using their own pooled connections.
+_transaction_state = threading.local()
+
+
+def _active_transactions() -> Dict[str, Tuple[Any, int]]:
+    """This thread's active test transactions"""
+    if not hasattr(_transaction_state, "by_env"):
+        _transaction_state.by_env = {}
+    return _transaction_state.by_env
+
+# Server-side prepared statement names per connection
+_prepared_statements: "weakref.WeakKeyDictionary[Any, set]" = weakref.WeakKeyDictionary()
 
 
 def load_db_connections() -> Dict[str, Any]:
@@ -31,10 +97,56 @@ def load_db_assertions() -> Dict[str, Any]:
     return load_data_config("db/assertions")
 
 
+def set_db_override(name: Optional[str]):
+    """Use the connections.yaml entry `name` (e.g. sqlite_example) for every environment"""
+    global _db_override
+    if name and name not in load_db_connections():
+        raise ValueError(f"Database configuration '{name}' not found")
+    if name != _db_override:
+        close_all_pools()
+    _db_override = name
+
+
+def get_db_override() -> Optional[str]:
+    """connections.yaml entry set by set_db_override (pytest --db), if any"""
+    return _db_override
+
+
 def get_db_config(env: str = "dev") -> Dict[str, Any]:
     """Get database configuration for the specified environment"""
     connections = load_db_connections()
-    return connections.get(env, {})
+    return connections.get(_db_override or env, {})
+
+
+def get_dialect(db_config: Dict[str, Any]) -> str:
+    """SQL dialect of a connections.yaml entry: `dialect`, else the connection_string scheme"""
+    dialect = db_config.get("dialect")
+    if dialect is None:
+        scheme = db_config.get("connection_string", "postgresql://").split(":", 1)[0]
+        dialect = _DIALECT_SCHEMES.get(scheme.split("+", 1)[0])
+    if dialect not in DIALECTS:
+        raise ValueError(f"Unsupported database dialect: {dialect or db_config.get('connection_string')}")
+    return dialect
+
+
+def connection_dialect(conn: Any) -> str:
+    return getattr(conn, "dialect", "postgresql")
+
+
+def _connect(db_config: Dict[str, Any]) -> Any:
+    """Open a new database connection from a connections.yaml entry"""
+    if get_dialect(db_config) == "sqlite":
+        return connect_sqlite(db_config)
+    connect_args = {
+        "host": db_config["host"],
+        "port": db_config["port"],
+        "database": db_config["database"],
+        "user": db_config["username"],
+        "password": db_config["password"]
+    }
+    if db_config.get("ssl_mode"):
+        connect_args["sslmode"] = db_config["ssl_mode"]
+    return psycopg2.connect(**connect_args)
 
 
 def create_connection(env: str = "dev", use_pool: bool = True) -> Any:
@@ -46,25 +158,20 @@ def create_connection(env: str = "dev", use_pool: bool = True) -> Any:
     
     if use_pool:
         pool_key = f"{env}_pool"
-        if pool_key not in _connection_pools:
-            _connection_pools[pool_key] = pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=db_config.get("pool_size", 5),
-                host=db_config["host"],
-                port=db_config["port"],
-                database=db_config["database"],
-                user=db_config["username"],
-                password=db_config["password"]
-            )
-        return _connection_pools[pool_key].getconn()
+        with _pools_lock:
+            if pool_key not in _connection_pools:
+                _connection_pools[pool_key] = ConnectionPool(
+                    functools.partial(_connect, db_config),
+                    pool_size=db_config.get("pool_size", 5),
+                    max_overflow=db_config.get("max_overflow", 0),
+                    timeout=db_config.get("pool_timeout", 30),
+                    pre_ping=db_config.get("pool_pre_ping", True),
+                    recycle=db_config.get("pool_recycle")
+                )
+            connection_pool = _connection_pools[pool_key]
+        return connection_pool.getconn()
     else:
-        return psycopg2.connect(
-            host=db_config["host"],
-            port=db_config["port"],
-            database=db_config["database"],
-            user=db_config["username"],
-            password=db_config["password"]
-        )
+        return _connect(db_config)
 
 
 def return_connection(conn: Any, env: str = "dev"):
@@ -74,6 +181,79 @@ def return_connection(conn: Any, env: str = "dev"):
         _connection_pools[pool_key].putconn(conn)
 
 
+@contextmanager
+def pooled_connection(env: str = "dev") -> Iterator[Any]:
+    """Check out a pooled connection for the duration of a with block"""
+    conn = create_connection(env)
+    try:
+        yield conn
+    finally:
+        return_connection(conn, env)
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Get checkout, wait time and occupancy metrics for every pool"""
+    with _pools_lock:
+        return {pool_key: connection_pool.metrics() for pool_key, connection_pool in _connection_pools.items()}
+
+
+@contextmanager
+def _connection_scope(env: str) -> Iterator[Tuple[Any, bool]]:
+    """Yield (connection, joined); joined connections belong to an active test transaction"""
+    active = _active_transactions().get(env)
+    if active is not None:
+        # Errors are left to the transaction owner, which rolls back at teardown
+        yield active[0], True
+        return
+    
+    conn = create_connection(env)
+    try:
+        yield conn, False
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        return_connection(conn, env)
+
+
+@contextmanager
+def transaction_scope(env: str = "dev", connection: Any = None) -> Iterator[Any]:
+    """Run everything inside a transaction that is rolled back on exit.
+    
+    While active, execute_query, execute_insert and the bulk helpers for env
+    join this transaction instead of committing on their own connection.
+    With a long-lived connection (or when nested) a SAVEPOINT is used, so
+    the reset costs one statement regardless of how much was written.
+    """
+    active_transactions = _active_transactions()
+    previous = active_transactions.get(env)
+    owns_connection = connection is None and previous is None
+    if previous is not None:
+        conn, depth = previous[0], previous[1] + 1
+    else:
+        conn, depth = (create_connection(env) if owns_connection else connection), 1
+    
+    savepoint = f"test_savepoint_{depth}"
+    cursor = conn.cursor()
+    if not owns_connection:
+        cursor.execute(f"SAVEPOINT {savepoint}")
+    active_transactions[env] = (conn, depth)
+    try:
+        yield conn
+    finally:
+        if previous is not None:
+            active_transactions[env] = previous
+        else:
+            active_transactions.pop(env, None)
+        
+        if owns_connection:
+            conn.rollback()
+            return_connection(conn, env)
+        else:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+
+
 def get_query(query_group: str, query_name: str) -> Optional[str]:
     """Get a specific SQL query"""
     queries = load_db_queries()
@@ -81,20 +261,149 @@ def get_query(query_group: str, query_name: str) -> Optional[str]:
     return query_group_data.get(query_name)
 
 
+def _compile_sqlite(query: str) -> CompiledQuery:
+    """Rewrite Postgres-only constructs for SQLite, keeping its native :name placeholders"""
+    param_names: List[str] = []
+    expand_names: List[str] = []
+    parts = []
+    for index, part in enumerate(_SQL_LITERALS.split(query)):
+        if index % 2 == 0:
+            for pattern, replacement in _SQLITE_REWRITES:
+                part = pattern.sub(replacement, part)
+            for name in _SQLITE_PARAM.findall(part):
+                if name not in param_names:
+                    param_names.append(name)
+            expand_names.extend(name for name in _IN_PARAM.findall(part) if name not in expand_names)
+        parts.append(part)
+    text = "".join(parts)
+    
+    emulate_returning = not SUPPORTS_RETURNING and _RETURNING.search(text) is not None
+    if emulate_returning:
+        text = _RETURNING.sub("", text)
+    return CompiledQuery(query, text, text, tuple(param_names), tuple(expand_names), emulate_returning)
+
+
+def compile_query(query: str, dialect: str = "postgresql") -> CompiledQuery:
+    """Compile :name placeholders into psycopg2 %(name)s and PREPARE-style $n forms (cached).
+    
+    For dialect="sqlite" the statement keeps :name placeholders and Postgres-only
+    constructs (NOW(), :: casts, ILIKE, RETURNING on old SQLite) are rewritten.
+    """
+    compiled = _compiled_queries.get((dialect, query))
+    if compiled is not None:
+        return compiled
+    if dialect == "sqlite":
+        compiled = _compiled_queries[(dialect, query)] = _compile_sqlite(query)
+        return compiled
+    
+    param_names: List[str] = []
+    
+    def to_pyformat(match):
+        literal, name, percent = match.groups()
+        if literal:
+            return literal.replace("%", "%%") if literal[0] == "'" else literal
+        if name:
+            if name not in param_names:
+                param_names.append(name)
+            return f"%({name})s"
+        return "%%"
+    
+    def to_positional(match):
+        literal, name, percent = match.groups()
+        if name:
+            return f"${param_names.index(name) + 1}"
+        return match.group(0)
+    
+    text = _QUERY_TOKENS.sub(to_pyformat, query)
+    if not param_names:
+        # Nothing to bind: keep the SQL exactly as written (no %-escaping)
+        text = query
+    positional = _QUERY_TOKENS.sub(to_positional, query)
+    
+    compiled = CompiledQuery(query, text, positional, tuple(param_names))
+    _compiled_queries[(dialect, query)] = compiled
+    return compiled
+
+
+def get_compiled_query(query_group: str, query_name: str) -> Optional[CompiledQuery]:
+    """Get a specific SQL query compiled for the driver"""
+    query = get_query(query_group, query_name)
+    return compile_query(query) if query else None
+
+
+def _bind_params(compiled: CompiledQuery, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Check that every placeholder of a compiled query has a value"""
+    if not compiled.param_names:
+        return params
+    missing = [name for name in compiled.param_names if name not in (params or {})]
+    if missing:
+        raise ValueError(f"Missing query parameters: {', '.join(missing)}")
+    return params
+
+
+def _expand_in_params(compiled: CompiledQuery, params: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Turn `IN :ids` with a list value into `IN (:ids_0, :ids_1, ...)`"""
+    text, params = compiled.text, dict(params)
+    for name in compiled.expand_names:
+        values = params.pop(name)
+        if not isinstance(values, (list, tuple, set)):
+            values = [values]
+        names = [f"{name}_{index}" for index in range(len(values))]
+        params.update(zip(names, values))
+        placeholders = "(" + ", ".join(f":{item}" for item in names) + ")" if names else "(NULL)"
+        pattern = re.compile(rf"\bIN\s+:{name}\b", re.IGNORECASE)
+        text = "".join(
+            part if index % 2 else pattern.sub(lambda match: f"IN {placeholders}", part)
+            for index, part in enumerate(_SQL_LITERALS.split(text))
+        )
+    return text, params
+
+
+def _execute(conn: Any, cursor: Any, query: str, params: Optional[Dict[str, Any]], prepared: bool = False):
+    """Execute a query with :name placeholders, optionally as a server-side prepared statement"""
+    dialect = connection_dialect(conn)
+    compiled = compile_query(query, dialect)
+    params = _bind_params(compiled, params)
+    
+    if dialect == "sqlite":
+        # sqlite3 already caches prepared statements per connection
+        text = compiled.text
+        if compiled.expand_names:
+            text, params = _expand_in_params(compiled, params)
+        cursor.execute(text, params)
+        if compiled.emulate_returning:
+            cursor.set_rows([(cursor.lastrowid,)])
+        return
+    
+    if not prepared:
+        cursor.execute(compiled.text, params)
+        return
+    
+    statement = "q_" + hashlib.sha1(compiled.positional.encode()).hexdigest()[:16]
+    prepared_names = _prepared_statements.setdefault(conn, set())
+    if statement not in prepared_names:
+        cursor.execute(f"PREPARE {statement} AS {compiled.positional}")
+        prepared_names.add(statement)
+    if compiled.param_names:
+        placeholders = ", ".join(["%s"] * len(compiled.param_names))
+        cursor.execute(f"EXECUTE {statement} ({placeholders})", [params[name] for name in compiled.param_names])
+    else:
+        cursor.execute(f"EXECUTE {statement}")
+
+
 def execute_query(
     query: str,
     params: Optional[Dict[str, Any]] = None,
     env: str = "dev",
     fetch: bool = True,
-    fetch_one: bool = False
+    fetch_one: bool = False,
+    prepared: bool = False
 ) -> Optional[List[Dict[str, Any]]]:
     """Execute a SQL query and return results"""
-    conn = None
-    try:
-        conn = create_connection(env)
+    with _connection_scope(env) as (conn, joined):
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
-        cursor.execute(query, params)
+        _execute(conn, cursor, query, params, prepared)
         
         if fetch:
             if fetch_one:
@@ -104,41 +413,64 @@ def execute_query(
                 results = cursor.fetchall()
                 return [dict(row) for row in results]
         else:
-            conn.commit()
+            if not joined:
+                conn.commit()
             return None
-            
-    except Exception as e:
-        if conn:
+
+
+def stream_query(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    env: str = "dev",
+    itersize: int = 2000,
+    row_type: str = "dict"
+) -> Iterator[Any]:
+    """Yield query rows lazily from a named server-side cursor.
+    
+    Only itersize rows are held in memory at a time. row_type selects
+    "dict" rows, or lighter "namedtuple" / "tuple" rows for large scans.
+    """
+    if row_type not in _STREAM_CURSOR_FACTORIES:
+        raise ValueError(f"Unsupported row type: {row_type}")
+    cursor_factory = _STREAM_CURSOR_FACTORIES[row_type]
+    
+    with _connection_scope(env) as (conn, joined):
+        cursor_name = f"stream_{uuid.uuid4().hex[:12]}"
+        if cursor_factory is None:
+            cursor = conn.cursor(name=cursor_name)
+        else:
+            cursor = conn.cursor(name=cursor_name, cursor_factory=cursor_factory)
+        cursor.itersize = itersize
+        try:
+            _execute(conn, cursor, query, params)
+            for row in cursor:
+                yield row
+        finally:
+            cursor.close()
+        if not joined:
+            # End the read transaction the cursor was declared in
             conn.rollback()
-        raise e
-    finally:
-        if conn:
-            return_connection(conn, env)
 
 
-def execute_insert(query: str, params: Optional[Dict[str, Any]] = None, env: str = "dev") -> Optional[Any]:
+def execute_insert(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    env: str = "dev",
+    prepared: bool = False
+) -> Optional[Any]:
     """Execute an INSERT query and return the inserted ID"""
-    conn = None
-    try:
-        conn = create_connection(env)
+    with _connection_scope(env) as (conn, joined):
         cursor = conn.cursor()
         
-        cursor.execute(query, params)
-        conn.commit()
+        _execute(conn, cursor, query, params, prepared)
+        if not joined:
+            conn.commit()
         
         # Try to get the returned ID (for RETURNING clause)
         try:
             return cursor.fetchone()[0]
         except:
             return None
-            
-    except Exception as e:
-        if conn:
-            conn.rollback()
-        raise e
-    finally:
-        if conn:
-            return_connection(conn, env)
 
 
 def cleanup_test_data(table: str, condition: str, params: Optional[Dict[str, Any]] = None, env: str = "dev"):
@@ -153,6 +485,153 @@ def get_test_data(data_type: str) -> Optional[List[Dict[str, Any]]]:
     return test_data.get(data_type)
 
 
+def _insert_values(cursor: Any, table: str, columns: List[str], rows: List[Dict[str, Any]],
+                   returning: str, page_size: int) -> List[Any]:
+    """Multi-row INSERT ... VALUES via execute_values"""
+    query = sql.SQL("INSERT INTO {} ({}) VALUES %s RETURNING {}").format(
+        sql.Identifier(table),
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+        sql.Identifier(returning)
+    )
+    values = [tuple(row.get(column) for column in columns) for row in rows]
+    result = execute_values(cursor, query, values, page_size=page_size, fetch=True)
+    return [row[0] for row in result]
+
+
+def _insert_copy(cursor: Any, table: str, columns: List[str], rows: List[Dict[str, Any]], returning: str) -> List[Any]:
+    """COPY rows into a temp staging table, then INSERT ... SELECT in input order"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([r"\N" if row.get(column) is None else row.get(column) for column in columns])
+    buffer.seek(0)
+    
+    staging = sql.Identifier(f"_seed_{table}_{uuid.uuid4().hex[:8]}")
+    column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+    cursor.execute(sql.SQL(
+        "CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA"
+    ).format(staging, column_list, sql.Identifier(table)))
+    cursor.execute(sql.SQL("ALTER TABLE {} ADD COLUMN _seed_ord BIGSERIAL").format(staging))
+    copy_query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL '\\N')").format(staging, column_list)
+    cursor.copy_expert(copy_query.as_string(cursor), buffer)
+    cursor.execute(sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {} ORDER BY _seed_ord RETURNING {}").format(
+        sql.Identifier(table), column_list, column_list, staging, sql.Identifier(returning)
+    ))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _insert_sqlite(cursor: Any, table: str, columns: List[str], rows: List[Dict[str, Any]], returning: str) -> List[Any]:
+    """INSERT row by row (cheap in-process) and collect the returning column in input order.
+
+    SQLite does not guarantee the order of RETURNING rows of a multi-row INSERT,
+    so each row reads back its own value: through RETURNING where supported,
+    otherwise by selecting the inserted rowids back.
+    """
+    query = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote_identifier(table), ", ".join(map(quote_identifier, columns)), ", ".join("?" * len(columns))
+    )
+    values = [tuple(row.get(column) for column in columns) for row in rows]
+    if SUPPORTS_RETURNING:
+        query += f" RETURNING {quote_identifier(returning)}"
+        ids = []
+        for params in values:
+            cursor.execute(query, params)
+            ids.append(cursor.fetchone()[0])
+        return ids
+
+    rowids = []
+    for params in values:
+        cursor.execute(query, params)
+        rowids.append(cursor.lastrowid)
+    by_rowid: Dict[int, Any] = {}
+    # Stay below SQLite's default limit of 999 bound parameters
+    for start in range(0, len(rowids), 900):
+        chunk = rowids[start:start + 900]
+        cursor.execute(
+            "SELECT rowid, {} FROM {} WHERE rowid IN ({})".format(
+                quote_identifier(returning), quote_identifier(table), ", ".join("?" * len(chunk))
+            ),
+            chunk
+        )
+        by_rowid.update((rowid, value) for rowid, value in cursor.fetchall())
+    return [by_rowid[rowid] for rowid in rowids]
+
+
+def bulk_insert(
+    table: str,
+    rows: List[Dict[str, Any]],
+    columns: Optional[List[str]] = None,
+    env: str = "dev",
+    method: str = "values",
+    returning: str = "id",
+    page_size: int = 1000
+) -> List[Any]:
+    """Insert many rows in one transaction and return generated ids in input order.
+    
+    method="values" batches multi-row INSERTs with execute_values; method="copy"
+    streams the rows with COPY FROM STDIN, which is faster for large data sets.
+    On SQLite both methods insert row by row and read the generated values back.
+    """
+    if method not in ("values", "copy"):
+        raise ValueError(f"Unsupported bulk insert method: {method}")
+    if not rows:
+        return []
+    columns = columns or list(rows[0].keys())
+    
+    with _connection_scope(env) as (conn, joined):
+        cursor = conn.cursor()
+        if connection_dialect(conn) == "sqlite":
+            ids = _insert_sqlite(cursor, table, columns, rows, returning)
+        elif method == "values":
+            ids = _insert_values(cursor, table, columns, rows, returning, page_size)
+        else:
+            ids = _insert_copy(cursor, table, columns, rows, returning)
+        if not joined:
+            conn.commit()
+        return ids
+
+
+def bulk_delete(table: str, ids: List[Any], env: str = "dev", key: str = "id") -> int:
+    """Delete rows by id in a single statement and return the number deleted"""
+    if not ids:
+        return 0
+    with _connection_scope(env) as (conn, joined):
+        cursor = conn.cursor()
+        if connection_dialect(conn) == "sqlite":
+            query = "DELETE FROM {} WHERE {} IN ({})".format(
+                quote_identifier(table), quote_identifier(key), ", ".join("?" * len(ids))
+            )
+            cursor.execute(query, list(ids))
+        else:
+            query = sql.SQL("DELETE FROM {} WHERE {} = ANY(%s)").format(sql.Identifier(table), sql.Identifier(key))
+            cursor.execute(query, (list(ids),))
+        if not joined:
+            conn.commit()
+        return cursor.rowcount
+
+
+def get_seed_table(data_type: str) -> Dict[str, Any]:
+    """Get the target table and columns for a seedable test data set"""
+    seed_table = load_db_test_data().get("seed_tables", {}).get(data_type)
+    if not seed_table:
+        raise ValueError(f"No seed table configured for test data '{data_type}'")
+    return seed_table
+
+
+def seed_test_data(data_type: str, env: str = "dev", method: str = "values",
+                   rows: Optional[List[Dict[str, Any]]] = None) -> List[Any]:
+    """Bulk insert a test_data.yaml data set (or rows shaped like it) and return the new ids"""
+    seed_table = get_seed_table(data_type)
+    if rows is None:
+        rows = get_test_data(data_type) or []
+    return bulk_insert(seed_table["table"], rows, columns=seed_table.get("columns"), env=env, method=method)
+
+
+def cleanup_seeded_data(data_type: str, ids: List[Any], env: str = "dev") -> int:
+    """Delete rows created by seed_test_data"""
+    return bulk_delete(get_seed_table(data_type)["table"], ids, env=env)
+
+
 def verify_expected_count(table: str, expected_min: Optional[int] = None, 
                          expected_max: Optional[int] = None, env: str = "dev") -> bool:
     """Verify that table row count is within expected range"""
@@ -174,7 +653,9 @@ def verify_expected_count(table: str, expected_min: Optional[int] = None,
 
 def close_all_pools():
     """Close all connection pools (useful for cleanup)"""
-    for pool_key, connection_pool in _connection_pools.items():
-        connection_pool.closeall()
-    _connection_pools.clear()
+    with _pools_lock:
+        for pool_key, connection_pool in _connection_pools.items():
+            connection_pool.closeall()
+        _connection_pools.clear()
+    close_sqlite_databases()
 
@@ -0,0 +1,198 @@
+"""Thread-safe database connection pool with overflow, health checks and metrics.
+
+Keeps up to pool_size connections open and allows max_overflow extra ones
+under load; those are closed again when returned. When both are in use,
+getconn blocks until a connection is returned or the timeout expires.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from psycopg2.pool import PoolError
+
+
+def ping_connection(conn: Any):
+    """Run a trivial query to make sure the server still answers"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    finally:
+        cursor.close()
+    conn.rollback()
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30.0,
+        pre_ping: bool = True,
+        recycle: Optional[float] = None,
+        ping: Callable[[Any], None] = ping_connection
+    ):
+        self._connect = connect
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self.recycle = recycle
+        self._ping = ping
+
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._created_at: Dict[int, float] = {}
+        self._in_use: Dict[int, float] = {}
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._metrics = {
+            "checkouts": 0,
+            "connections_created": 0,
+            "overflow_created": 0,
+            "recycled": 0,
+            "invalidated": 0,
+            "timeouts": 0,
+            "in_use_high_water": 0,
+            "wait_time_total_ms": 0.0,
+            "wait_time_max_ms": 0.0,
+        }
+
+    def getconn(self, timeout: Optional[float] = None) -> Any:
+        """Check out a healthy connection, waiting up to timeout seconds if exhausted"""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+
+        while True:
+            conn = None
+            with self._cond:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+                while not self._idle and self._size >= self.pool_size + self.max_overflow:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise PoolError(
+                            f"Timed out after {timeout}s waiting for a connection "
+                            f"(pool_size={self.pool_size}, max_overflow={self.max_overflow})"
+                        )
+                    self._cond.wait(remaining)
+                if self._idle:
+                    # Most recently returned first, so idle extras can age out
+                    conn, created_at = self._idle.pop()
+                else:
+                    self._size += 1
+
+            if conn is None:
+                conn = self._open()
+            elif not self._is_usable(conn, created_at):
+                self._discard(conn)
+                continue
+
+            with self._cond:
+                waited_ms = (time.monotonic() - start) * 1000
+                self._in_use[id(conn)] = time.monotonic()
+                self._metrics["checkouts"] += 1
+                self._metrics["wait_time_total_ms"] += waited_ms
+                self._metrics["wait_time_max_ms"] = max(self._metrics["wait_time_max_ms"], waited_ms)
+                self._metrics["in_use_high_water"] = max(self._metrics["in_use_high_water"], len(self._in_use))
+            return conn
+
+    def putconn(self, conn: Any, close: bool = False):
+        """Return a connection; overflow and broken connections are closed"""
+        with self._cond:
+            self._in_use.pop(id(conn), None)
+            keep = not (close or self._closed or conn.closed) and self._size <= self.pool_size
+
+        if keep:
+            try:
+                # Never hand out a connection with an open transaction
+                conn.rollback()
+            except Exception:
+                keep = False
+
+        if not keep:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, self._created_at.get(id(conn), time.monotonic())))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Check out a connection for the duration of a with block"""
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def closeall(self):
+        """Close idle connections now and checked-out ones when they are returned"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of checkout counters and current pool occupancy"""
+        with self._cond:
+            metrics = dict(self._metrics)
+            metrics.update(
+                size=self._size,
+                idle=len(self._idle),
+                in_use=len(self._in_use),
+                wait_time_avg_ms=metrics["wait_time_total_ms"] / metrics["checkouts"] if metrics["checkouts"] else 0.0
+            )
+        return metrics
+
+    def _open(self) -> Any:
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+            self._metrics["connections_created"] += 1
+            if self._size > self.pool_size:
+                self._metrics["overflow_created"] += 1
+        return conn
+
+    def _is_usable(self, conn: Any, created_at: float) -> bool:
+        if conn.closed:
+            self._count("invalidated")
+            return False
+        if self.recycle is not None and time.monotonic() - created_at > self.recycle:
+            self._count("recycled")
+            return False
+        if self.pre_ping:
+            try:
+                self._ping(conn)
+            except Exception:
+                self._count("invalidated")
+                return False
+        return True
+
+    def _discard(self, conn: Any):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+            self._size -= 1
+            self._cond.notify()
+
+    def _count(self, metric: str):
+        with self._cond:
+            self._metrics[metric] += 1
@@ -0,0 +1,249 @@
+"""Embedded SQLite backend for core.db_helper.
+
+SQLiteConnection wraps sqlite3 with the part of the psycopg2 connection
+interface that db_helper and ConnectionPool rely on: cursor(cursor_factory=...),
+commit/rollback/close and `closed`. Queries therefore run through the same
+execute_query / execute_insert / stream_query code paths. db_helper compiles
+queries.yaml statements for SQLite: it rewrites NOW(), :: casts and ILIKE,
+expands `IN :ids`, and emulates RETURNING on SQLite versions without it.
+
+":memory:" databases are opened as a shared-cache URI, so every pooled
+connection sees the same data. An anchor connection keeps the database alive
+between checkouts. When a database is created, schema.sql is applied and the
+seed_tables data sets from test_data.yaml are inserted in bulk.
+"""
+
+import collections
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from psycopg2.extras import NamedTupleCursor, RealDictCursor
+
+from core.config_loader import BASE_DIR, load_data_config
+
+SCHEMA_DIR = BASE_DIR / "config" / "data" / "db"
+DEFAULT_SCHEMA = "schema.sql"
+
+# RETURNING is available from SQLite 3.35
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Connections keeping shared in-memory databases alive, keyed by URI
+_anchors: Dict[str, sqlite3.Connection] = {}
+_initialized_files = set()
+_init_lock = threading.Lock()
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for SQL (shared by db_helper and db_assertions)"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _dict_row(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+_namedtuple_types: Dict[tuple, type] = {}
+
+
+def _namedtuple_row(cursor: sqlite3.Cursor, row: tuple) -> tuple:
+    fields = tuple(column[0] for column in cursor.description)
+    row_type = _namedtuple_types.get(fields)
+    if row_type is None:
+        row_type = _namedtuple_types[fields] = collections.namedtuple("Row", fields, rename=True)
+    return row_type(*row)
+
+
+# psycopg2 cursor classes accepted by cursor(cursor_factory=...) and the matching row factories
+_ROW_FACTORIES = {None: None, RealDictCursor: _dict_row, NamedTupleCursor: _namedtuple_row}
+
+
+class SQLiteCursor:
+    """sqlite3 cursor that buffers the (RETURNING) rows of data-changing statements"""
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+        self._buffered: Optional[List[Any]] = None
+        self.itersize = 2000
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    def execute(self, query: str, params: Any = None):
+        self._cursor.execute(query, params if params is not None else ())
+        # Drain DML results now so a commit cannot invalidate them
+        is_query = query.lstrip().upper().startswith(("SELECT", "WITH", "VALUES", "PRAGMA", "EXPLAIN"))
+        self._buffered = None if is_query else self._cursor.fetchall()
+        return self
+
+    def executemany(self, query: str, seq_of_params: Sequence[Any]):
+        self._buffered = None
+        self._cursor.executemany(query, seq_of_params)
+        return self
+
+    def set_rows(self, rows: List[Any]):
+        """Replace the result rows, e.g. with an emulated RETURNING row"""
+        self._buffered = list(rows)
+
+    def fetchone(self) -> Optional[Any]:
+        if self._buffered is not None:
+            return self._buffered.pop(0) if self._buffered else None
+        return self._cursor.fetchone()
+
+    def fetchall(self) -> List[Any]:
+        if self._buffered is not None:
+            rows, self._buffered = self._buffered, []
+            return rows
+        return self._cursor.fetchall()
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            rows = self._cursor.fetchmany(self.itersize) if self._buffered is None else self.fetchall()
+            if not rows:
+                return
+            yield from rows
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """sqlite3 connection exposing the psycopg2 methods db_helper and ConnectionPool use"""
+
+    dialect = "sqlite"
+
+    def __init__(self, raw: sqlite3.Connection):
+        self._raw = raw
+        self._cursors: "weakref.WeakSet[SQLiteCursor]" = weakref.WeakSet()
+        self.closed = 0
+
+    def cursor(self, cursor_factory: Any = None, name: Optional[str] = None) -> SQLiteCursor:
+        """name (server-side cursors) is ignored: sqlite3 cursors already step lazily"""
+        if cursor_factory not in _ROW_FACTORIES:
+            raise ValueError(f"Unsupported cursor factory for SQLite: {cursor_factory}")
+        raw_cursor = self._raw.cursor()
+        raw_cursor.row_factory = _ROW_FACTORIES[cursor_factory]
+        cursor = SQLiteCursor(raw_cursor)
+        self._cursors.add(cursor)
+        return cursor
+
+    def _finish_statements(self):
+        # Unfinished SELECTs hold shared-cache table locks that would block other connections
+        for cursor in list(self._cursors):
+            cursor.close()
+
+    def commit(self):
+        self._finish_statements()
+        self._raw.commit()
+
+    def rollback(self):
+        self._finish_statements()
+        self._raw.rollback()
+
+    def close(self):
+        if not self.closed:
+            self._finish_statements()
+            self._raw.close()
+            self.closed = 1
+
+
+def resolve_database(db_config: Dict[str, Any]) -> str:
+    """Database path or ":memory:" from `database` or a sqlite:/// connection_string"""
+    database = db_config.get("database")
+    if not database:
+        connection_string = db_config.get("connection_string", "")
+        if not connection_string.startswith("sqlite:///"):
+            raise ValueError("SQLite config needs `database` or a sqlite:/// connection_string")
+        database = connection_string[len("sqlite:///"):]
+    return database
+
+
+def _open(target: str, uri: bool, timeout: float) -> sqlite3.Connection:
+    raw = sqlite3.connect(target, uri=uri, timeout=timeout, check_same_thread=False)
+    raw.execute("PRAGMA foreign_keys = ON")
+    return raw
+
+
+def connect_sqlite(db_config: Dict[str, Any]) -> SQLiteConnection:
+    """Open a connection, creating and seeding the database on first use"""
+    database = resolve_database(db_config)
+    timeout = db_config.get("pool_timeout", 30)
+
+    if database == ":memory:":
+        uri = f"file:{db_config.get('memory_name', 'test_db')}?mode=memory&cache=shared"
+        with _init_lock:
+            if uri not in _anchors:
+                anchor = _open(uri, True, timeout)
+                initialize_database(anchor, db_config)
+                _anchors[uri] = anchor
+        return SQLiteConnection(_open(uri, True, timeout))
+
+    path = Path(database)
+    if not path.is_absolute():
+        path = BASE_DIR / path
+    with _init_lock:
+        if str(path) not in _initialized_files:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            raw = _open(str(path), False, timeout)
+            raw.execute("PRAGMA journal_mode=WAL")
+            initialize_database(raw, db_config)
+            raw.close()
+            _initialized_files.add(str(path))
+    return SQLiteConnection(_open(str(path), False, timeout))
+
+
+def initialize_database(raw: sqlite3.Connection, db_config: Dict[str, Any]) -> bool:
+    """Apply the schema file and bulk insert the seed data sets into an empty database.
+
+    Returns False (and changes nothing) when the database already has tables,
+    e.g. a file from an earlier run or a memory database still held open.
+    """
+    if raw.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]:
+        return False
+    schema = db_config.get("schema", DEFAULT_SCHEMA)
+    if schema:
+        raw.executescript((SCHEMA_DIR / schema).read_text())
+    if db_config.get("seed", True):
+        seed_database(raw)
+    raw.commit()
+    return True
+
+
+def seed_database(raw: sqlite3.Connection) -> Dict[str, int]:
+    """Insert every seed_tables data set from test_data.yaml with one executemany each"""
+    test_data = load_data_config("db/test_data")
+    inserted = {}
+    for data_type, seed_table in test_data.get("seed_tables", {}).items():
+        rows = test_data.get(data_type) or []
+        if not rows:
+            continue
+        columns = seed_table.get("columns") or list(rows[0].keys())
+        query = "INSERT INTO {} ({}) VALUES ({})".format(
+            quote_identifier(seed_table["table"]),
+            ", ".join(map(quote_identifier, columns)),
+            ", ".join("?" * len(columns))
+        )
+        raw.executemany(query, [tuple(row.get(column) for column in columns) for row in rows])
+        inserted[data_type] = len(rows)
+    return inserted
+
+
+def close_sqlite_databases():
+    """Close anchor connections; in-memory databases are dropped (once no connection
+    is left open) and re-seeded on next use"""
+    with _init_lock:
+        for anchor in _anchors.values():
+            anchor.close()
+        _anchors.clear()
+        _initialized_files.clear()
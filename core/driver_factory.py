@@ -1,20 +1,74 @@
+from typing import Any, Dict
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 
+from core.config_loader import load_profile_config
+from core.http_driver import HttpDriver
+
+# Run config keys that override the selected performance profile
+PROFILE_KEYS = (
+    "page_load_strategy",
+    "window_size",
+    "disable_images",
+    "disable_extensions",
+    "blocked_urls",
+    "chrome_args",
+)
+
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+
+def resolve_performance_profile(run_config: dict) -> Dict[str, Any]:
+    """Merge the run config's performance_profile with keys set directly in the run config"""
+    profile_name = run_config.get("performance_profile")
+    profile = load_profile_config(profile_name) if profile_name else {}
+    profile.update({key: run_config[key] for key in PROFILE_KEYS if key in run_config})
+
+    strategy = profile.get("page_load_strategy", "normal")
+    if strategy not in PAGE_LOAD_STRATEGIES:
+        raise ValueError(f"Unsupported page_load_strategy: {strategy}")
+    return profile
+
+
+def build_chrome_options(run_config: dict, profile: Dict[str, Any]) -> ChromeOptions:
+    options = ChromeOptions()
+    if run_config.get("headless", False):
+        options.add_argument("--headless=new")
+
+    options.page_load_strategy = profile.get("page_load_strategy", "normal")
+    if profile.get("window_size"):
+        width, height = profile["window_size"]
+        options.add_argument(f"--window-size={width},{height}")
+    if profile.get("disable_extensions"):
+        options.add_argument("--disable-extensions")
+    if profile.get("disable_images"):
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    for arg in profile.get("chrome_args", []):
+        options.add_argument(arg)
+    return options
+
+
+def create_driver(run_config: dict, env: str = "dev"):
+    if run_config.get("backend", "browser") == "http":
+        return HttpDriver(run_config, env=env)
 
-def create_driver(run_config: dict):
     browser = run_config.get("browser", "chrome").lower()
+    profile = resolve_performance_profile(run_config)
 
     if browser == "chrome":
-        options = ChromeOptions()
-        if run_config.get("headless", False):
-            options.add_argument("--headless=new")
+        options = build_chrome_options(run_config, profile)
         driver = webdriver.Chrome(options=options)
+        if profile.get("blocked_urls"):
+            # Requests matching these patterns fail immediately instead of downloading
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile["blocked_urls"]})
     else:
         raise ValueError(f"Unsupported browser: {browser}")
 
     implicit_wait = run_config.get("implicit_wait", 0)
     driver.implicitly_wait(implicit_wait)
-    driver.maximize_window()
+    # A fixed window size is cheaper and more reproducible than maximizing
+    if not profile.get("window_size"):
+        driver.maximize_window()
     return driver
-
@@ -0,0 +1,180 @@
+"""Pool of warm WebDriver instances reused across tests.
+
+Instead of launching and quitting a browser per test, drivers are reset
+(cookies, storage, extra windows, about:blank) and handed to the next test.
+A driver is recycled after max_uses tests, or as soon as it stops
+responding. Each pytest-xdist worker process keeps its own pool.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.driver_factory import create_driver
+
+
+CLEAR_STORAGE_SCRIPT = "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+
+
+def url_origin(url: str) -> Optional[str]:
+    """scheme://host[:port] of an http(s) URL, None for about:, data: and the like"""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def reset_driver(driver: WebDriver, origins: Iterable[str] = (), clear_cache: bool = False):
+    """Bring a browser back to a clean state without restarting it.
+
+    origins are the sites tests use (e.g. base_url and the API origin); their
+    storage is cleared along with the origin of the page the test ended on.
+    The HTTP cache is kept warm for the next test unless clear_cache is set.
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    to_clear: List[str] = []
+    for url in [*origins, driver.current_url]:
+        origin = url_origin(url)
+        if origin and origin not in to_clear:
+            to_clear.append(origin)
+    try:
+        # Chrome: cookies are cleared browser-wide, but storage only per origin
+        # (clearDataForOrigin rejects wildcards)
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        if clear_cache:
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        for origin in to_clear:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    except Exception:
+        driver.delete_all_cookies()
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+    driver.get("about:blank")
+
+
+def apply_worker_count(option: Any, workers: int):
+    """Set pytest-xdist's -n on parsed options after xdist has already read them.
+
+    xdist turns numprocesses into `tx` (one popen gateway per worker) in its own
+    tryfirst pytest_cmdline_main, so setting numprocesses later is not enough.
+    """
+    if getattr(option, "maxprocesses", None):
+        workers = min(workers, option.maxprocesses)
+    option.numprocesses = workers
+    option.tx = ["popen"] * workers
+    if option.dist == "no":
+        option.dist = "load"
+
+
+def is_driver_alive(driver: WebDriver) -> bool:
+    """Check that the browser session still responds"""
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+class DriverPool:
+    def __init__(
+        self,
+        run_config: dict,
+        size: Optional[int] = None,
+        max_uses: Optional[int] = None,
+        factory: Callable[[dict], WebDriver] = create_driver,
+        origins: Iterable[str] = ()
+    ):
+        pool_config = run_config.get("driver_pool") or {}
+        self.run_config = run_config
+        self.size = size or pool_config.get("size", 1)
+        self.max_uses = max_uses or pool_config.get("max_uses", 50)
+        self._factory = factory
+        self.origins = list(origins)
+        self.clear_cache = pool_config.get("clear_cache", False)
+        self._idle: Deque[WebDriver] = deque()
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._metrics = {"launched": 0, "reused": 0, "recycled": 0, "crashed": 0}
+
+    def warm_up(self):
+        """Launch browsers in parallel until size drivers are idle"""
+        with self._lock:
+            missing = self.size - len(self._idle)
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            drivers = list(executor.map(lambda _: self._launch(), range(missing)))
+        with self._lock:
+            self._idle.extend(drivers)
+
+    def acquire(self) -> WebDriver:
+        """Get a ready-to-use driver, reusing an idle one when possible"""
+        while True:
+            with self._lock:
+                driver = self._idle.popleft() if self._idle else None
+            if driver is None:
+                return self._launch()
+            if is_driver_alive(driver):
+                self._count("reused")
+                return driver
+            self._count("crashed")
+            self._discard(driver)
+
+    def release(self, driver: WebDriver):
+        """Reset and keep a driver, or quit it when worn out, broken or surplus"""
+        with self._lock:
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            worn_out = self._uses[id(driver)] >= self.max_uses
+            full = len(self._idle) >= self.size
+
+        if worn_out or full:
+            self._count("recycled")
+            self._discard(driver)
+            return
+        try:
+            reset_driver(driver, self.origins, self.clear_cache)
+        except Exception:
+            self._count("crashed")
+            self._discard(driver)
+            return
+        with self._lock:
+            self._idle.append(driver)
+
+    def close(self):
+        """Quit all idle drivers"""
+        with self._lock:
+            drivers = list(self._idle)
+            self._idle.clear()
+        for driver in drivers:
+            self._discard(driver)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._metrics, "idle": len(self._idle)}
+
+    def _launch(self) -> WebDriver:
+        driver = self._factory(self.run_config)
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self._metrics["launched"] += 1
+        return driver
+
+    def _discard(self, driver: WebDriver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _count(self, metric: str):
+        with self._lock:
+            self._metrics[metric] += 1
@@ -0,0 +1,216 @@
+"""Run the suite against several environments at once and compare the results.
+
+`pytest --env dev,stage ...` starts one pytest process per environment, all
+running concurrently with the original arguments and a single --env. Each
+process has its own env config, API sessions, DB pools and caches. It writes
+its own reports:
+
+    reports/api_latency.{env}.json    per-endpoint latency (--latency-report)
+    reports/results.{env}.xml         JUnit XML test results
+    reports/fanout.{env}.log          console output
+
+When all of them finish, the reports are merged into
+reports/env_comparison.json. A side-by-side table of test outcomes and
+endpoint latencies is also printed.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Set in child processes so they do not fan out again
+FANOUT_ENV_VAR = "PYTEST_ENV_FANOUT"
+
+# Options rewritten per environment; the value is whether they take an argument
+_PER_ENV_OPTIONS = {"--env": True, "--latency-report": True, "--junitxml": True, "--junit-xml": True}
+
+_OUTCOME_ORDER = ("passed", "failed", "error", "skipped")
+
+
+def parse_env_option(value: str) -> List[str]:
+    """Split a --env value such as "dev,stage" into unique environment names"""
+    envs = []
+    for name in value.split(","):
+        name = name.strip()
+        if name and name not in envs:
+            envs.append(name)
+    if not envs:
+        raise ValueError(f"No environment in --env {value!r}")
+    return envs
+
+
+def report_paths(report_dir: Path, env: str) -> Dict[str, Path]:
+    return {
+        "latency": report_dir / f"api_latency.{env}.json",
+        "results": report_dir / f"results.{env}.xml",
+        "log": report_dir / f"fanout.{env}.log",
+    }
+
+
+def clear_env_reports(report_dir: Path, env: str):
+    """Delete an environment's reports from earlier runs, so a run that writes
+    none (crash, no API calls) is not merged with stale data"""
+    paths = report_paths(report_dir, env)
+    for path in (paths["latency"], paths["results"]):
+        path.unlink(missing_ok=True)
+
+
+def strip_per_env_options(args: Sequence[str]) -> List[str]:
+    """Remove options that each environment run sets for itself"""
+    stripped = []
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+            continue
+        name = arg.split("=", 1)[0]
+        if name in _PER_ENV_OPTIONS:
+            skip_next = _PER_ENV_OPTIONS[name] and "=" not in arg
+            continue
+        stripped.append(arg)
+    return stripped
+
+
+def child_command(args: Sequence[str], env: str, report_dir: Path) -> List[str]:
+    """pytest command line of one environment run"""
+    paths = report_paths(report_dir, env)
+    return [
+        sys.executable, "-m", "pytest", *strip_per_env_options(args),
+        "--env", env,
+        "--latency-report", str(paths["latency"]),
+        "--junitxml", str(paths["results"]),
+    ]
+
+
+def run_fanout(envs: Sequence[str], args: Sequence[str], report_dir: Path, cwd: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    """Run one pytest process per environment concurrently; return exit codes and durations"""
+    report_dir.mkdir(parents=True, exist_ok=True)
+    child_environ = {**os.environ, FANOUT_ENV_VAR: "1"}
+    running = {}
+    for env in envs:
+        clear_env_reports(report_dir, env)
+        log = open(report_paths(report_dir, env)["log"], "w")
+        process = subprocess.Popen(
+            child_command(args, env, report_dir), cwd=cwd, env=child_environ,
+            stdout=log, stderr=subprocess.STDOUT
+        )
+        running[env] = (process, log, time.perf_counter())
+
+    runs = {}
+    for env, (process, log, start) in running.items():
+        returncode = process.wait()
+        log.close()
+        runs[env] = {"returncode": returncode, "duration_s": round(time.perf_counter() - start, 2)}
+    return runs
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Per-test outcome and duration from a JUnit XML report"""
+    if not path.exists():
+        return {}
+    results = {}
+    for case in ET.parse(path).getroot().iter("testcase"):
+        test_id = f"{case.get('classname')}::{case.get('name')}"
+        outcome = "passed"
+        for child in case:
+            if child.tag in ("failure", "error", "skipped"):
+                outcome = "failed" if child.tag == "failure" else child.tag
+                break
+        results[test_id] = {"outcome": outcome, "duration_s": float(case.get("time") or 0)}
+    return results
+
+
+def load_latency(path: Path) -> Dict[str, Dict[str, Any]]:
+    """total_ms latency per endpoint from a latency report.
+
+    xdist workers hand their timings to the controller, so each run writes a
+    single report with exact percentiles.
+    """
+    if not path.exists():
+        return {}
+    latency = {}
+    for endpoint, stats in json.loads(path.read_text()).get("endpoints", {}).items():
+        total = stats.get("total_ms", {})
+        if total.get("count"):
+            latency[endpoint] = {key: total[key] for key in ("count", "p50", "p95", "max")}
+    return latency
+
+
+def merge_reports(envs: Sequence[str], report_dir: Path, runs: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Combine per-environment results and latency reports into one comparison"""
+    summary: Dict[str, Dict[str, Any]] = {}
+    tests: Dict[str, Dict[str, Any]] = {}
+    endpoints: Dict[str, Dict[str, Any]] = {}
+    for env in envs:
+        paths = report_paths(report_dir, env)
+        counts = dict.fromkeys(_OUTCOME_ORDER, 0)
+        for test_id, result in load_results(paths["results"]).items():
+            counts[result["outcome"]] += 1
+            tests.setdefault(test_id, {})[env] = result
+        summary[env] = {**counts, **(runs or {}).get(env, {})}
+        for endpoint, latency in load_latency(paths["latency"]).items():
+            endpoints.setdefault(endpoint, {})[env] = latency
+
+    differing = sorted(
+        test_id for test_id, by_env in tests.items()
+        if len({by_env.get(env, {}).get("outcome", "missing") for env in envs}) > 1
+    )
+    return {
+        "envs": list(envs),
+        "summary": summary,
+        "differing_tests": differing,
+        "tests": {test_id: tests[test_id] for test_id in sorted(tests)},
+        "endpoints": {endpoint: endpoints[endpoint] for endpoint in sorted(endpoints)},
+    }
+
+
+def format_comparison(comparison: Dict[str, Any]) -> List[str]:
+    """Side-by-side text table of a merged comparison"""
+    envs = comparison["envs"]
+    lines = []
+    for env in envs:
+        env_summary = comparison["summary"][env]
+        counts = ", ".join(f"{outcome}: {env_summary[outcome]}" for outcome in _OUTCOME_ORDER)
+        extra = f", exit code {env_summary['returncode']}" if "returncode" in env_summary else ""
+        lines.append(f"{env}: {counts}{extra}")
+
+    if comparison["differing_tests"]:
+        lines.append("outcomes that differ: " + " | ".join(envs))
+        for test_id in comparison["differing_tests"]:
+            by_env = comparison["tests"][test_id]
+            outcomes = " | ".join(by_env.get(env, {}).get("outcome", "-") for env in envs)
+            lines.append(f"  {test_id}: {outcomes}")
+
+    if comparison["endpoints"]:
+        lines.append("api latency p50/p95 ms: " + " | ".join(envs))
+        for endpoint, by_env in comparison["endpoints"].items():
+            cells = [
+                f"{by_env[env]['p50']:.1f}/{by_env[env]['p95']:.1f}" if env in by_env else "-"
+                for env in envs
+            ]
+            lines.append(f"  {endpoint}: " + " | ".join(cells))
+    return lines
+
+
+def fanout_exit_code(runs: Dict[str, Dict[str, Any]]) -> int:
+    """0 when every environment passed, otherwise the first failing exit code"""
+    for run in runs.values():
+        if run["returncode"]:
+            return run["returncode"]
+    return 0
+
+
+def run_environments(envs: Sequence[str], args: Sequence[str], report_dir: Path, cwd: Optional[Path] = None) -> int:
+    """Fan out, write env_comparison.json and print the comparison; return the exit code"""
+    print(f"Running against {', '.join(envs)} concurrently; output in {report_dir}/fanout.{{env}}.log")
+    runs = run_fanout(envs, args, report_dir, cwd)
+    comparison = merge_reports(envs, report_dir, runs)
+    (report_dir / "env_comparison.json").write_text(json.dumps(comparison, indent=2))
+    print("\n".join(format_comparison(comparison)))
+    print(f"Comparison written to {report_dir / 'env_comparison.json'}")
+    return fanout_exit_code(runs)
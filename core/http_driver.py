@@ -0,0 +1,418 @@
+"""WebDriver stand-in that drives pages over plain HTTP, without a browser.
+
+HttpDriver implements the part of the WebDriver API that page objects use:
+get, find_element(s) with an XPath/CSS subset, send_keys, click to submit
+forms, and cookies. Pages are parsed with html.parser. Nothing runs
+JavaScript, so single-page-app forms are declared in
+config/data/http_forms.yaml. Opening such a form's path renders the declared
+fields, and submitting posts them as JSON to the API endpoint behind the form.
+
+Select it with `backend: http` in a run config (see config/run/http_fast.yaml).
+"""
+
+import html
+import re
+from html.parser import HTMLParser
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from core.config_loader import load_data_config
+from core.api_helper import get_full_url, get_headers, make_api_request
+from core.locators import CSS_TRANSLATIONS
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+class HttpElement:
+    """Parsed HTML element with the WebElement methods page objects use"""
+
+    def __init__(self, driver: "HttpDriver", tag_name: str, attrs: Dict[str, str], parent: Optional["HttpElement"]):
+        self._driver = driver
+        self.tag_name = tag_name
+        self.attrs = attrs
+        self.parent = parent
+        self.children: List[Any] = []
+
+    @property
+    def text(self) -> str:
+        parts = []
+        for child in self.children:
+            parts.append(child.text if isinstance(child, HttpElement) else child)
+        return " ".join(" ".join(parts).split())
+
+    def iter(self):
+        """Yield this element's descendants in document order"""
+        for child in self.children:
+            if isinstance(child, HttpElement):
+                yield child
+                yield from child.iter()
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.attrs.get(name)
+
+    def is_displayed(self) -> bool:
+        return self.attrs.get("type") != "hidden" and "hidden" not in self.attrs
+
+    def is_enabled(self) -> bool:
+        return "disabled" not in self.attrs
+
+    def clear(self):
+        self.attrs["value"] = ""
+
+    def send_keys(self, *values: str):
+        self.attrs["value"] = self.attrs.get("value", "") + "".join(values)
+
+    def click(self):
+        if self.tag_name == "a" and self.attrs.get("href"):
+            self._driver.get(urljoin(self._driver.current_url, self.attrs["href"]))
+            return
+        is_submit = (
+            (self.tag_name == "button" and self.attrs.get("type", "submit") == "submit")
+            or (self.tag_name == "input" and self.attrs.get("type") == "submit")
+        )
+        form = self.form
+        if is_submit and form is not None:
+            self._driver.submit_form(form)
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> "HttpElement":
+        return _first_or_raise(self.find_elements(by, value), by, value)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List["HttpElement"]:
+        return [element for element in self.iter() if compile_locator(by, value)(element)]
+
+    @property
+    def form(self) -> Optional["HttpElement"]:
+        node = self.parent
+        while node is not None and node.tag_name != "form":
+            node = node.parent
+        return node
+
+
+class _DomBuilder(HTMLParser):
+    def __init__(self, driver: "HttpDriver"):
+        super().__init__(convert_charrefs=True)
+        self.root = HttpElement(driver, "#document", {}, None)
+        self._driver = driver
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        element = HttpElement(self._driver, tag, {name: value or "" for name, value in attrs}, self._stack[-1])
+        self._stack[-1].children.append(element)
+        if tag not in VOID_TAGS:
+            self._stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._stack.pop()
+
+    def handle_endtag(self, tag):
+        # Tolerate unclosed tags by unwinding to the matching open one
+        for depth in range(len(self._stack) - 1, 0, -1):
+            if self._stack[depth].tag_name == tag:
+                del self._stack[depth:]
+                return
+
+    def handle_data(self, data):
+        if data.strip() and self._stack[-1].tag_name not in ("script", "style"):
+            self._stack[-1].children.append(data)
+
+
+def parse_html(driver: "HttpDriver", source: str) -> HttpElement:
+    builder = _DomBuilder(driver)
+    builder.feed(source)
+    builder.close()
+    return builder.root
+
+
+# Selector compilation: each locator becomes a predicate over HttpElement
+
+_QUOTED = r"'([^']*)'|\"([^\"]*)\""
+_XPATH_STEP = re.compile(r"^//([\w-]+|\*)(?:\[(.+)\])?$")
+_XPATH_TERMS = [
+    (re.compile(r"^@([\w-]+)\s*=\s*(?:" + _QUOTED + r")$"), lambda m, v: lambda e: e.attrs.get(m.group(1)) == v),
+    (re.compile(r"^@([\w-]+)$"), lambda m, v: lambda e: m.group(1) in e.attrs),
+    (re.compile(r"^(?:text\(\)|\.)\s*=\s*(?:" + _QUOTED + r")$"), lambda m, v: lambda e: e.text == v),
+    (re.compile(r"^contains\(\s*(?:text\(\)|\.)\s*,\s*(?:" + _QUOTED + r")\s*\)$"), lambda m, v: lambda e: v in e.text),
+    (re.compile(r"^contains\(\s*@([\w-]+)\s*,\s*(?:" + _QUOTED + r")\s*\)$"),
+     lambda m, v: lambda e: v in e.attrs.get(m.group(1), "")),
+]
+_CSS_COMPOUND = re.compile(r"([\w-]+|\*)?((?:[#.][\w-]+|\[[^\]]+\])*)$")
+_CSS_PART = re.compile(r"([#.])([\w-]+)|\[\s*([\w-]+)\s*(?:([*^$]?=)\s*(?:" + _QUOTED + r"|([^\]\s]+))\s*)?\]")
+_CSS_OPERATORS = {
+    "=": lambda actual, expected: actual == expected,
+    "*=": lambda actual, expected: expected in actual,
+    "^=": lambda actual, expected: actual.startswith(expected),
+    "$=": lambda actual, expected: actual.endswith(expected),
+}
+
+
+def _split_outside_quotes(text: str, separator: str) -> List[str]:
+    """Split on a separator that is not inside quotes or parentheses"""
+    parts, current, quote, depth, i = [], "", None, 0, 0
+    while i < len(text):
+        char = text[i]
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif depth == 0 and text.startswith(separator, i):
+            parts.append(current)
+            current, i = "", i + len(separator)
+            continue
+        current += char
+        i += 1
+    parts.append(current)
+    return [part.strip() for part in parts]
+
+
+def _compile_xpath_term(term: str) -> Callable[[HttpElement], bool]:
+    for pattern, build in _XPATH_TERMS:
+        match = pattern.match(term)
+        if match:
+            quoted = [group for group in match.groups()[-2:] if group is not None]
+            return build(match, quoted[0] if quoted else None)
+    raise ValueError(f"Unsupported XPath predicate for the http driver: {term}")
+
+
+def compile_xpath(xpath: str) -> Callable[[HttpElement], bool]:
+    """Compile //tag[predicate or/and predicate] into an element predicate"""
+    match = _XPATH_STEP.match(xpath.strip())
+    if not match:
+        raise ValueError(f"Unsupported XPath for the http driver: {xpath}")
+    tag, predicate = match.groups()
+    alternatives = [
+        [_compile_xpath_term(term) for term in _split_outside_quotes(alternative, " and ")]
+        for alternative in (_split_outside_quotes(predicate, " or ") if predicate else [])
+    ]
+
+    def matches(element: HttpElement) -> bool:
+        if tag != "*" and element.tag_name != tag:
+            return False
+        return not alternatives or any(all(term(element) for term in terms) for terms in alternatives)
+    return matches
+
+
+def _compile_css_compound(compound: str) -> Callable[[HttpElement], bool]:
+    match = _CSS_COMPOUND.match(compound)
+    if not match or not compound:
+        raise ValueError(f"Unsupported CSS selector for the http driver: {compound}")
+    tag, rest = match.groups()
+    checks = []
+    for part in _CSS_PART.finditer(rest):
+        prefix, name, attr, operator, single, double, bare = part.groups()
+        if prefix == "#":
+            checks.append(lambda e, v=name: e.attrs.get("id") == v)
+        elif prefix == ".":
+            checks.append(lambda e, v=name: v in e.attrs.get("class", "").split())
+        elif operator is None:
+            checks.append(lambda e, a=attr: a in e.attrs)
+        else:
+            expected = next(value for value in (single, double, bare) if value is not None)
+            checks.append(lambda e, a=attr, o=_CSS_OPERATORS[operator], v=expected: a in e.attrs and o(e.attrs[a], v))
+
+    def matches(element: HttpElement) -> bool:
+        if tag and tag != "*" and element.tag_name != tag:
+            return False
+        return all(check(element) for check in checks)
+    return matches
+
+
+def compile_css(selector: str) -> Callable[[HttpElement], bool]:
+    """Compile a CSS selector list (compound selectors and descendant combinators)"""
+    alternatives = []
+    for alternative in _split_outside_quotes(selector, ","):
+        compounds = [compound for compound in _split_outside_quotes(alternative, " ") if compound]
+        chain = [_compile_css_compound(compound) for compound in compounds]
+        alternatives.append(chain)
+
+    def matches_chain(element: HttpElement, chain) -> bool:
+        if not chain[-1](element):
+            return False
+        remaining = chain[:-1]
+        node = element.parent
+        while remaining and node is not None:
+            if remaining[-1](node):
+                remaining = remaining[:-1]
+            node = node.parent
+        return not remaining
+
+    return lambda element: any(matches_chain(element, chain) for chain in alternatives)
+
+
+def compile_locator(by: str, value: str) -> Callable[[HttpElement], bool]:
+    if by == By.XPATH:
+        return compile_xpath(value)
+    if by == By.CSS_SELECTOR:
+        return compile_css(value)
+    if by in CSS_TRANSLATIONS:
+        return compile_css(CSS_TRANSLATIONS[by].format(value))
+    raise ValueError(f"Unsupported locator strategy for the http driver: {by}")
+
+
+def _first_or_raise(elements: List[HttpElement], by: str, value: str) -> HttpElement:
+    if not elements:
+        raise NoSuchElementException(f"No element matches {by}={value!r}")
+    return elements[0]
+
+
+def render_form_overlay(form_name: str, form: Dict[str, Any]) -> str:
+    """Render a declared form as static HTML"""
+    inputs = "".join(
+        "<input {}>".format(" ".join(f'{key}="{html.escape(str(value))}"' for key, value in field.items()))
+        for field in form.get("fields", [])
+    )
+    submit_text = html.escape(form.get("submit_text", "Submit"))
+    return (
+        f'<html><body><form data-overlay="{html.escape(form_name)}" method="post">'
+        f'{inputs}<button type="submit">{submit_text}</button></form></body></html>'
+    )
+
+
+def _normalize_path(url: str) -> str:
+    return re.sub(r"/{2,}", "/", urlsplit(url).path) or "/"
+
+
+class HttpDriver:
+    """Browserless driver backend for page objects (run config `backend: http`)"""
+
+    # Page objects skip polling and browser-only features for static drivers
+    is_static = True
+
+    def __init__(self, run_config: Optional[dict] = None, env: str = "dev"):
+        self.run_config = run_config or {}
+        self.env = env
+        self.session = requests.Session()
+        self.timeout = self.run_config.get("http_timeout", 30)
+        self._forms = load_data_config("http_forms") or {}
+        self._load("about:blank", "<html><body></body></html>")
+
+    @property
+    def page_source(self) -> str:
+        return self._source
+
+    @property
+    def title(self) -> str:
+        titles = self._document.find_elements(By.TAG_NAME, "title")
+        return titles[0].text if titles else ""
+
+    def _load(self, url: str, source: str):
+        self.current_url = url
+        self._source = source
+        self._document = parse_html(self, source)
+
+    def _overlay_for(self, url: str) -> Optional[str]:
+        path = _normalize_path(url)
+        for form_name, form in self._forms.items():
+            if form.get("path") == path:
+                return form_name
+        return None
+
+    def get(self, url: str):
+        """Open a URL: declared form overlays are rendered locally, anything else is fetched"""
+        if url == "about:blank":
+            self._load(url, "<html><body></body></html>")
+            return
+        form_name = self._overlay_for(url)
+        if form_name is not None:
+            self._load(url, render_form_overlay(form_name, self._forms[form_name]))
+            return
+        response = self.session.get(url, timeout=self.timeout)
+        self._load(response.url, response.text)
+
+    def submit_form(self, form: HttpElement):
+        """Submit a form with the current values of its named fields"""
+        fields = {
+            element.attrs["name"]: element.attrs.get("value", "")
+            for element in form.iter()
+            if element.tag_name in ("input", "textarea", "select") and element.attrs.get("name")
+            and element.attrs.get("type") not in ("submit", "button")
+        }
+        overlay = form.attrs.get("data-overlay")
+        if overlay:
+            self._submit_overlay(form, overlay, fields)
+            return
+        method = form.attrs.get("method", "get").upper()
+        action = urljoin(self.current_url, form.attrs.get("action", ""))
+        if method == "POST":
+            response = self.session.post(action, data=fields, timeout=self.timeout)
+        else:
+            response = self.session.get(action, params=fields, timeout=self.timeout)
+        self._load(response.url, response.text)
+
+    def _submit_overlay(self, form: HttpElement, form_name: str, fields: Dict[str, str]):
+        config = self._forms[form_name]
+        endpoint = config["endpoint"]
+        url = get_full_url(self.env, endpoint["group"], endpoint["name"])
+        response = make_api_request(
+            "POST", url, headers=get_headers(env=self.env), payload=fields,
+            timeout=self.timeout, env=self.env, session=self.session, record=False
+        )
+        if response.ok:
+            parts = urlsplit(self.current_url)
+            self._load(f"{parts.scheme}://{parts.netloc}{config.get('success_path', '/')}", "<html><body></body></html>")
+            return
+
+        # Stay on the form and show the API's error like the app would
+        try:
+            message = response.json().get(config.get("error_field", "message"), "")
+        except ValueError:
+            message = ""
+        alert = HttpElement(self, "div", {"role": "alert"}, form.parent)
+        alert.children.append(str(message or f"Request failed with status {response.status_code}"))
+        form.parent.children.append(alert)
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> HttpElement:
+        return self._document.find_element(by, value)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[HttpElement]:
+        return self._document.find_elements(by, value)
+
+    def find_first_candidate(self, candidates: Sequence[List[str]], preferred: Dict[str, int], clickable: bool):
+        """Static counterpart of BasePage's FIND_FIRST_SCRIPT"""
+        path = _normalize_path(self.current_url)
+        order = list(range(len(candidates)))
+        hint = preferred.get(path)
+        if isinstance(hint, int) and 0 <= hint < len(candidates):
+            order.remove(hint)
+            order.insert(0, hint)
+        for index in order:
+            kind, selector = candidates[index]
+            matches = compile_xpath(selector) if kind == "xpath" else compile_css(selector)
+            for element in self._document.iter():
+                if matches(element) and (not clickable or (element.is_displayed() and element.is_enabled())):
+                    return [index, element, path]
+        return None
+
+    def get_cookies(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": cookie.name, "value": cookie.value, "path": cookie.path, "domain": cookie.domain}
+            for cookie in self.session.cookies
+        ]
+
+    def add_cookie(self, cookie: Dict[str, Any]):
+        domain = cookie.get("domain") or urlsplit(self.current_url).hostname
+        self.session.cookies.set(cookie["name"], cookie["value"], domain=domain, path=cookie.get("path", "/"))
+
+    def delete_all_cookies(self):
+        self.session.cookies.clear()
+
+    def execute_script(self, script: str, *args):
+        # No JavaScript engine; storage and timing scripts are no-ops
+        return None
+
+    def implicitly_wait(self, seconds: float):
+        pass
+
+    def maximize_window(self):
+        pass
+
+    def quit(self):
+        self.session.close()
@@ -0,0 +1,184 @@
+"""Connection phase timings (DNS, TCP connect, TLS) for requests sessions.
+
+TimingHTTPAdapter swaps in urllib3 connection classes that time each phase
+of opening a connection. Timings are written to a per-thread dict started
+with start_timing(), so concurrent requests on worker threads do not mix.
+Reused keep-alive connections report zero for all three phases. The
+connection pools also count checkouts, and how many of them reused an open
+socket, for get_session_stats.
+
+Opening the socket mirrors urllib3 2.x internals (HTTPConnection._new_conn and
+private helpers of urllib3.util.connection). If those helpers cannot be
+imported, the stock connection classes are used and no phase timings are
+recorded (TIMING_SUPPORTED is False).
+"""
+
+import socket
+import sys
+import threading
+import time
+from socket import timeout as SocketTimeout
+from typing import Dict, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, LocationParseError, NameResolutionError, NewConnectionError
+
+try:
+    from urllib3.util.connection import _set_socket_options, allowed_gai_family
+    from urllib3.util.timeout import _DEFAULT_TIMEOUT
+    TIMING_SUPPORTED = True
+except ImportError:
+    _DEFAULT_TIMEOUT = None
+    TIMING_SUPPORTED = False
+
+
+_local = threading.local()
+
+
+def start_timing() -> Dict[str, float]:
+    """Start collecting connection timings for requests made on this thread.
+
+    The dict stays empty when this urllib3 version cannot be timed.
+    """
+    timings = {"dns_ms": 0.0, "connect_ms": 0.0, "tls_ms": 0.0} if TIMING_SUPPORTED else {}
+    _local.timings = timings
+    return timings
+
+
+def stop_timing():
+    """Stop collecting connection timings on this thread"""
+    _local.timings = None
+
+
+def _record(phase: str, elapsed_ms: float):
+    timings: Optional[Dict[str, float]] = getattr(_local, "timings", None)
+    if timings:
+        timings[phase] += elapsed_ms
+
+
+def timed_create_connection(
+    address: Tuple[str, int],
+    timeout=_DEFAULT_TIMEOUT,
+    source_address: Optional[Tuple[str, int]] = None,
+    socket_options=None
+) -> socket.socket:
+    """urllib3's create_connection with the DNS lookup and the connect attempts timed.
+
+    Like urllib3, every resolved address is tried in turn, so an unreachable
+    AAAA record still falls back to IPv4.
+    """
+    host, port = address
+    if host.startswith("["):
+        host = host.strip("[]")
+    try:
+        host.encode("idna")
+    except UnicodeError:
+        raise LocationParseError(f"'{host}', label empty or too long") from None
+
+    start = time.perf_counter()
+    addresses = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+    resolved = time.perf_counter()
+    _record("dns_ms", (resolved - start) * 1000)
+
+    err = None
+    try:
+        for family, socktype, proto, _, sockaddr in addresses:
+            sock = None
+            try:
+                sock = socket.socket(family, socktype, proto)
+                _set_socket_options(sock, socket_options)
+                if timeout is not _DEFAULT_TIMEOUT:
+                    sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                sock.connect(sockaddr)
+                return sock
+            except OSError as e:
+                err = e
+                if sock is not None:
+                    sock.close()
+    finally:
+        _record("connect_ms", (time.perf_counter() - resolved) * 1000)
+    raise err if err is not None else OSError("getaddrinfo returns an empty list")
+
+
+class _TimedConnectionMixin:
+    """Open sockets through timed_create_connection, mapping errors as urllib3 does"""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            sock = timed_create_connection(
+                (self._dns_host, self.port),
+                self.timeout,
+                source_address=self.source_address,
+                socket_options=self.socket_options,
+            )
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        except SocketTimeout as e:
+            raise ConnectTimeoutError(
+                self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"
+            ) from e
+        except OSError as e:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+
+        sys.audit("http.client.connect", self, self.host, self.port)
+        self._socket_setup_ms = (time.perf_counter() - start) * 1000
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        self._socket_setup_ms = 0.0
+        super().connect()
+        # Everything after the socket is open is the TLS handshake
+        _record("tls_ms", (time.perf_counter() - start) * 1000 - self._socket_setup_ms)
+
+
+if not TIMING_SUPPORTED:
+    TimedHTTPConnection, TimedHTTPSConnection = HTTPConnection, HTTPSConnection
+
+
+_pool_counts_lock = threading.Lock()
+
+
+class _CountingPoolMixin:
+    """Count connection checkouts (one per attempt, retries included) and socket reuse"""
+
+    checkouts = 0
+    reused = 0
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        with _pool_counts_lock:
+            self.checkouts += 1
+            if getattr(conn, "sock", None) is not None:
+                self.reused += 1
+        return conn
+
+
+class TimedHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report DNS/connect/TLS timings"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
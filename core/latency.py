@@ -0,0 +1,31 @@
+"""Latency statistics shared by the load runner and request instrumentation"""
+
+import math
+from typing import Dict, Iterable, List
+
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(values: Iterable[float]) -> Dict[str, float]:
+    """Summarize latencies (ms) into count, min, mean, p50/p95/p99 and max"""
+    ordered = sorted(values)
+    if not ordered:
+        return {"count": 0}
+    summary = {
+        "count": len(ordered),
+        "min": ordered[0],
+        "mean": sum(ordered) / len(ordered),
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = percentile(ordered, pct)
+    summary["max"] = ordered[-1]
+    return summary
@@ -0,0 +1,301 @@
+"""Open-loop load generation driven by the API YAML configs.
+
+Targets come from config/data/api/load_profiles.yaml and reference
+endpoints.yaml, payloads.yaml and expected_responses.yaml, whose
+response_time_ms values are enforced as latency budgets. Requests that raise
+or return a status other than the expected status_code (any 4xx/5xx for
+targets without an expected response) count as errors: they are kept out of
+the latency percentiles and fail the run above the profile's max_error_rate.
+
+    python -m core.load_runner --env dev --load rps:200,duration:60
+    pytest tests/test_api_load.py --env dev --load rps:200,duration:60
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, List, NamedTuple
+
+from core.config_loader import load_data_config
+from core.api_helper import (
+    create_session,
+    get_api_base_url,
+    get_endpoint,
+    get_payload,
+    get_headers,
+    get_expected_response,
+    build_url
+)
+from core.async_api_helper import async_api_request
+from core.latency import summarize_latencies
+
+
+DEFAULT_LOAD_OPTIONS = {"rps": 10.0, "duration": 10.0, "profile": "default"}
+DEFAULT_MAX_ERROR_RATE = 0.01
+
+
+class LoadTarget(NamedTuple):
+    """A resolved load profile target"""
+    name: str
+    method: str
+    url: str
+    payload: Optional[Dict[str, Any]]
+    budget_ms: Optional[float]
+    weight: int
+    expected_status: Optional[int] = None
+
+
+def parse_load_option(value: str) -> Dict[str, Any]:
+    """Parse a --load value such as 'rps:200,duration:60,profile:smoke'"""
+    options = dict(DEFAULT_LOAD_OPTIONS)
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        key, sep, raw = part.partition(":")
+        key = key.strip()
+        if not sep or key not in options:
+            raise ValueError(f"Invalid load option '{part}', expected e.g. rps:200,duration:60")
+        options[key] = raw.strip() if key == "profile" else float(raw)
+
+    if options["rps"] <= 0 or options["duration"] <= 0:
+        raise ValueError("Load rps and duration must be positive")
+    return options
+
+
+def load_load_profile(profile: str = "default") -> Dict[str, Any]:
+    """Load a named load profile"""
+    profiles = load_data_config("api/load_profiles")
+    if profile not in profiles:
+        raise ValueError(f"Load profile '{profile}' not found")
+    return profiles[profile]
+
+
+def resolve_payload(payload_ref: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Resolve '<payload_name>.<payload_type>[.<variant>]' from payloads.yaml"""
+    if not payload_ref:
+        return None
+    payload_name, payload_type, *variants = payload_ref.split(".")
+    payload = get_payload(payload_name, payload_type)
+    for variant in variants:
+        payload = (payload or {}).get(variant)
+    if payload is None:
+        raise ValueError(f"Payload '{payload_ref}' not found")
+    return payload
+
+
+def build_targets(profile_config: Dict[str, Any], base_url: str) -> List[LoadTarget]:
+    """Resolve the endpoints, payloads and budgets of a load profile"""
+    targets = []
+    for target in profile_config.get("targets", []):
+        group, endpoint_name = target["endpoint_group"], target["endpoint_name"]
+        endpoint = get_endpoint(group, endpoint_name)
+        if not endpoint:
+            raise ValueError(f"Endpoint {group}.{endpoint_name} not found")
+
+        expected_name = target.get("expected_response")
+        expected = get_expected_response(expected_name) if expected_name else None
+        name = target.get("name") or f"{group}.{endpoint_name}" + (f" ({expected_name})" if expected_name else "")
+        targets.append(LoadTarget(
+            name=name,
+            method=target.get("method", "GET").upper(),
+            url=build_url(base_url, endpoint, target.get("path_params")),
+            payload=resolve_payload(target.get("payload")),
+            budget_ms=(expected or {}).get("response_time_ms"),
+            weight=int(target.get("weight", 1)),
+            expected_status=(expected or {}).get("status_code")
+        ))
+    if not targets:
+        raise ValueError("Load profile has no targets")
+    return targets
+
+
+def build_schedule(targets: List[LoadTarget]) -> List[int]:
+    """Interleave target indexes by weight (smooth weighted round robin)"""
+    total_weight = sum(target.weight for target in targets)
+    current = [0] * len(targets)
+    schedule = []
+    for _ in range(total_weight):
+        for i, target in enumerate(targets):
+            current[i] += target.weight
+        chosen = max(range(len(targets)), key=lambda i: current[i])
+        current[chosen] -= total_weight
+        schedule.append(chosen)
+    return schedule
+
+
+def is_failed_status(target: LoadTarget, status_code: int) -> bool:
+    if target.expected_status is not None:
+        return status_code != target.expected_status
+    return status_code >= 400
+
+
+def check_budgets(
+    endpoints: Dict[str, Dict[str, Any]],
+    budget_percentile: int = 95,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE
+) -> List[str]:
+    """List endpoints whose error rate or latency percentile exceeds the profile limits"""
+    violations = []
+    key = f"p{budget_percentile}"
+    for name, stats in endpoints.items():
+        sent = stats.get("sent", stats.get("count", 0))
+        errors = stats.get("errors", 0)
+        if sent and errors / sent > max_error_rate:
+            violations.append(f"{name}: error rate {errors / sent:.1%} ({errors}/{sent}) exceeds {max_error_rate:.1%}")
+        budget = stats.get("budget_ms")
+        if budget is None or not stats.get("count"):
+            continue
+        if stats[key] > budget:
+            violations.append(f"{name}: {key} {stats[key]:.1f} ms exceeds budget {budget} ms")
+    return violations
+
+
+async def run_load_async(
+    env: str = "dev",
+    rps: float = 10.0,
+    duration: float = 10.0,
+    profile: str = "default",
+    base_url: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: int = 30
+) -> Dict[str, Any]:
+    """Send requests at a fixed rate regardless of response times and report latencies"""
+    profile_config = load_load_profile(profile)
+    if base_url is None:
+        base_url = get_api_base_url(env)
+    if headers is None:
+        headers = get_headers(env=env)
+    targets = build_targets(profile_config, base_url)
+    schedule = build_schedule(targets)
+
+    max_in_flight = int(profile_config.get("max_in_flight", 100))
+    session = create_session(env, pool_size=max_in_flight)
+    latencies: Dict[str, List[float]] = {target.name: [] for target in targets}
+    status_codes: Dict[str, Dict[str, int]] = {target.name: {} for target in targets}
+    errors: Dict[str, int] = {target.name: 0 for target in targets}
+
+    loop = asyncio.get_running_loop()
+    total = int(rps * duration)
+    interval = 1.0 / rps
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+
+        async def fire(target: LoadTarget, scheduled: float):
+            try:
+                response = await async_api_request(
+                    target.method, target.url, headers=headers, payload=target.payload,
+                    timeout=timeout, env=env, executor=executor, session=session,
+                    # The load report has its own histograms; keep the trend report clean
+                    record=False
+                )
+                status = str(response.status_code)
+                failed = is_failed_status(target, response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+                failed = True
+            if failed:
+                # Fast failures (e.g. refused connections) would drag the percentiles down
+                errors[target.name] += 1
+            else:
+                # Measure from the scheduled send time so queueing delay is not hidden
+                latencies[target.name].append((loop.time() - scheduled) * 1000)
+            status_codes[target.name][status] = status_codes[target.name].get(status, 0) + 1
+
+        start = loop.time()
+        tasks = []
+        for i in range(total):
+            scheduled = start + i * interval
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            target = targets[schedule[i % len(schedule)]]
+            tasks.append(asyncio.ensure_future(fire(target, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - start
+
+    session.close()
+
+    endpoints = {}
+    for target in targets:
+        endpoints[target.name] = {
+            **summarize_latencies(latencies[target.name]),
+            "sent": len(latencies[target.name]) + errors[target.name],
+            "errors": errors[target.name],
+            "budget_ms": target.budget_ms,
+            "status_codes": status_codes[target.name]
+        }
+    budget_percentile = int(profile_config.get("budget_percentile", 95))
+    max_error_rate = float(profile_config.get("max_error_rate", DEFAULT_MAX_ERROR_RATE))
+    return {
+        "env": env,
+        "profile": profile,
+        "target_rps": rps,
+        "duration": duration,
+        "sent": total,
+        "achieved_rps": total / elapsed if elapsed else 0.0,
+        "budget_percentile": budget_percentile,
+        "max_error_rate": max_error_rate,
+        "endpoints": endpoints,
+        "violations": check_budgets(endpoints, budget_percentile, max_error_rate)
+    }
+
+
+def run_load(
+    env: str = "dev",
+    rps: float = 10.0,
+    duration: float = 10.0,
+    profile: str = "default",
+    base_url: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: int = 30
+) -> Dict[str, Any]:
+    """Synchronous wrapper around run_load_async"""
+    return asyncio.run(run_load_async(
+        env=env, rps=rps, duration=duration, profile=profile,
+        base_url=base_url, headers=headers, timeout=timeout
+    ))
+
+
+def format_load_report(report: Dict[str, Any]) -> str:
+    """Render a load report as a plain-text table"""
+    lines = [
+        f"env={report['env']} profile={report['profile']} sent={report['sent']} "
+        f"target_rps={report['target_rps']:g} achieved_rps={report['achieved_rps']:.1f}",
+        f"{'endpoint':<45} {'count':>6} {'errors':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'budget':>7}  status"
+    ]
+    for name, stats in report["endpoints"].items():
+        statuses = " ".join(f"{code}:{count}" for code, count in sorted(stats["status_codes"].items()))
+        if not stats.get("count"):
+            lines.append(f"{name:<45} {0:>6} {stats.get('errors', 0):>6}  {statuses}")
+            continue
+        budget = stats["budget_ms"] if stats["budget_ms"] is not None else "-"
+        lines.append(
+            f"{name:<45} {stats['count']:>6} {stats.get('errors', 0):>6} {stats['p50']:>8.1f} {stats['p95']:>8.1f} "
+            f"{stats['p99']:>8.1f} {stats['max']:>8.1f} {budget:>7}  {statuses}"
+        )
+    for violation in report["violations"]:
+        lines.append(f"BUDGET EXCEEDED: {violation}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay load profile endpoints at a target rate")
+    parser.add_argument("--env", default="dev", help="Environment name: dev, stage, prod, etc.")
+    parser.add_argument("--load", default="", help="Load options, e.g. rps:200,duration:60,profile:default")
+    parser.add_argument("--base-url", default=None, help="Override api_base_url from the env config")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    report = run_load(env=args.env, base_url=args.base_url, **parse_load_option(args.load))
+    print(format_load_report(report))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+    return 1 if report["violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""Locator helpers shared by page objects and the HTTP driver backend"""
+
+from selenium.webdriver.common.by import By
+
+# Strategies that map directly onto a CSS selector
+CSS_TRANSLATIONS = {
+    By.ID: "[id='{}']",
+    By.NAME: "[name='{}']",
+    By.CLASS_NAME: ".{}",
+    By.TAG_NAME: "{}",
+}
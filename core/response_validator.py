@@ -0,0 +1,214 @@
+"""Validate API responses against expected_responses.yaml with compiled checkers.
+
+Each expected response_body compiles, once per response name, into a tree of
+checkers (recompiled when expected_responses.yaml changes):
+
+- mappings check their listed fields, and extra fields are allowed;
+- a list with one item validates every element against that item;
+- type markers ("string", "uuid_format", "iso_datetime_format", ...) check types
+  and formats;
+- anything else must match exactly.
+
+Validation first runs a fast boolean pass. Paths and messages are only built
+for the parts that fail, so large list responses cost one pass.
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from core.api_helper import EXPECTED_RESPONSES_CONFIG, get_expected_response
+from core.config_loader import config_stamp, data_config_path
+
+UUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+ISO_DATETIME_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?"
+)
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _pattern_check(pattern: re.Pattern) -> Callable[[Any], bool]:
+    return lambda value: isinstance(value, str) and pattern.fullmatch(value) is not None
+
+
+# Type markers usable as values in response_body
+TYPE_MARKERS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "list": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+    "not_null": lambda value: value is not None,
+    "any": lambda value: True,
+    "uuid_format": _pattern_check(UUID_PATTERN),
+    "iso_datetime_format": _pattern_check(ISO_DATETIME_PATTERN),
+    "email_format": _pattern_check(EMAIL_PATTERN),
+}
+
+# Compiled validators by response name, with the config file stamp they were built from
+_validators: Dict[str, Tuple[Tuple[int, int], "ResponseValidator"]] = {}
+_validators_lock = threading.Lock()
+
+
+def _format_path(path: Tuple[Any, ...]) -> str:
+    text = "body"
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else f".{part}"
+    return text
+
+
+class _LeafCheck:
+    __slots__ = ("check", "description")
+
+    def __init__(self, check: Callable[[Any], bool], description: str):
+        self.check = check
+        self.description = description
+
+    def matches(self, value: Any) -> bool:
+        return self.check(value)
+
+    def collect(self, value: Any, path: Tuple[Any, ...], errors: List[str]):
+        if not self.check(value):
+            errors.append(f"{_format_path(path)}: expected {self.description}, got {value!r}")
+
+
+class _ObjectCheck:
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: List[Tuple[str, Any]]):
+        self.fields = fields
+
+    def matches(self, value: Any) -> bool:
+        if not isinstance(value, dict):
+            return False
+        for key, check in self.fields:
+            if key not in value or not check.matches(value[key]):
+                return False
+        return True
+
+    def collect(self, value: Any, path: Tuple[Any, ...], errors: List[str]):
+        if not isinstance(value, dict):
+            errors.append(f"{_format_path(path)}: expected object, got {type(value).__name__}")
+            return
+        for key, check in self.fields:
+            if key not in value:
+                errors.append(f"{_format_path(path + (key,))}: missing")
+            elif not check.matches(value[key]):
+                check.collect(value[key], path + (key,), errors)
+
+
+class _ListCheck:
+    __slots__ = ("item",)
+
+    def __init__(self, item: Optional[Any]):
+        self.item = item
+
+    def matches(self, value: Any) -> bool:
+        if not isinstance(value, list):
+            return False
+        if self.item is None:
+            return True
+        matches = self.item.matches
+        return all(matches(element) for element in value)
+
+    def collect(self, value: Any, path: Tuple[Any, ...], errors: List[str]):
+        if not isinstance(value, list):
+            errors.append(f"{_format_path(path)}: expected list, got {type(value).__name__}")
+            return
+        for index, element in enumerate(value):
+            if not self.item.matches(element):
+                self.item.collect(element, path + (index,), errors)
+
+
+def _exact_check(expected: Any) -> _LeafCheck:
+    if isinstance(expected, bool) or expected is None:
+        return _LeafCheck(lambda value: value is expected, repr(expected))
+    if _is_number(expected):
+        return _LeafCheck(lambda value: _is_number(value) and value == expected, repr(expected))
+    return _LeafCheck(lambda value: value == expected, repr(expected))
+
+
+def compile_body_check(expected: Any):
+    """Compile an expected response_body (or part of it) into a checker"""
+    if isinstance(expected, dict):
+        return _ObjectCheck([(key, compile_body_check(value)) for key, value in expected.items()])
+    if isinstance(expected, list):
+        if len(expected) > 1:
+            raise ValueError("Expected list bodies describe their items with a single element")
+        return _ListCheck(compile_body_check(expected[0]) if expected else None)
+    if isinstance(expected, str) and expected in TYPE_MARKERS:
+        return _LeafCheck(TYPE_MARKERS[expected], expected)
+    return _exact_check(expected)
+
+
+class ResponseValidator:
+    """Compiled status code and body checks of one expected response"""
+
+    def __init__(self, name: str, expected: Dict[str, Any]):
+        self.name = name
+        self.status_code = expected.get("status_code")
+        body = expected.get("response_body")
+        self.expects_empty_body = "response_body" in expected and body is None
+        self.body_check = None if body is None else compile_body_check(body)
+
+    def validate(self, status_code: int, body: Any) -> List[str]:
+        """Return every mismatch between a response and the expectation"""
+        errors = []
+        if self.status_code is not None and status_code != self.status_code:
+            errors.append(f"status_code: expected {self.status_code}, got {status_code}")
+        if self.body_check is not None and not self.body_check.matches(body):
+            self.body_check.collect(body, (), errors)
+        elif self.expects_empty_body and body not in (None, "", {}):
+            errors.append(f"body: expected no content, got {body!r}")
+        return errors
+
+
+def get_response_validator(response_name: str) -> ResponseValidator:
+    """Compile the validator for an expected response once and reuse it"""
+    stamp = config_stamp(data_config_path(EXPECTED_RESPONSES_CONFIG))
+    with _validators_lock:
+        entry = _validators.get(response_name)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    expected = get_expected_response(response_name)
+    if expected is None:
+        raise ValueError(f"Expected response '{response_name}' not found")
+    validator = ResponseValidator(response_name, expected)
+    with _validators_lock:
+        _validators[response_name] = (stamp, validator)
+    return validator
+
+
+def validate_response(response: requests.Response, response_name: str) -> List[str]:
+    """Validate status code and JSON body of a response; return all mismatches"""
+    validator = get_response_validator(response_name)
+    if not response.content:
+        body = None
+    else:
+        try:
+            body = response.json()
+        except ValueError:
+            return validator.validate(response.status_code, None) + ["body: response is not valid JSON"]
+    return validator.validate(response.status_code, body)
+
+
+def assert_response_matches(response: requests.Response, response_name: str, max_reported: int = 20):
+    """Assert a response matches its expected response, listing every mismatch"""
+    errors = validate_response(response, response_name)
+    if errors:
+        shown = errors[:max_reported]
+        if len(errors) > max_reported:
+            shown.append(f"... and {len(errors) - max_reported} more")
+        raise AssertionError(f"{response_name}: {len(errors)} mismatch(es)\n  " + "\n  ".join(shown))
+
+
+def clear_response_validators():
+    with _validators_lock:
+        _validators.clear()
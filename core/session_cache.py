@@ -0,0 +1,228 @@
+"""Cache of logged-in browser state, one entry per environment and user role.
+
+The first test that needs a role logs in (through the UI or the login API)
+and captures cookies, localStorage and sessionStorage. The state is kept in
+memory and in .cache/sessions/{env}_{role}.json until it expires, so later
+tests (and later runs or xdist workers) inject it into a fresh driver instead
+of going through the login page. A lock file next to the cache makes other
+workers wait for the first login and then read its result.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.config_loader import BASE_DIR, file_lock
+from core.api_helper import get_full_url, get_headers, make_api_request
+from core.data_helper import get_role_credentials
+
+SESSION_CACHE_DIR = BASE_DIR / ".cache" / "sessions"
+# UI logins are slow, so workers wait longer for the lock than for token logins
+LOCK_TIMEOUT = 120.0
+STALE_LOCK_AGE = 180.0
+
+DEFAULT_SESSION_CACHE_OPTIONS = {
+    "login": "ui",
+    "ttl": 3600,
+    "default_role": "valid_user",
+    "token_storage_key": "token",
+    # A light same-origin page to open before adding cookies and storage
+    "inject_path": "/favicon.ico",
+}
+
+CAPTURE_STORAGE_SCRIPT = """
+const dump = (storage) => {
+    const items = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+return {local_storage: dump(window.localStorage), session_storage: dump(window.sessionStorage)};
+"""
+
+RESTORE_STORAGE_SCRIPT = """
+const state = arguments[0];
+for (const [key, value] of Object.entries(state.local_storage || {})) window.localStorage.setItem(key, value);
+for (const [key, value] of Object.entries(state.session_storage || {})) window.sessionStorage.setItem(key, value);
+"""
+
+_session_states: Dict[str, Dict[str, Any]] = {}
+_session_lock = threading.Lock()
+
+
+def get_session_cache_options(run_config: Optional[dict] = None) -> Dict[str, Any]:
+    """Session cache options from the run config's `session_cache` section"""
+    options = dict(DEFAULT_SESSION_CACHE_OPTIONS)
+    options.update((run_config or {}).get("session_cache") or {})
+    return options
+
+
+def session_cache_path(env: str, role: str) -> Path:
+    return SESSION_CACHE_DIR / f"{env}_{role}.json"
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _is_fresh(state: Optional[Dict[str, Any]], login_origin: str) -> bool:
+    """state was captured by logging in at login_origin and has not expired.
+
+    The state's own `origin` is where the login ended up (e.g. after an SSO
+    redirect) and may differ from base_url.
+    """
+    if not state or state.get("expires_at", 0) <= time.time():
+        return False
+    return state.get("login_origin", state.get("origin")) == login_origin
+
+
+def capture_session_state(driver: WebDriver, ttl: int, base_url: Optional[str] = None) -> Dict[str, Any]:
+    """Capture cookies and web storage of the current page.
+
+    base_url is the site the login was started from; defaults to the current page.
+    """
+    cookies = driver.get_cookies()
+    storage = driver.execute_script(CAPTURE_STORAGE_SCRIPT) or {}
+    expires_at = time.time() + ttl
+    # Never outlive the session cookies the server handed out
+    cookie_expiries = [cookie["expiry"] for cookie in cookies if "expiry" in cookie]
+    if cookie_expiries:
+        expires_at = min(expires_at, min(cookie_expiries))
+    return {
+        "origin": _origin(driver.current_url),
+        "login_origin": _origin(base_url or driver.current_url),
+        "url": driver.current_url,
+        "cookies": cookies,
+        "local_storage": storage.get("local_storage", {}),
+        "session_storage": storage.get("session_storage", {}),
+        "captured_at": time.time(),
+        "expires_at": expires_at,
+    }
+
+
+def ui_login(driver: WebDriver, base_url: str, credentials: Dict[str, Any]):
+    """Log in through the login page; raise ValueError if it does not succeed"""
+    from pages.login_page import LoginPage
+
+    page = LoginPage(driver, base_url)
+    page.open_login()
+    page.login(credentials["email"], credentials["password"])
+    if not page.is_logged_in():
+        raise ValueError(f"UI login failed for {credentials['email']}")
+
+
+def api_login(env: str, base_url: str, credentials: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Log in through the login API and build a browser state from the token and cookies"""
+    url = get_full_url(env, "authentication", "login")
+    payload = {"email": credentials["email"], "password": credentials["password"]}
+    with requests.Session() as session:
+        response = make_api_request("POST", url, headers=get_headers(env=env), payload=payload, env=env, session=session)
+        if response.status_code != 200:
+            raise ValueError(f"API login failed for {credentials['email']}: {response.status_code}")
+        body = response.json()
+        # Cookies are re-scoped to the UI origin when injected
+        cookies = [{"name": cookie.name, "value": cookie.value, "path": cookie.path or "/"} for cookie in session.cookies]
+
+    data = body.get("data") if isinstance(body.get("data"), dict) else body
+    token = data.get("token") or data.get("access_token")
+    local_storage = {options["token_storage_key"]: token} if token else {}
+    return {
+        "origin": _origin(base_url),
+        "login_origin": _origin(base_url),
+        "url": base_url,
+        "cookies": cookies,
+        "local_storage": local_storage,
+        "session_storage": {},
+        "captured_at": time.time(),
+        "expires_at": time.time() + options["ttl"],
+    }
+
+
+def _read_cached_state(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_state(path: Path, state: Dict[str, Any]):
+    """Write atomically so parallel workers never read a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(state))
+    os.replace(tmp_path, path)
+
+
+def get_session_state(
+    env: str,
+    role: str,
+    base_url: str,
+    driver: Optional[WebDriver] = None,
+    run_config: Optional[dict] = None
+) -> Dict[str, Any]:
+    """Return a fresh logged-in state for env/role, logging in only on a cache miss.
+
+    UI login needs a driver; the driver is left logged in afterwards.
+    """
+    options = get_session_cache_options(run_config)
+    origin = _origin(base_url)
+    key = f"{env}_{role}"
+
+    with _session_lock:
+        state = _session_states.get(key)
+    if _is_fresh(state, origin):
+        return state
+
+    path = session_cache_path(env, role)
+    # One login per env/role across workers; the others read the state it writes
+    with file_lock(path.with_suffix(".lock"), LOCK_TIMEOUT, STALE_LOCK_AGE):
+        state = _read_cached_state(path)
+        if not _is_fresh(state, origin):
+            credentials = get_role_credentials(role)
+            if options["login"] == "api":
+                state = api_login(env, base_url, credentials, options)
+            elif options["login"] == "ui":
+                if driver is None:
+                    raise ValueError("UI login requires a driver")
+                ui_login(driver, base_url, credentials)
+                state = capture_session_state(driver, options["ttl"], base_url)
+            else:
+                raise ValueError(f"Unsupported session cache login: {options['login']}")
+            _write_cached_state(path, state)
+
+    with _session_lock:
+        _session_states[key] = state
+    return state
+
+
+def inject_session_state(driver: WebDriver, state: Dict[str, Any], inject_path: str = "/favicon.ico"):
+    """Load cookies and web storage into a driver; it must be on the state's origin first"""
+    driver.get(state["origin"] + inject_path)
+    for cookie in state["cookies"]:
+        driver.add_cookie(cookie)
+    driver.execute_script(RESTORE_STORAGE_SCRIPT, state)
+
+
+def invalidate_session_state(env: str, role: str):
+    """Forget a cached state, e.g. after the server rejected it"""
+    with _session_lock:
+        _session_states.pop(f"{env}_{role}", None)
+    session_cache_path(env, role).unlink(missing_ok=True)
+
+
+def clear_session_cache():
+    """Drop all in-memory and on-disk session states"""
+    with _session_lock:
+        _session_states.clear()
+    for path in SESSION_CACHE_DIR.glob("*.json"):
+        path.unlink(missing_ok=True)
@@ -0,0 +1,208 @@
+"""Compiled {placeholder} templates for config-driven strings, URLs and payloads.
+
+A string is parsed once into literal and placeholder segments (cached by its
+text), and rendering joins the segments in a single pass. Nested data is
+compiled into a tree where subtrees without placeholders are kept as-is, so
+rendering skips parsing them; rendered output gets its own copy of them and
+never aliases the template source.
+
+Placeholder values come from the values passed to render, then from
+registered providers (timestamp, uuid, trace_id, correlation_id, token, ...).
+Unknown placeholders are left untouched. Placeholder names are any text
+between braces without nested braces, e.g. {user_id} or {user-id}.
+"""
+
+import functools
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from core.config_loader import copy_tree
+
+_PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+
+Provider = Callable[[Dict[str, Any]], Any]
+
+_providers: Dict[str, Provider] = {}
+_tree_cache: Dict[str, Tuple[Hashable, "TemplateTree"]] = {}
+_tree_lock = threading.Lock()
+
+
+def register_provider(name: str, provider: Provider):
+    """Register a function that supplies {name} when render values do not.
+
+    Providers receive the render context (e.g. {"env": "dev"}) and are called at
+    most once per render, so one value is shared by all its placeholders.
+    """
+    _providers[name] = provider
+
+
+def _bearer_token(context: Dict[str, Any]) -> Optional[str]:
+    from core.auth_tokens import get_bearer_token
+    return get_bearer_token(context.get("env", "dev"), context.get("role"))
+
+
+register_provider("timestamp", lambda context: str(int(time.time() * 1000)))
+register_provider("uuid", lambda context: str(uuid.uuid4()))
+register_provider("trace_id", lambda context: uuid.uuid4().hex)
+register_provider("correlation_id", lambda context: str(uuid.uuid4()))
+register_provider("token", _bearer_token)
+
+
+class _Resolver:
+    """Looks up placeholder values for one render, calling each provider once"""
+
+    __slots__ = ("values", "context", "_provided")
+
+    def __init__(self, values: Optional[Dict[str, Any]], context: Optional[Dict[str, Any]]):
+        self.values = values or {}
+        self.context = context or {}
+        self._provided: Dict[str, Any] = {}
+
+    def __call__(self, name: str) -> Optional[str]:
+        if name in self.values:
+            return str(self.values[name])
+        if name not in self._provided:
+            provider = _providers.get(name)
+            self._provided[name] = provider(self.context) if provider else None
+        value = self._provided[name]
+        return None if value is None else str(value)
+
+
+class Template:
+    """A string split into literal segments and placeholder names"""
+
+    __slots__ = ("source", "segments", "names")
+
+    def __init__(self, source: str):
+        self.source = source
+        segments: List[Tuple[bool, str]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            if match.start() > position:
+                segments.append((False, source[position:match.start()]))
+            segments.append((True, match.group(1)))
+            position = match.end()
+        if position < len(source):
+            segments.append((False, source[position:]))
+        self.segments = tuple(segments)
+        self.names = frozenset(name for is_field, name in segments if is_field)
+
+    def render(self, values: Optional[Dict[str, Any]] = None, context: Optional[Dict[str, Any]] = None) -> str:
+        return self._render(_Resolver(values, context))
+
+    def _render(self, resolve: _Resolver) -> str:
+        parts = []
+        for is_field, text in self.segments:
+            if is_field:
+                value = resolve(text)
+                parts.append(f"{{{text}}}" if value is None else value)
+            else:
+                parts.append(text)
+        return "".join(parts)
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_template(text: str) -> Template:
+    """Parse a string into a Template, once per distinct string"""
+    return Template(text)
+
+
+def render_template(text: str, values: Optional[Dict[str, Any]] = None, context: Optional[Dict[str, Any]] = None) -> str:
+    if "{" not in text:
+        return text
+    return compile_template(text).render(values, context)
+
+
+_Node = Union["_Static", Template, "_DictNode", "_ListNode"]
+
+
+class _Static:
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class _DictNode:
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Tuple[Any, _Node]]):
+        self.items = items
+
+
+class _ListNode:
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[_Node]):
+        self.items = items
+
+
+def _compile_node(data: Any) -> _Node:
+    if isinstance(data, str):
+        if "{" in data:
+            template = compile_template(data)
+            if template.names:
+                return template
+        return _Static(data)
+    if isinstance(data, dict):
+        items = [(key, _compile_node(value)) for key, value in data.items()]
+        if all(isinstance(node, _Static) for _, node in items):
+            return _Static(data)
+        return _DictNode(items)
+    if isinstance(data, list):
+        items = [_compile_node(item) for item in data]
+        if all(isinstance(node, _Static) for node in items):
+            return _Static(data)
+        return _ListNode(items)
+    return _Static(data)
+
+
+def _render_node(node: _Node, resolve: _Resolver) -> Any:
+    if isinstance(node, _Static):
+        return copy_tree(node.value)
+    if isinstance(node, Template):
+        return node._render(resolve)
+    if isinstance(node, _DictNode):
+        return {key: _render_node(child, resolve) for key, child in node.items}
+    return [_render_node(child, resolve) for child in node.items]
+
+
+class TemplateTree:
+    """Compiled nested data (dicts, lists, strings) with placeholders"""
+
+    __slots__ = ("_root",)
+
+    def __init__(self, data: Any):
+        self._root = _compile_node(data)
+
+    @property
+    def is_static(self) -> bool:
+        return isinstance(self._root, _Static)
+
+    def render(self, values: Optional[Dict[str, Any]] = None, context: Optional[Dict[str, Any]] = None) -> Any:
+        return _render_node(self._root, _Resolver(values, context))
+
+
+def get_template_tree(key: str, loader: Callable[[], Any], version: Hashable = None) -> TemplateTree:
+    """Compile the data returned by loader once per key and reuse it.
+
+    version (e.g. the config file stamp) invalidates the cached tree when it changes.
+    """
+    with _tree_lock:
+        entry = _tree_cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    tree = TemplateTree(loader())
+    with _tree_lock:
+        _tree_cache[key] = (version, tree)
+    return tree
+
+
+def clear_template_cache():
+    """Forget compiled templates, e.g. after editing config files in a running process"""
+    with _tree_lock:
+        _tree_cache.clear()
+    compile_template.cache_clear()
@@ -1,12 +1,164 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
+
+from core.browser_metrics import capture_page_metrics, metrics_enabled
+from core.locators import CSS_TRANSLATIONS
+
+logger = logging.getLogger(__name__)
+
+Locator = Tuple[str, str]
+
+# Tries every candidate in one round trip. arguments[0] is a list of
+# [kind, selector] pairs, arguments[1] maps location.pathname to the index that
+# won last time (tried first), arguments[2] requires a visible, enabled match.
+FIND_FIRST_SCRIPT = """
+const candidates = arguments[0], preferred = arguments[1], clickable = arguments[2];
+const path = window.location.pathname;
+const order = candidates.map((_, i) => i);
+const hint = preferred[path];
+if (Number.isInteger(hint) && hint >= 0 && hint < candidates.length) {
+    order.splice(hint, 1);
+    order.unshift(hint);
+}
+const usable = (el) => !clickable || (el.getClientRects().length > 0 && !el.disabled);
+for (const i of order) {
+    const [kind, selector] = candidates[i];
+    let el = null;
+    try {
+        el = kind === "xpath"
+            ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(selector);
+    } catch (e) {}
+    if (el && usable(el)) return [i, el, path];
+}
+return null;
+"""
+
+# (page class, element name) -> {url path: index of the candidate that matched}
+_locator_cache: Dict[Tuple[str, str], Dict[str, int]] = {}
+_locator_stats = {"lookups": 0, "cache_hits": 0, "slow": 0}
+_locator_lock = threading.Lock()
+
+
+def _to_script_candidate(locator: Locator) -> List[str]:
+    by, value = locator
+    if by == By.XPATH:
+        return ["xpath", value]
+    if by == By.CSS_SELECTOR:
+        return ["css", value]
+    if by in CSS_TRANSLATIONS:
+        return ["css", CSS_TRANSLATIONS[by].format(value)]
+    raise ValueError(f"Unsupported locator strategy for find_first: {by}")
+
+
+def get_locator_stats() -> Dict[str, int]:
+    """Return find_first lookup, learned-strategy hit and slow lookup counters"""
+    with _locator_lock:
+        return {**_locator_stats, "learned": sum(len(paths) for paths in _locator_cache.values())}
+
+
+def clear_locator_cache():
+    """Forget learned locator strategies and reset the counters"""
+    with _locator_lock:
+        _locator_cache.clear()
+        for key in _locator_stats:
+            _locator_stats[key] = 0
 
 
 class BasePage:
+    # Lookups slower than this are logged as warnings
+    SLOW_LOOKUP_MS = 1000
+    POLL_INTERVAL = 0.1
+    # Prefix of browser metrics labels, e.g. "login" -> "login.open"; defaults to the class name
+    PAGE_NAME = None
+
     def __init__(self, driver: WebDriver, base_url: str):
         self.driver = driver
         self.base_url = base_url
+        # Static drivers (core/http_driver.HttpDriver) never change a page on their own,
+        # so waiting on them only burns time
+        self.is_static = getattr(driver, "is_static", False)
+
+    @property
+    def page_name(self) -> str:
+        return self.PAGE_NAME or type(self).__name__.lower()
 
     def open(self, path: str = ""):
         """Open a relative path on the base_url."""
         self.driver.get(self.base_url + path)
+        if metrics_enabled() and not self.is_static:
+            capture_page_metrics(self.driver, f"{self.page_name}.open")
+
+    def wait(self, timeout: float) -> WebDriverWait:
+        """WebDriverWait for this page; a single check on static drivers"""
+        return WebDriverWait(self.driver, 0 if self.is_static else timeout)
+
+    @contextmanager
+    def measure_action(self, action: str):
+        """Record duration and resources loaded during a page action when browser metrics are enabled"""
+        if not metrics_enabled() or self.is_static:
+            yield
+            return
+        since = self.driver.execute_script("return performance.now()")
+        start = time.perf_counter()
+        yield
+        duration_ms = (time.perf_counter() - start) * 1000
+        capture_page_metrics(self.driver, f"{self.page_name}.{action}", since=since, duration_ms=duration_ms)
+
+    def find_first(
+        self,
+        name: str,
+        candidates: Sequence[Locator],
+        timeout: float = 10,
+        clickable: bool = False
+    ) -> WebElement:
+        """Return the first element matching any candidate locator.
+
+        All candidates are checked in a single JavaScript call per poll, so a
+        page that only matches the last one costs no extra waits. The candidate
+        that matched is remembered per page and URL path and tried first next time.
+        """
+        cache_key = (type(self).__name__, name)
+        script_candidates = [_to_script_candidate(locator) for locator in candidates]
+        with _locator_lock:
+            preferred = dict(_locator_cache.get(cache_key, {}))
+
+        start = time.perf_counter()
+        deadline = start + timeout
+        while True:
+            if self.is_static:
+                result = self.driver.find_first_candidate(script_candidates, preferred, clickable)
+            else:
+                result = self.driver.execute_script(FIND_FIRST_SCRIPT, script_candidates, preferred, clickable)
+            if result or self.is_static or time.perf_counter() >= deadline:
+                break
+            time.sleep(self.POLL_INTERVAL)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with _locator_lock:
+            _locator_stats["lookups"] += 1
+            if elapsed_ms > self.SLOW_LOOKUP_MS:
+                _locator_stats["slow"] += 1
+            if result:
+                index, _, path = result
+                if preferred.get(path) == index:
+                    _locator_stats["cache_hits"] += 1
+                _locator_cache.setdefault(cache_key, {})[path] = index
 
+        if elapsed_ms > self.SLOW_LOOKUP_MS:
+            logger.warning(
+                "Slow lookup of %s.%s: %.0f ms (%s)",
+                type(self).__name__, name, elapsed_ms, "found" if result else "not found"
+            )
+        if not result:
+            raise TimeoutException(f"No locator for {name} matched within {timeout}s: {list(candidates)}")
+        return result[1]
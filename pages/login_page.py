@@ -1,10 +1,11 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from .base_page import BasePage
 
 
 class LoginPage(BasePage):
+    PAGE_NAME = "login"
+
     # Revalu platform login page selectors
     EMAIL_INPUT = (By.XPATH, "//input[@placeholder='Enter your email' or @type='email' or @name='email']")
     PASSWORD_INPUT = (By.XPATH, "//input[@placeholder='Enter your password' or @type='password' or @name='password']")
@@ -12,6 +13,22 @@ class LoginPage(BasePage):
     ERROR_MESSAGE = (By.CSS_SELECTOR, "[role='alert'], .error, [class*='error'], [class*='Error']")
     LOGIN_LINK = (By.XPATH, "//a[contains(text(), 'Log in here')]")
 
+    # Alternatives for the same element, resolved together by BasePage.find_first
+    EMAIL_CANDIDATES = [
+        (By.CSS_SELECTOR, "input[placeholder='Enter your email']"),
+        (By.CSS_SELECTOR, "input[type='email']"),
+        (By.NAME, "email"),
+    ]
+    PASSWORD_CANDIDATES = [
+        (By.CSS_SELECTOR, "input[placeholder='Enter your password']"),
+        (By.CSS_SELECTOR, "input[type='password']"),
+        (By.NAME, "password"),
+    ]
+    LOGIN_BUTTON_CANDIDATES = [
+        (By.XPATH, "//button[contains(text(), 'Log In')]"),
+        (By.CSS_SELECTOR, "button[type='submit']"),
+    ]
+
     def open_login(self):
         """Navigate to login page"""
         self.open("/login")
@@ -19,7 +36,7 @@ class LoginPage(BasePage):
     def navigate_to_login(self):
         """Click on 'Log in here' link if on home page"""
         try:
-            login_link = WebDriverWait(self.driver, 5).until(
+            login_link = self.wait(5).until(
                 EC.element_to_be_clickable(self.LOGIN_LINK)
             )
             login_link.click()
@@ -29,44 +46,21 @@ class LoginPage(BasePage):
 
     def login(self, email: str, password: str):
         """Login with email and password"""
-        wait = WebDriverWait(self.driver, 10)
-        
-        # Wait for and fill email - try multiple selector strategies
-        try:
-            email_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Enter your email']")))
-        except:
-            try:
-                email_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@type='email']")))
-            except:
-                email_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@name='email']")))
-        
-        email_input.clear()
-        email_input.send_keys(email)
-        
-        # Wait for and fill password - try multiple selector strategies
-        try:
-            password_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@placeholder='Enter your password']")))
-        except:
-            try:
-                password_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@type='password']")))
-            except:
-                password_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@name='password']")))
-        
-        password_input.clear()
-        password_input.send_keys(password)
-        
-        # Click login button - try multiple selector strategies
-        try:
-            login_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Log In')]")))
-        except:
-            login_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[@type='submit']")))
-        
-        login_button.click()
+        with self.measure_action("login"):
+            email_input = self.find_first("email", self.EMAIL_CANDIDATES)
+            email_input.clear()
+            email_input.send_keys(email)
+
+            password_input = self.find_first("password", self.PASSWORD_CANDIDATES)
+            password_input.clear()
+            password_input.send_keys(password)
+
+            self.find_first("login_button", self.LOGIN_BUTTON_CANDIDATES, clickable=True).click()
 
     def is_logged_in(self) -> bool:
         """Check if login was successful by checking URL or page elements"""
         # Wait for redirect after login (up to 15 seconds)
-        wait = WebDriverWait(self.driver, 15)
+        wait = self.wait(15)
         
         try:
             # Wait until URL changes from login page
@@ -82,7 +76,7 @@ class LoginPage(BasePage):
             # Also check if login form is still present (alternative check)
             try:
                 # If we can't find login form elements, might be logged in
-                self.driver.find_element(*self.EMAIL_INPUT)
+                self.find_first("email", self.EMAIL_CANDIDATES, timeout=0)
                 # If we found email input, still on login page
                 return False
             except:
@@ -92,7 +86,7 @@ class LoginPage(BasePage):
     def get_error_text(self) -> str:
         """Get error message text if login fails"""
         try:
-            wait = WebDriverWait(self.driver, 3)
+            wait = self.wait(3)
             error_element = wait.until(EC.presence_of_element_located(self.ERROR_MESSAGE))
             return error_element.text
         except:
@@ -117,7 +111,7 @@ class LoginPage(BasePage):
     def click_login(self):
         self.driver.find_element(*self.login_button).click()
 
-    def login(self, username, password):
+    def login_with_username(self, username, password):
         self.enter_username(username)
         self.enter_password(password)
         self.click_login()
\ No newline at end of file
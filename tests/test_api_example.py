@@ -6,8 +6,10 @@ from core.api_helper import (
     get_payload,
     get_headers,
     make_api_request,
-    get_expected_response
+    get_expected_response,
+    assert_response_time
 )
+from core.response_validator import assert_response_matches
 
 
 def test_api_health_check(api_base_url, api_endpoints):
@@ -34,31 +36,19 @@ def test_api_login_success(api_base_url, api_endpoints, api_payloads, expected_r
     headers = get_headers()
     response = make_api_request("POST", url, headers=headers, payload=payload)
     
-    # Get expected response structure
-    expected = get_expected_response("login_success")
-    
-    assert response.status_code == expected["status_code"], \
-        f"Expected {expected['status_code']}, got {response.status_code}"
-    
-    response_json = response.json()
-    assert "token" in response_json or "access_token" in response_json, \
-        "Login response should contain token"
+    # Status code and body (token, expires_in, user_id, ...) from expected_responses.yaml
+    assert_response_matches(response, "login_success")
+    assert_response_time(response, "login_success")
 
 
-def test_api_login_failure(api_base_url, api_endpoints, api_payloads, expected_responses):
+@pytest.mark.data_matrix(payload="api/payloads:login_request.invalid[wrong_password,non_existent_user]")
+def test_api_login_failure(api_base_url, api_endpoints, matrix_case, expected_responses):
     """Test API login with invalid credentials"""
     login_endpoint = api_endpoints["endpoints"]["authentication"]["login"]
     url = api_base_url + login_endpoint
     
-    # Get invalid login payload
-    payload = get_payload("login_request", "invalid")
-    assert payload is not None, "Invalid login payload not found"
-    
-    # Try with wrong password payload
-    wrong_password_payload = payload.get("wrong_password", payload)
-    
     headers = get_headers()
-    response = make_api_request("POST", url, headers=headers, payload=wrong_password_payload)
+    response = make_api_request("POST", url, headers=headers, payload=matrix_case["payload"])
     
     # Get expected response structure
     expected = get_expected_response("login_failure")
@@ -66,27 +56,23 @@ def test_api_login_failure(api_base_url, api_endpoints, api_payloads, expected_r
     assert response.status_code == expected["status_code"], \
         f"Expected {expected['status_code']}, got {response.status_code}"
     
+    assert_response_time(response, "login_failure")
+    
     response_json = response.json()
     assert "error" in response_json or "message" in response_json, \
         "Error response should contain error message"
 
 
-def test_api_get_user(api_base_url, api_endpoints, api_test_data, api_headers):
-    """Test getting user by ID (example - requires authentication)"""
+def test_api_get_user(api_base_url, api_endpoints, api_test_data, authenticated_api_headers):
+    """Test getting user by ID with the shared bearer token"""
     user_endpoint = api_endpoints["endpoints"]["users"]["get_user"]
     valid_user_id = api_test_data["users"]["valid_user_id"]
     
     # Replace path parameter
     url = api_base_url + user_endpoint.replace("{user_id}", str(valid_user_id))
     
-    headers = get_headers()
-    # Note: In real scenario, you'd add auth token to headers
-    # headers["Authorization"] = f"Bearer {auth_token}"
-    
-    response = make_api_request("GET", url, headers=headers)
+    response = make_api_request("GET", url, headers=authenticated_api_headers)
     
-    # This test may fail if authentication is required - that's expected
-    # In real scenario, you'd authenticate first and use the token
     assert response.status_code in [200, 401, 403], \
         f"Unexpected status code: {response.status_code}"
 
@@ -111,7 +97,6 @@ def test_api_create_user(api_base_url, api_endpoints, api_payloads, expected_res
         f"Unexpected status code: {response.status_code}"
     
     if response.status_code == expected["status_code"]:
-        response_json = response.json()
-        assert "id" in response_json or "user_id" in response_json, \
-            "Create user response should contain user ID"
+        assert_response_matches(response, "create_user_success")
+        assert_response_time(response, "create_user_success")
 
@@ -0,0 +1,83 @@
+"""API load test replaying config/data/api/load_profiles.yaml (enabled with --load)"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from core.load_runner import (
+    run_load,
+    format_load_report,
+    parse_load_option,
+    build_schedule,
+    check_budgets,
+    LoadTarget
+)
+
+
+def test_api_load_within_budgets(pytestconfig, load_options):
+    """Replay the load profile at the requested rate and enforce response_time_ms budgets"""
+    if load_options is None:
+        pytest.skip("Load mode disabled; run with --load=rps:200,duration:60")
+
+    env = pytestconfig.getoption("--env")
+    report = run_load(env=env, **load_options)
+    print(format_load_report(report))
+
+    assert not report["violations"], "Latency budgets exceeded:\n" + "\n".join(report["violations"])
+
+
+def test_parse_load_option():
+    """--load values are parsed into typed options with defaults"""
+    options = parse_load_option("rps:200,duration:60")
+    assert options == {"rps": 200.0, "duration": 60.0, "profile": "default"}
+    assert parse_load_option("rps:5,profile:smoke")["profile"] == "smoke"
+
+    with pytest.raises(ValueError):
+        parse_load_option("rate:200")
+
+
+def test_load_schedule_and_budgets():
+    """Targets are interleaved by weight and budgets are checked at the configured percentile"""
+    targets = [LoadTarget("a", "GET", "/a", None, 100, 2), LoadTarget("b", "GET", "/b", None, None, 1)]
+    assert build_schedule(targets) == [0, 1, 0]
+
+    endpoints = {
+        "a": {"count": 10, "p95": 150.0, "budget_ms": 100},
+        "b": {"count": 10, "p95": 900.0, "budget_ms": None},
+    }
+    violations = check_budgets(endpoints, 95)
+    assert len(violations) == 1 and violations[0].startswith("a: p95")
+
+
+def test_load_error_rate_fails_budgets():
+    """Failed requests are counted as errors, not latencies, and fail the run above max_error_rate"""
+    endpoints = {
+        "ok": {"count": 99, "sent": 100, "errors": 1, "p95": 10.0, "budget_ms": 100},
+        "down": {"count": 0, "sent": 50, "errors": 50, "budget_ms": 100},
+    }
+    violations = check_budgets(endpoints, 95, max_error_rate=0.01)
+    assert violations == ["down: error rate 100.0% (50/50) exceeds 1.0%"]
+
+
+class _ErrorHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(500)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_load_run_with_server_errors_fails():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ErrorHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        report = run_load(rps=40, duration=0.25, profile="smoke", base_url=f"http://127.0.0.1:{server.server_port}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    health = report["endpoints"]["health.health_check"]
+    assert health["count"] == 0 and health["errors"] == health["sent"] == 10
+    assert report["violations"] and "error rate" in report["violations"][0]
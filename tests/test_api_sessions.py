@@ -0,0 +1,43 @@
+"""Tests for pooled API session stats against a local stub server"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.api_helper import close_all_sessions, create_session, get_session_stats, make_api_request
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    close_all_sessions()
+    yield f"http://127.0.0.1:{server.server_port}"
+    close_all_sessions()
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_stats_count_pool_checkouts(stub_base_url):
+    """Reuse comes from urllib3 checkouts; requests on caller-owned sessions are not counted"""
+    for user_id in range(3):
+        make_api_request("GET", f"{stub_base_url}/api/v1/users/{user_id}", env="dev")
+    own_session = create_session("dev")
+    make_api_request("GET", f"{stub_base_url}/api/v1/users/9", env="dev", session=own_session)
+    own_session.close()
+
+    assert get_session_stats()["dev"] == {"requests": 3, "connections": 1, "reused": 2}
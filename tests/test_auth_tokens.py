@@ -0,0 +1,119 @@
+"""Tests for the shared auth token cache against a local stub auth server"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core import auth_tokens
+
+
+class _AuthHandler(BaseHTTPRequestHandler):
+    calls = {"login": 0, "refresh": 0}
+    expires_in = 3600
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        kind = "refresh" if self.path.endswith("/refresh") else "login"
+        self.calls[kind] += 1
+        if kind == "login" and not body.get("password"):
+            self.send_response(401)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        content = json.dumps({
+            "data": {
+                "access_token": f"{kind}-{self.calls[kind]}",
+                "refresh_token": "refresh-me",
+                "expires_in": self.expires_in,
+            }
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def auth_server(tmp_path, monkeypatch):
+    _AuthHandler.calls = {"login": 0, "refresh": 0}
+    _AuthHandler.expires_in = 3600
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _AuthHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    paths = {"login": "/api/v1/auth/login", "refresh_token": "/api/v1/auth/refresh"}
+    monkeypatch.setattr(auth_tokens, "get_full_url", lambda env, group, name: base + paths[name])
+    monkeypatch.setattr(auth_tokens, "TOKEN_CACHE_DIR", tmp_path)
+    auth_tokens.clear_token_cache()
+    yield _AuthHandler
+    auth_tokens.clear_token_cache()
+    server.shutdown()
+    server.server_close()
+
+
+def test_one_login_shared_through_memory_and_disk(auth_server, tmp_path):
+    """Repeated calls hit memory; a fresh process (empty memory) reuses the disk cache"""
+    assert auth_tokens.get_token("dev", "valid_user") == "login-1"
+    assert auth_tokens.get_token("dev", "valid_user") == "login-1"
+    assert json.loads((tmp_path / "dev_valid_user.json").read_text())["access_token"] == "login-1"
+
+    auth_tokens.clear_token_cache()
+    assert auth_tokens.get_token("dev", "valid_user") == "login-1"
+    assert auth_server.calls == {"login": 1, "refresh": 0}
+
+
+def test_token_near_expiry_is_refreshed(auth_server):
+    """A token inside the refresh margin is exchanged through the refresh endpoint"""
+    auth_server.expires_in = 30
+    assert auth_tokens.get_token("dev", "valid_user") == "login-1"
+
+    assert auth_tokens.get_token("dev", "valid_user") == "refresh-1"
+    assert auth_server.calls == {"login": 1, "refresh": 1}
+
+
+def test_concurrent_callers_share_one_login(auth_server):
+    tokens = []
+    threads = [
+        threading.Thread(target=lambda: tokens.append(auth_tokens.get_token("dev", "valid_user")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["login-1"] * 8
+    assert auth_server.calls["login"] == 1
+
+
+def test_static_source_uses_configured_token():
+    assert auth_tokens.get_bearer_token("prod") == "prod-bearer-token-REPLACE_IN_PRODUCTION"
+
+
+def test_forced_refresh_takes_newer_token_from_other_worker(auth_server, tmp_path):
+    """Background refreshes in N workers cost one refresh: later ones read the newer disk entry"""
+    assert auth_tokens.get_token("dev", "valid_user") == "login-1"
+    newer = json.loads((tmp_path / "dev_valid_user.json").read_text())
+    newer.update(access_token="refreshed-by-gw1", obtained_at=newer["obtained_at"] + 1)
+    (tmp_path / "dev_valid_user.json").write_text(json.dumps(newer))
+
+    assert auth_tokens.get_token("dev", "valid_user", force_refresh=True) == "refreshed-by-gw1"
+    assert auth_server.calls == {"login": 1, "refresh": 0}
+
+    # Nobody renewed since: a forced refresh goes to the API
+    assert auth_tokens.get_token("dev", "valid_user", force_refresh=True) == "refresh-1"
+
+
+def test_other_roles_not_blocked_by_a_renewal(auth_server):
+    """A login in progress for one role does not hold up token lookups for another"""
+    tokens = []
+    with auth_tokens._key_lock("dev_revalu_admin"):
+        thread = threading.Thread(target=lambda: tokens.append(auth_tokens.get_token("dev", "valid_user")))
+        thread.start()
+        thread.join(5)
+    assert tokens == ["login-1"]
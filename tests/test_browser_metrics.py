@@ -0,0 +1,42 @@
+"""Tests for browser metrics budgets and recording using a fake driver"""
+
+import pytest
+
+from core import browser_metrics
+
+
+class MetricsDriver:
+    current_url = "https://app.example.test/login"
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def execute_async_script(self, script, since):
+        return dict(self.metrics)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    browser_metrics.reset_browser_metrics()
+    yield
+    browser_metrics.reset_browser_metrics()
+    browser_metrics.configure_browser_metrics({})
+
+
+def test_budget_violations_are_recorded():
+    driver = MetricsDriver({"fcp_ms": 500.0, "lcp_ms": 4000.0, "resource_count": 12})
+
+    record = browser_metrics.capture_page_metrics(driver, "login.open")
+
+    assert record["violations"] == ["login.open: lcp_ms 4000 ms exceeds budget 2500 ms"]
+    assert browser_metrics.drain_page_metrics() == [record]
+    assert browser_metrics.drain_page_metrics() == []
+    assert browser_metrics.get_browser_metrics_summary()["login.open"]["lcp_ms"]["p50"] == 4000.0
+
+
+def test_enforced_budgets_fail_the_action():
+    browser_metrics.configure_browser_metrics({"browser_metrics": {"enabled": True, "enforce_budgets": True}})
+    driver = MetricsDriver({"resource_count": 5})
+
+    with pytest.raises(AssertionError, match="duration_ms"):
+        browser_metrics.capture_page_metrics(driver, "login.login", since=10.0, duration_ms=5000)
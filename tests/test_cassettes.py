@@ -0,0 +1,159 @@
+"""Tests for cassette record/replay against a local echo server"""
+
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from core.api_helper import assert_response_time, get_headers, get_latency_stats, make_api_request, reset_latency_stats
+from core.cassettes import (
+    CassetteLibrary,
+    CassetteMissError,
+    StubServer,
+    configure_cassettes,
+    request_key,
+    save_cassettes
+)
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    calls = 0
+
+    def _respond(self):
+        _EchoHandler.calls += 1
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        data = json.dumps({"path": self.path, "body": body}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+class _LoginHandler(BaseHTTPRequestHandler):
+    """Hands out a token and session cookie on login; /me answers per Authorization header"""
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        if self.path.endswith("/auth/login"):
+            data = {"token": "live-secret-token", "refresh_token": "live-refresh", "expires_in": 3600}
+        else:
+            data = {"authorized": self.headers.get("Authorization") == "Bearer live-secret-token"}
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Set-Cookie", "sid=live-session-cookie; Path=/; HttpOnly")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def echo_url():
+    server = _serve(_EchoHandler)
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def login_url():
+    server = _serve(_LoginHandler)
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cassette_dir(tmp_path):
+    yield tmp_path
+    configure_cassettes("off")
+
+
+def test_record_then_replay_without_server(echo_url, cassette_dir):
+    configure_cassettes("record", directory=cassette_dir)
+    live = make_api_request("POST", f"{echo_url}/api/v1/auth/login", payload={"email": "a@b.c"})
+    make_api_request("GET", f"{echo_url}/api/v1/users/5?b=2&a=1")
+    save_cassettes()
+    assert sorted(p.name for p in (cassette_dir / "dev").iterdir()) == ["authentication.json", "users.json"]
+
+    calls = _EchoHandler.calls
+    configure_cassettes("replay", latency=5, directory=cassette_dir)
+    # Matching ignores the host, so replay works with the server unreachable
+    replayed = make_api_request("POST", "http://127.0.0.1:9/api/v1/auth/login", payload={"email": "a@b.c"})
+    reordered = make_api_request("GET", "http://127.0.0.1:9/api/v1/users/5?a=1&b=2")
+
+    assert _EchoHandler.calls == calls
+    assert replayed.json() == live.json()
+    assert reordered.json()["path"] == "/api/v1/users/5?b=2&a=1"
+    assert replayed.timings["ttfb_ms"] >= 5
+    with pytest.raises(CassetteMissError):
+        make_api_request("POST", "http://127.0.0.1:9/api/v1/auth/login", payload={"email": "other"})
+
+
+def test_stub_server_serves_cassettes(echo_url, cassette_dir):
+    configure_cassettes("record", directory=cassette_dir)
+    make_api_request("GET", f"{echo_url}/api/v1/products/PROD-001")
+    save_cassettes()
+
+    server = StubServer(CassetteLibrary("dev", cassette_dir)).start()
+    try:
+        # Accept/Content-Type are part of the match, so send the headers the recording used
+        response = requests.get(f"{server.url}/api/v1/products/PROD-001", headers=get_headers())
+        assert response.json()["path"] == "/api/v1/products/PROD-001"
+        assert requests.get(f"{server.url}/api/v1/products/unknown").status_code == 599
+    finally:
+        server.stop()
+
+
+def test_key_includes_selected_headers():
+    base = request_key("GET", "/api/v1/users/me", headers={"Accept": "application/json", "X-Request-ID": "1"})
+
+    assert base == request_key("GET", "/api/v1/users/me", headers={"accept": "application/json", "X-Request-ID": "2"})
+    assert base != request_key("GET", "/api/v1/users/me", headers={"Accept": "text/csv"})
+    assert base != request_key("GET", "/api/v1/users/me", headers={"Accept": "application/json", "Authorization": "Bearer a"})
+
+
+def test_credentials_redacted_and_replays_not_timed(login_url, cassette_dir):
+    configure_cassettes("record", directory=cassette_dir)
+    token = make_api_request("POST", f"{login_url}/api/v1/auth/login", payload={"email": "a@b.c"}).json()["token"]
+    make_api_request("GET", f"{login_url}/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+    save_cassettes()
+
+    stored = "".join(path.read_text() for path in (cassette_dir / "dev").iterdir())
+    assert "live-secret-token" not in stored and "live-refresh" not in stored and "live-session-cookie" not in stored
+
+    configure_cassettes("replay", directory=cassette_dir)
+    reset_latency_stats()
+    login = make_api_request("POST", "http://127.0.0.1:9/api/v1/auth/login", payload={"email": "a@b.c"})
+    replayed_token = login.json()["token"]
+    assert replayed_token.startswith("redacted-")
+    # The redacted token still matches the request recorded with the live one
+    me = make_api_request("GET", "http://127.0.0.1:9/api/v1/users/me", headers={"Authorization": f"Bearer {replayed_token}"})
+
+    assert me.replayed and me.json()["authorized"]
+    assert get_latency_stats() == {}
+    login.timings["total_ms"] = 10_000
+    assert_response_time(login, "login_success")  # replayed, so the budget is not checked
@@ -0,0 +1,59 @@
+"""Tests for the process-wide YAML config cache"""
+
+import os
+
+from core.config_loader import load_yaml, get_cache_stats, clear_config_cache
+
+
+def test_config_cache_hits_and_isolation(tmp_path):
+    """Repeated loads are served from cache and return independent copies"""
+    clear_config_cache()
+    path = tmp_path / "sample.yaml"
+    path.write_text("user:\n  roles: [read]\n")
+
+    first = load_yaml(path)
+    first["user"]["roles"].append("write")
+    second = load_yaml(path)
+
+    assert second == {"user": {"roles": ["read"]}}, "Cached data should not be mutated by callers"
+    stats = get_cache_stats()
+    assert stats["misses"] == 1 and stats["hits"] == 1
+
+
+def test_config_cache_invalidated_on_change(tmp_path):
+    """Changing a file on disk forces a re-parse"""
+    clear_config_cache()
+    path = tmp_path / "sample.yaml"
+    path.write_text("value: 1\n")
+    assert load_yaml(path)["value"] == 1
+
+    path.write_text("value: 22\n")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_yaml(path)["value"] == 22
+    assert get_cache_stats()["misses"] == 2
+
+
+def test_config_snapshot_fresh_and_stale(tmp_path, monkeypatch):
+    """Fresh snapshot entries are served as-is, stale ones fall back to YAML"""
+    from core import config_loader
+    from core.config_loader import load_env_config, read_yaml_file, BASE_DIR
+    from core.config_snapshot import compile_snapshot
+    import pickle
+
+    snapshot_path = tmp_path / "snapshot.pickle"
+    monkeypatch.setattr(config_loader, "SNAPSHOT_PATH", snapshot_path)
+    snapshot = compile_snapshot(snapshot_path)
+
+    clear_config_cache()
+    assert load_env_config("dev") == read_yaml_file(BASE_DIR / "config" / "env" / "dev.yaml")
+
+    # Pretend dev.yaml changed since the snapshot was compiled
+    entry = snapshot["files"]["config/env/dev.yaml"]
+    entry.update(stamp=(0, 0), sha1="outdated", data={"base_url": "stale"})
+    snapshot_path.write_bytes(pickle.dumps(snapshot))
+
+    clear_config_cache()
+    assert load_env_config("dev")["base_url"] != "stale"
+    clear_config_cache()
@@ -0,0 +1,45 @@
+"""Tests for the data_matrix plugin and its pairwise/product expansion"""
+
+from itertools import combinations
+
+import pytest
+
+from core.data_matrix import MatrixAxis, MatrixPlan, pairwise_rows
+
+
+@pytest.mark.data_matrix(
+    form="forms:registration_form.invalid_data",
+    email="api/test_data:emails.invalid_emails",
+)
+def test_matrix_case_values(matrix_case):
+    """Every combination of invalid forms and emails arrives as its own case"""
+    assert set(matrix_case) == {"form", "email"}
+    assert isinstance(matrix_case["form"], dict)
+    assert matrix_case["email"] in ("notanemail", "@example.com", "test@", "")
+
+
+def test_pairwise_covers_every_pair():
+    sizes = [4, 3, 5, 2]
+    rows = pairwise_rows(sizes)
+
+    for i, j in combinations(range(len(sizes)), 2):
+        pairs = {(row[i], row[j]) for row in rows}
+        assert len(pairs) == sizes[i] * sizes[j]
+    assert len(rows) < 4 * 3 * 5 * 2
+
+
+def test_pairwise_with_empty_axis_has_no_rows():
+    assert pairwise_rows([2, 0, 3]) == []
+    assert pairwise_rows([0]) == []
+
+
+def test_large_product_is_decoded_lazily():
+    """30^3 cases only cost references; values and ids are decoded per case"""
+    axes = [MatrixAxis(name, [f"{name}{i}" for i in range(30)], list(range(30))) for name in "abc"]
+    plan = MatrixPlan(axes)
+
+    refs = plan.refs()
+
+    assert len(refs) == 27000
+    assert repr(refs[-1]) == "a29-b29-c29"
+    assert plan.case(30 * 30 + 31) == {"a": 1, "b": 1, "c": 1}
@@ -3,12 +3,17 @@
 import pytest
 from core.db_helper import (
     get_query,
+    compile_query,
     execute_query,
+    stream_query,
     execute_insert,
     get_test_data,
     verify_expected_count,
-    cleanup_test_data
+    cleanup_test_data,
+    seed_test_data,
+    cleanup_seeded_data
 )
+from core.db_assertions import compile_assertions, assert_db_state
 
 
 def test_db_connection(db_connection):
@@ -48,8 +53,8 @@ def test_db_get_user_by_email(db_queries):
         assert result["email"] == test_email, "Email should match"
 
 
-def test_db_insert_and_cleanup(db_queries, db_test_data):
-    """Test inserting test data and cleaning it up"""
+def test_db_insert_and_cleanup(db_queries, db_test_data, db_transaction):
+    """Test inserting test data; the db_transaction rollback cleans it up"""
     # Get insert query
     insert_query = get_query("insert_queries", "insert_user")
     assert insert_query is not None, "Insert user query should exist"
@@ -72,27 +77,56 @@ def test_db_insert_and_cleanup(db_queries, db_test_data):
                 "role": test_user["role"]
             }
         )
-        
-        if user_id:
-            # Verify user was inserted
-            get_query_sql = get_query("user_queries", "get_user_by_id")
-            if get_query_sql:
-                result = execute_query(
-                    get_query_sql.replace(":user_id", str(user_id)),
-                    fetch_one=True
-                )
-                assert result is not None, "Inserted user should be retrievable"
-            
-            # Cleanup: Delete the test user
-            delete_query = get_query("delete_queries", "delete_user")
-            if delete_query:
-                execute_query(
-                    delete_query.replace(":user_id", str(user_id)),
-                    fetch=False
-                )
     except Exception as e:
         # If insert fails (e.g., constraint violation), that's okay for example test
         pytest.skip(f"Insert test skipped due to: {str(e)}")
+    
+    if user_id:
+        # Verify user was inserted (visible inside the test transaction only)
+        get_query_sql = get_query("user_queries", "get_user_by_id")
+        result = execute_query(
+            get_query_sql,
+            params={"user_id": user_id},
+            fetch_one=True,
+            prepared=True
+        )
+        assert result is not None, "Inserted user should be retrievable"
+
+
+def test_db_bulk_seed_and_cleanup(db_test_data):
+    """Test bulk seeding a data set and removing it again"""
+    test_users = [
+        {**user, "email": f"test_bulk_{user['email']}"}
+        for user in get_test_data("users_to_insert")
+    ]
+    
+    try:
+        user_ids = seed_test_data("users_to_insert", method="copy", rows=test_users)
+    except Exception as e:
+        pytest.skip(f"Bulk seed test skipped due to: {str(e)}")
+    
+    try:
+        assert len(user_ids) == len(test_users), "Every seeded row should return an id"
+        
+        get_query_sql = get_query("user_queries", "get_user_by_id")
+        first_user = execute_query(get_query_sql, params={"user_id": user_ids[0]}, fetch_one=True)
+        assert first_user["email"] == test_users[0]["email"], "Ids should be returned in input order"
+    finally:
+        assert cleanup_seeded_data("users_to_insert", user_ids) == len(user_ids)
+
+
+def test_db_compile_named_query():
+    """Named :placeholders compile to psycopg2 and PREPARE forms, leaving literals alone"""
+    compiled = compile_query("SELECT * FROM users WHERE email LIKE '%:x' AND id = :user_id AND note::text = :user_id")
+    
+    assert compiled.param_names == ("user_id",)
+    assert compiled.text == "SELECT * FROM users WHERE email LIKE '%%:x' AND id = %(user_id)s AND note::text = %(user_id)s"
+    assert compiled.positional == "SELECT * FROM users WHERE email LIKE '%:x' AND id = $1 AND note::text = $1"
+    assert compile_query(compiled.source) is compiled, "Compiled queries should be cached"
+    
+    # Queries without placeholders are executed exactly as written
+    cleanup_query = get_query("cleanup_queries", "cleanup_test_users")
+    assert compile_query(cleanup_query).text == cleanup_query
 
 
 def test_db_verify_table_counts():
@@ -104,6 +138,23 @@ def test_db_verify_table_counts():
     # Note: Adjust table name and ranges based on your actual database schema
 
 
+def test_db_declared_table_counts():
+    """Test table counts declared in assertions.yaml (one query per table)"""
+    assert_db_state(names=["users_table", "products_table", "orders_table"])
+
+
+def test_db_compile_assertions():
+    """All rules for a table compile into a single aggregate query"""
+    compiled = {check.table: check for check in compile_assertions()}
+    
+    assert set(compiled) == {"users", "products", "orders"}
+    users = compiled["users"]
+    assert users.query.count("FROM") == 1, "Users rules should share one query"
+    assert ("count", "active_users", "row count", {"min": 1}) in users.checks
+    assert ("state", "user_after_registration", "status = 'active'", 0) in users.checks
+    assert compile_assertions() is compile_assertions(), "Compiled rules should be cached"
+
+
 def test_db_get_products_in_stock(db_queries):
     """Test getting products that are in stock"""
     query = get_query("product_queries", "get_products_in_stock")
@@ -118,6 +169,19 @@ def test_db_get_products_in_stock(db_queries):
             assert product.get("stock", 0) > 0, "All products should have stock > 0"
 
 
+def test_db_stream_products_in_stock(db_queries):
+    """Test streaming products through a server-side cursor"""
+    query = get_query("product_queries", "get_products_in_stock")
+    
+    streamed = 0
+    for product in stream_query(query, itersize=500, row_type="namedtuple"):
+        assert product.stock > 0, "All products should have stock > 0"
+        streamed += 1
+    
+    count = execute_query("SELECT COUNT(*) as count FROM products WHERE stock > 0", fetch_one=True)
+    assert streamed == count["count"], "Every matching row should be streamed"
+
+
 def test_db_cleanup_test_data(db_queries):
     """Test cleanup queries exist and can be executed"""
     cleanup_query = get_query("cleanup_queries", "cleanup_test_users")
@@ -0,0 +1,76 @@
+"""Tests for the database connection pool using in-memory fake connections"""
+
+import threading
+import time
+
+import pytest
+from psycopg2.pool import PoolError
+
+from core.db_pool import ConnectionPool
+
+
+class FakeConnection:
+    """Minimal stand-in for a DB-API connection"""
+
+    def __init__(self):
+        self.closed = 0
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+def _ping(conn):
+    if conn.closed:
+        raise RuntimeError("connection lost")
+
+
+def test_pool_reuses_and_overflows():
+    """Connections are reused; overflow connections are closed when returned"""
+    pool = ConnectionPool(FakeConnection, pool_size=1, max_overflow=1, timeout=0.1, ping=_ping)
+
+    first = pool.getconn()
+    second = pool.getconn()
+    assert first is not second
+    with pytest.raises(PoolError):
+        pool.getconn()
+
+    pool.putconn(second)
+    assert second.closed, "Overflow connection should be closed on return"
+    pool.putconn(first)
+    assert pool.getconn() is first, "Base connection should be reused"
+
+    metrics = pool.metrics()
+    assert metrics["connections_created"] == 2 and metrics["overflow_created"] == 1
+    assert metrics["timeouts"] == 1 and metrics["in_use_high_water"] == 2
+
+
+def test_pool_blocks_until_connection_returned():
+    """An exhausted pool waits for a returned connection instead of failing"""
+    pool = ConnectionPool(FakeConnection, pool_size=1, max_overflow=0, timeout=2, ping=_ping)
+    conn = pool.getconn()
+    threading.Timer(0.1, pool.putconn, args=(conn,)).start()
+
+    with pool.connection() as waited:
+        assert waited is conn
+    assert pool.metrics()["wait_time_max_ms"] >= 50
+
+
+def test_pool_replaces_dead_and_expired_connections():
+    """Pre-ping drops dead connections and recycle drops old ones"""
+    pool = ConnectionPool(FakeConnection, pool_size=2, max_overflow=0, recycle=0.05, ping=_ping)
+
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.close()
+    replacement = pool.getconn()
+    assert replacement is not conn
+    pool.putconn(replacement)
+
+    time.sleep(0.06)
+    assert pool.getconn() is not replacement
+    metrics = pool.metrics()
+    assert metrics["invalidated"] == 1 and metrics["recycled"] == 1
@@ -0,0 +1,114 @@
+"""Tests for the embedded SQLite dialect of db_helper (no database server needed)"""
+
+import threading
+
+import pytest
+
+from core import db_helper
+from core.db_helper import (
+    compile_query,
+    execute_insert,
+    execute_query,
+    get_db_override,
+    get_query,
+    seed_test_data,
+    set_db_override,
+    cleanup_seeded_data,
+    stream_query,
+    transaction_scope,
+)
+
+
+@pytest.fixture
+def sqlite_db():
+    if get_db_override() == "sqlite_example":
+        # The whole run uses the embedded database (--db sqlite_example)
+        yield
+        return
+    previous = get_db_override()
+    set_db_override("sqlite_example")
+    yield
+    # Closing the pools drops the in-memory database, so every test starts from the seed
+    set_db_override(previous)
+
+
+def test_compile_rewrites_postgres_constructs():
+    compiled = compile_query(
+        "UPDATE users SET updated_at = NOW(), note = 'NOW()::text' "
+        "WHERE email ILIKE :email AND id::int IN :ids",
+        dialect="sqlite",
+    )
+
+    assert compiled.text == (
+        "UPDATE users SET updated_at = CURRENT_TIMESTAMP, note = 'NOW()::text' "
+        "WHERE email LIKE :email AND id IN :ids"
+    )
+    assert compiled.param_names == ("email", "ids")
+    assert compiled.expand_names == ("ids",)
+
+
+def test_returning_is_emulated_without_sqlite_support(monkeypatch):
+    monkeypatch.setattr(db_helper, "SUPPORTS_RETURNING", False)
+    compiled = compile_query("INSERT INTO t (a) VALUES (:a)\nRETURNING id\n", dialect="sqlite")
+
+    assert compiled.text == "INSERT INTO t (a) VALUES (:a)"
+    assert compiled.emulate_returning
+
+
+def test_schema_and_seed_loaded_at_startup(sqlite_db):
+    counts = {
+        table: execute_query(f"SELECT COUNT(*) as count FROM {table}", fetch_one=True)["count"]
+        for table in ("users", "products", "orders")
+    }
+    assert counts == {"users": 3, "products": 3, "orders": 2}
+
+    in_stock = [row.sku for row in stream_query(get_query("product_queries", "get_products_in_stock"), row_type="namedtuple")]
+    assert in_stock == ["PROD-TEST-001", "PROD-TEST-002"]
+
+
+def test_insert_returning_rolled_back_with_transaction(sqlite_db):
+    with transaction_scope():
+        user_id = execute_insert(
+            get_query("insert_queries", "insert_user"),
+            params={"name": "Temp", "email": "temp@test.example.com", "password_hash": "x", "role": "user"},
+        )
+        row = execute_query(get_query("user_queries", "get_user_by_id"), params={"user_id": user_id}, fetch_one=True)
+        assert row["email"] == "temp@test.example.com"
+        assert row["created_at"] is not None
+
+    assert execute_query("SELECT * FROM users WHERE id = :id", params={"id": user_id}, fetch_one=True) is None
+
+
+def test_in_list_expansion_and_bulk_seed(sqlite_db):
+    rows = [{"name": f"Bulk {i}", "email": f"test_bulk_{i}@test.example.com", "password_hash": "x",
+             "role": "user", "status": "active"} for i in range(5)]
+    ids = seed_test_data("users_to_insert", rows=rows, method="copy")
+
+    found = execute_query("SELECT email FROM users WHERE id IN :ids ORDER BY id", params={"ids": ids[1:3]})
+    assert [row["email"] for row in found] == [rows[1]["email"], rows[2]["email"]]
+    assert execute_query("SELECT id FROM users WHERE id IN :ids", params={"ids": []}) == []
+    assert cleanup_seeded_data("users_to_insert", ids) == 5
+
+
+def test_transaction_not_joined_from_other_threads(sqlite_db):
+    """Only the thread that opened transaction_scope joins its connection"""
+    seen = {}
+    with transaction_scope() as conn:
+        worker = threading.Thread(target=lambda: seen.update(other=db_helper._active_transactions().get("dev")))
+        worker.start()
+        worker.join()
+        assert db_helper._active_transactions()["dev"][0] is conn
+    assert seen["other"] is None
+
+
+@pytest.mark.parametrize("supports_returning", [True, False], ids=["returning", "select_back"])
+def test_bulk_insert_returns_values_in_input_order(sqlite_db, monkeypatch, supports_returning):
+    monkeypatch.setattr(db_helper, "SUPPORTS_RETURNING", supports_returning)
+    rows = [{"name": f"Order {i}", "email": f"test_order_{i}@test.example.com", "password_hash": "x"} for i in (3, 1, 2)]
+    with transaction_scope():
+        emails = db_helper.bulk_insert("users", rows, returning="email")
+        ids = db_helper.bulk_insert("users", [{**row, "email": "x" + row["email"]} for row in rows])
+        found = execute_query("SELECT id, email FROM users WHERE id IN :ids", params={"ids": ids})
+
+    assert emails == [row["email"] for row in rows]
+    assert {row["id"]: row["email"] for row in found} == {i: "x" + row["email"] for i, row in zip(ids, rows)}
@@ -0,0 +1,23 @@
+"""Tests for performance profile resolution and Chrome options (no browser started)"""
+
+import pytest
+
+from core.driver_factory import build_chrome_options, resolve_performance_profile
+
+
+def test_profile_is_applied_to_chrome_options():
+    run_config = {"headless": True, "performance_profile": "fast", "window_size": [800, 600]}
+
+    profile = resolve_performance_profile(run_config)
+    options = build_chrome_options(run_config, profile)
+
+    assert options.page_load_strategy == "eager"
+    assert "--window-size=800,600" in options.arguments
+    assert "--disable-extensions" in options.arguments
+    assert options.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+    assert "*.woff2" in profile["blocked_urls"]
+
+
+def test_unknown_page_load_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_performance_profile({"page_load_strategy": "lazy"})
@@ -0,0 +1,92 @@
+"""Tests for the WebDriver pool using fake drivers (no browser required)"""
+
+from types import SimpleNamespace
+
+from core.driver_pool import DriverPool, apply_worker_count
+
+
+class FakeDriver:
+    """Records the calls DriverPool makes on a WebDriver"""
+
+    def __init__(self, run_config):
+        self.alive = True
+        self.quit_called = False
+        self.visited = []
+        self.cdp_commands = []
+        self.window_handles = ["main"]
+        self.switch_to = self
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+        return self.visited[-1] if self.visited else "data:,"
+
+    def window(self, handle):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_commands.append((cmd, params))
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_reuses_and_resets_driver():
+    """A released driver is reset to about:blank and handed out again"""
+    pool = DriverPool(
+        {"driver_pool": {"size": 1, "max_uses": 10}},
+        factory=FakeDriver,
+        origins=["https://app.example.test/", "https://api.example.test"],
+    )
+
+    first = pool.acquire()
+    first.get("https://sso.example.test/login?next=/")
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first
+    assert first.visited[-1] == "about:blank"
+    commands = [cmd for cmd, _ in first.cdp_commands]
+    assert commands[0] == "Network.clearBrowserCookies"
+    assert "Network.clearBrowserCache" not in commands, "The HTTP cache should stay warm"
+    cleared = [params["origin"] for cmd, params in first.cdp_commands if cmd == "Storage.clearDataForOrigin"]
+    assert cleared == ["https://app.example.test", "https://api.example.test", "https://sso.example.test"]
+    assert pool.metrics()["launched"] == 1
+    assert pool.metrics()["reused"] == 1
+
+
+def test_pool_recycles_worn_out_and_crashed_drivers():
+    """Drivers are quit after max_uses or when they stop responding"""
+    pool = DriverPool({"driver_pool": {"size": 1, "max_uses": 1}}, factory=FakeDriver)
+
+    worn_out = pool.acquire()
+    pool.release(worn_out)
+    assert worn_out.quit_called
+
+    pool.max_uses = 10
+    crashed = pool.acquire()
+    pool.release(crashed)
+    crashed.alive = False
+    replacement = pool.acquire()
+
+    assert replacement is not crashed
+    assert crashed.quit_called
+    metrics = pool.metrics()
+    assert metrics["recycled"] == 1
+    assert metrics["crashed"] == 1
+    assert metrics["launched"] == 3
+
+
+def test_worker_count_sets_xdist_gateways():
+    """The run config's workers also builds xdist's tx list, which xdist derived before conftest ran"""
+    option = SimpleNamespace(numprocesses=None, maxprocesses=None, dist="no", tx=[])
+    apply_worker_count(option, 4)
+    assert (option.numprocesses, option.dist, option.tx) == (4, "load", ["popen"] * 4)
+
+    capped = SimpleNamespace(numprocesses=None, maxprocesses=2, dist="loadfile", tx=[])
+    apply_worker_count(capped, 4)
+    assert (capped.numprocesses, capped.dist, capped.tx) == (2, "loadfile", ["popen", "popen"])
@@ -0,0 +1,84 @@
+"""Tests for multi-environment fan-out: argument rewriting and report merging"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from core.env_fanout import (
+    child_command,
+    clear_env_reports,
+    format_comparison,
+    load_latency,
+    load_results,
+    merge_reports,
+    parse_env_option,
+    strip_per_env_options,
+)
+
+
+def _write_results(path: Path, outcomes):
+    cases = []
+    for name, outcome in outcomes.items():
+        inner = {"passed": "", "failed": "<failure message='boom'/>", "skipped": "<skipped/>"}[outcome]
+        cases.append(f'<testcase classname="tests.test_api" name="{name}" time="0.5">{inner}</testcase>')
+    path.write_text(f'<testsuites><testsuite name="pytest">{"".join(cases)}</testsuite></testsuites>')
+
+
+def _write_latency(path: Path, endpoints):
+    path.write_text(json.dumps({
+        "env": path.stem,
+        "endpoints": {
+            endpoint: {"count": count, "total_ms": {"count": count, "p50": p50, "p95": p95, "max": p95}}
+            for endpoint, (count, p50, p95) in endpoints.items()
+        }
+    }))
+
+
+def test_parse_env_option():
+    assert parse_env_option("dev") == ["dev"]
+    assert parse_env_option("dev, stage,dev") == ["dev", "stage"]
+    with pytest.raises(ValueError):
+        parse_env_option(" , ")
+
+
+def test_child_command_replaces_per_env_options(tmp_path):
+    args = ["tests/test_api_example.py", "--env", "dev,stage", "--latency-report=old.json", "--junitxml", "x.xml", "-q"]
+
+    assert strip_per_env_options(args) == ["tests/test_api_example.py", "-q"]
+    command = child_command(args, "stage", tmp_path)
+    assert command[command.index("--env") + 1] == "stage"
+    assert command[command.index("--latency-report") + 1] == str(tmp_path / "api_latency.stage.json")
+    assert command[command.index("--junitxml") + 1] == str(tmp_path / "results.stage.xml")
+
+
+def test_merge_reports_side_by_side(tmp_path):
+    _write_results(tmp_path / "results.dev.xml", {"test_login": "passed", "test_get_user": "passed"})
+    _write_results(tmp_path / "results.stage.xml", {"test_login": "passed", "test_get_user": "failed"})
+    _write_latency(tmp_path / "api_latency.dev.json", {"POST /api/v1/auth/login": (4, 10.0, 20.0)})
+    _write_latency(tmp_path / "api_latency.stage.json", {"POST /api/v1/auth/login": (4, 30.0, 60.0)})
+
+    comparison = merge_reports(["dev", "stage"], tmp_path, runs={"dev": {"returncode": 0}, "stage": {"returncode": 1}})
+
+    assert comparison["summary"]["dev"]["passed"] == 2
+    assert comparison["summary"]["stage"]["failed"] == 1
+    assert comparison["differing_tests"] == ["tests.test_api::test_get_user"]
+    assert comparison["endpoints"]["POST /api/v1/auth/login"]["stage"]["p95"] == 60.0
+
+    lines = format_comparison(comparison)
+    assert "stage: passed: 1, failed: 1, error: 0, skipped: 0, exit code 1" in lines
+    assert "  tests.test_api::test_get_user: passed | failed" in lines
+    assert "  POST /api/v1/auth/login: 10.0/20.0 | 30.0/60.0" in lines
+
+
+def test_stale_reports_cleared_before_run(tmp_path):
+    """Reports of an earlier run are removed so a crashed run shows up as missing data"""
+    _write_results(tmp_path / "results.dev.xml", {"test_login": "passed"})
+    _write_latency(tmp_path / "api_latency.dev.json", {"GET /api/v1/users": (1, 10.0, 10.0)})
+    _write_latency(tmp_path / "api_latency.stage.json", {"GET /api/v1/users": (1, 10.0, 10.0)})
+
+    clear_env_reports(tmp_path, "dev")
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["api_latency.stage.json"]
+    assert load_latency(tmp_path / "api_latency.dev.json") == {}
+    assert load_results(tmp_path / "results.dev.xml") == {}
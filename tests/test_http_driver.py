@@ -0,0 +1,109 @@
+"""Tests for the browserless http driver backend against a local stub app"""
+
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from core import http_driver
+from core.http_driver import HttpDriver
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+
+SIGNIN_PAGE = """
+<html><head><title>Sign in</title></head><body>
+  <form action="/session" method="post">
+    <input type="email" name="email" placeholder="Enter your email">
+    <input type="password" name="password">
+    <button type="submit">Log In</button>
+  </form>
+  <p class="hint error">Use your work <b>email</b></p>
+</body></html>
+"""
+
+
+class _StubAppHandler(BaseHTTPRequestHandler):
+    """Serves a sign-in page, its form target and a JSON login API"""
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, content_type, body):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._send(200, "text/html", SIGNIN_PAGE)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode()
+        if self.path == "/session":
+            email = parse_qs(body)["email"][0]
+            self._send(200, "text/html", f"<html><body><h1>Welcome {email}</h1></body></html>")
+        elif json.loads(body)["password"] == "Test@123":
+            self._send(200, "application/json", json.dumps({"token": "abc"}))
+        else:
+            self._send(401, "application/json", json.dumps({"message": "Invalid credentials"}))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_app_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubAppHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def http_driver_instance(stub_app_url, monkeypatch):
+    monkeypatch.setattr(http_driver, "get_full_url", lambda env, group, name: f"{stub_app_url}/api/v1/auth/login")
+    driver = HttpDriver({"backend": "http"})
+    yield driver
+    driver.quit()
+
+
+def test_selector_subset_and_form_post(http_driver_instance, stub_app_url):
+    """XPath/CSS locators resolve on parsed HTML and submit posts the form"""
+    driver = http_driver_instance
+    page = BasePage(driver, stub_app_url)
+    page.open("/signin")
+
+    assert driver.title == "Sign in"
+    assert driver.find_element(By.XPATH, LoginPage.EMAIL_INPUT[1]).get_attribute("name") == "email"
+    assert driver.find_element(By.CSS_SELECTOR, "form input[type='password']").get_attribute("name") == "password"
+    assert driver.find_element(*LoginPage.ERROR_MESSAGE).text == "Use your work email"
+
+    page.find_first("email", LoginPage.EMAIL_CANDIDATES).send_keys("user@example.com")
+    page.find_first("login_button", LoginPage.LOGIN_BUTTON_CANDIDATES, clickable=True).click()
+
+    assert driver.find_element(By.TAG_NAME, "h1").text == "Welcome user@example.com"
+
+
+@pytest.mark.parametrize("password, logged_in", [("Test@123", True), ("WrongPassword", False)])
+def test_login_page_over_form_overlay(http_driver_instance, stub_app_url, password, logged_in):
+    """LoginPage runs unchanged on the declared /login overlay without waiting"""
+    page = LoginPage(http_driver_instance, stub_app_url)
+    page.open_login()
+    page.login("pavan1504@yopmail.com", password)
+
+    assert page.is_logged_in() is logged_in
+    assert page.get_error_text() == ("" if logged_in else "Invalid credentials")
+
+
+def test_stale_preferred_index_ignored(http_driver_instance, stub_app_url):
+    """A learned index past the end of a shorter candidate list falls back to the declared order"""
+    driver = http_driver_instance
+    BasePage(driver, stub_app_url).open("/signin")
+    candidates = [["css", "input[name='missing']"], ["css", "input[type='password']"]]
+
+    index, element, path = driver.find_first_candidate(candidates, {"/signin": 5}, clickable=False)
+    assert index == 1 and element.get_attribute("name") == "password"
@@ -0,0 +1,101 @@
+"""Tests for per-phase request timings and the latency stats against a local stub server"""
+
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from core import http_timing
+from core.api_helper import (
+    create_session,
+    get_latency_records,
+    get_latency_stats,
+    make_api_request,
+    merge_latency_records,
+    record_latency,
+    reset_latency_stats,
+)
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """Answer after a fixed delay"""
+    protocol_version = "HTTP/1.1"
+    delay = 0.2
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    reset_latency_stats()
+    yield f"http://127.0.0.1:{server.server_port}"
+    reset_latency_stats()
+    server.shutdown()
+    server.server_close()
+
+
+def _timings(total_ms: float) -> dict:
+    return {"dns_ms": 0.0, "connect_ms": 0.0, "tls_ms": 0.0, "ttfb_ms": total_ms, "total_ms": total_ms}
+
+
+def test_request_timings_recorded(stub_base_url):
+    """Responses carry phase timings and are aggregated per endpoint template"""
+    session = create_session("dev")
+    first = make_api_request("GET", f"{stub_base_url}/api/v1/users/1", session=session)
+    second = make_api_request("GET", f"{stub_base_url}/api/v1/users/2", session=session)
+    session.close()
+
+    assert first.timings["connect_ms"] > 0, "First request should open a connection"
+    assert second.timings["connect_ms"] == 0, "Second request should reuse the connection"
+    assert first.timings["tls_ms"] == 0
+    assert first.timings["ttfb_ms"] >= _SlowHandler.delay * 1000
+    assert first.timings["ttfb_ms"] + first.timings["connect_ms"] <= first.timings["total_ms"] + 1
+
+    stats = get_latency_stats()["GET /api/v1/users/{user_id}"]
+    assert stats["count"] == 2 and stats["status_codes"] == {"200": 2}
+
+
+def test_loopback_requests_left_out_of_report(stub_base_url):
+    make_api_request("GET", f"{stub_base_url}/api/v1/users/1")
+    record_latency("GET", "https://api.example.com/api/v1/users/2", _timings(50.0), 200)
+
+    assert get_latency_stats()["GET /api/v1/users/{user_id}"]["count"] == 2
+    assert get_latency_stats(include_loopback=False)["GET /api/v1/users/{user_id}"]["count"] == 1
+
+
+def test_worker_records_merged():
+    """Records sent by xdist workers are summarized together with the controller's own"""
+    reset_latency_stats()
+    record_latency("GET", "https://api.example.com/api/v1/users/1", _timings(10.0), 200)
+    worker_records = get_latency_records()
+    merge_latency_records(worker_records)
+
+    stats = get_latency_stats(include_loopback=False)["GET /api/v1/users/{user_id}"]
+    reset_latency_stats()
+    assert stats["count"] == 2
+
+
+def test_unrecorded_requests_left_out_of_stats(stub_base_url):
+    make_api_request("GET", f"{stub_base_url}/api/v1/users/1", record=False)
+    assert get_latency_stats() == {}
+
+
+def test_stats_without_connection_phases(stub_base_url, monkeypatch):
+    """Without the urllib3 hooks, responses carry only ttfb/total and the stats still build"""
+    monkeypatch.setattr(http_timing, "TIMING_SUPPORTED", False)
+    response = make_api_request("GET", f"{stub_base_url}/api/v1/users/1")
+
+    assert set(response.timings) == {"ttfb_ms", "total_ms"}
+    stats = get_latency_stats()["GET /api/v1/users/{user_id}"]
+    assert stats["total_ms"]["count"] == 1 and stats["dns_ms"] == {"count": 0}
@@ -0,0 +1,48 @@
+"""Tests for BasePage.find_first using a scripted fake driver"""
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from pages.base_page import BasePage, clear_locator_cache, get_locator_stats
+
+
+class ScriptedDriver:
+    """Answers find_first's script with queued results and records its arguments"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute_script(self, script, candidates, preferred, clickable):
+        self.calls.append((candidates, preferred))
+        return self.results.pop(0) if self.results else None
+
+
+CANDIDATES = [(By.CSS_SELECTOR, "input[type='email']"), (By.NAME, "email")]
+
+
+@pytest.fixture(autouse=True)
+def fresh_locator_cache():
+    clear_locator_cache()
+    yield
+    clear_locator_cache()
+
+
+def test_find_first_learns_winning_candidate():
+    """The matching candidate index is sent as the preferred one on the next lookup"""
+    driver = ScriptedDriver([[1, "element", "/login"], [1, "element", "/login"]])
+    page = BasePage(driver, "https://app.example.test")
+
+    assert page.find_first("email", CANDIDATES) == "element"
+    assert page.find_first("email", CANDIDATES) == "element"
+
+    assert driver.calls[0][0] == [["css", "input[type='email']"], ["css", "[name='email']"]]
+    assert driver.calls[1][1] == {"/login": 1}
+    assert get_locator_stats()["cache_hits"] == 1
+
+
+def test_find_first_times_out():
+    page = BasePage(ScriptedDriver([]), "https://app.example.test")
+    with pytest.raises(TimeoutException):
+        page.find_first("email", CANDIDATES, timeout=0)
@@ -0,0 +1,69 @@
+"""Tests for compiled response validators (no API calls)"""
+
+import json
+
+import pytest
+import requests
+
+from core import response_validator
+from core.response_validator import assert_response_matches, clear_response_validators, validate_response
+
+
+def _response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode() if body is not None else b""
+    return response
+
+
+def _user(i):
+    return {
+        "id": f"00000000-0000-4000-8000-{i:012d}",
+        "name": f"User {i}",
+        "email": f"user{i}@example.com",
+        "role": "user",
+        "created_at": "2024-01-31T12:00:00Z",
+    }
+
+
+def test_large_list_body_reports_every_mismatch():
+    users = [_user(i) for i in range(5000)]
+    users[10]["id"] = "not-a-uuid"
+    users[4000]["created_at"] = "yesterday"
+    del users[4999]["email"]
+
+    errors = validate_response(_response(200, {"users": users, "total": "5000"}), "list_users_success")
+
+    assert errors == [
+        "body.users[10].id: expected uuid_format, got 'not-a-uuid'",
+        "body.users[4000].created_at: expected iso_datetime_format, got 'yesterday'",
+        "body.users[4999].email: missing",
+        "body.total: expected integer, got '5000'",
+    ]
+
+
+def test_exact_values_status_and_empty_bodies():
+    failure = {"error": "Invalid credentials", "error_code": "AUTH_001", "message": "Email or password is incorrect"}
+    assert_response_matches(_response(401, failure), "login_failure")
+    assert_response_matches(_response(204, None), "delete_user_success")
+
+    with pytest.raises(AssertionError, match="status_code: expected 401, got 400") as error:
+        assert_response_matches(_response(400, {**failure, "error_code": "AUTH_009"}), "login_failure")
+    assert "body.error_code: expected 'AUTH_001', got 'AUTH_009'" in str(error.value)
+
+
+def test_validator_recompiled_when_config_changes(monkeypatch):
+    stamp = [(1, 1)]
+    expected = {"status_code": 200, "response_body": {"state": "old"}}
+    monkeypatch.setattr(response_validator, "config_stamp", lambda path: stamp[0])
+    monkeypatch.setattr(response_validator, "get_expected_response", lambda name: expected)
+    clear_response_validators()
+
+    assert validate_response(_response(200, {"state": "old"}), "test_versioned") == []
+    expected = {"status_code": 200, "response_body": {"state": "new"}}
+    assert validate_response(_response(200, {"state": "old"}), "test_versioned") == []
+    stamp[0] = (2, 1)
+    assert validate_response(_response(200, {"state": "old"}), "test_versioned") == [
+        "body.state: expected 'new', got 'old'"
+    ]
+    clear_response_validators()
@@ -0,0 +1,73 @@
+"""Tests for the session state cache that need no browser"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from core import session_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_cache, "SESSION_CACHE_DIR", tmp_path)
+    yield tmp_path
+    session_cache.clear_session_cache()
+
+
+def _state(expires_in):
+    return {
+        "origin": "https://app.example.test",
+        "url": "https://app.example.test/dashboard",
+        "cookies": [{"name": "sid", "value": "abc", "path": "/"}],
+        "local_storage": {"token": "t"},
+        "session_storage": {},
+        "captured_at": time.time(),
+        "expires_at": time.time() + expires_in,
+    }
+
+
+def test_cached_state_is_reused_from_disk(cache_dir):
+    """A fresh state on disk is returned without logging in"""
+    (cache_dir / "dev_valid_user.json").write_text(json.dumps(_state(600)))
+
+    state = session_cache.get_session_state("dev", "valid_user", "https://app.example.test/")
+
+    assert state["cookies"][0]["value"] == "abc"
+
+
+def test_expired_state_triggers_login(cache_dir):
+    """An expired state is ignored; UI login then needs a driver"""
+    (cache_dir / "dev_valid_user.json").write_text(json.dumps(_state(-1)))
+
+    with pytest.raises(ValueError, match="requires a driver"):
+        session_cache.get_session_state("dev", "valid_user", "https://app.example.test/")
+
+
+def test_state_after_login_redirect_is_fresh(cache_dir):
+    """A login that ended on another origin is still a hit for the base_url it started from"""
+    state = dict(_state(600), origin="https://sso.example.test", login_origin="https://app.example.test")
+    (cache_dir / "dev_valid_user.json").write_text(json.dumps(state))
+
+    assert session_cache.get_session_state("dev", "valid_user", "https://app.example.test/")["origin"] == "https://sso.example.test"
+    assert not list(cache_dir.glob("*.lock")), "Lock file should be released"
+
+
+def test_concurrent_logins_wait_for_lock(cache_dir):
+    """A second caller waits for the lock and reuses the state the first one wrote"""
+    from core.config_loader import file_lock
+
+    path = session_cache.session_cache_path("dev", "valid_user")
+    result = {}
+    with file_lock(path.with_suffix(".lock")):
+        waiter = threading.Thread(target=lambda: result.update(
+            state=session_cache.get_session_state("dev", "valid_user", "https://app.example.test/")
+        ))
+        waiter.start()
+        time.sleep(0.2)
+        assert "state" not in result
+        path.write_text(json.dumps(_state(600)))
+    waiter.join(5)
+
+    assert result["state"]["cookies"][0]["value"] == "abc"
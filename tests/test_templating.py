@@ -0,0 +1,65 @@
+"""Tests for compiled placeholder templates"""
+
+from core import api_helper
+from core.api_helper import build_url, get_headers
+from core.data_helper import replace_placeholders
+from core.templating import TemplateTree, compile_template, register_provider
+
+
+def test_headers_render_providers():
+    """Configured headers get their {timestamp} and {token} placeholders rendered"""
+    headers = get_headers(env="dev")
+    assert headers["X-Request-ID"].startswith("test-request-")
+    assert headers["X-Request-ID"][len("test-request-"):].isdigit()
+
+    auth_headers = get_headers(env="prod", header_type="authenticated_headers")
+    assert auth_headers["Authorization"] == "Bearer prod-bearer-token-REPLACE_IN_PRODUCTION"
+
+    assert get_headers(values={"timestamp": "fixed"})["X-Request-ID"] == "test-request-fixed"
+
+
+def test_static_subtrees_are_copied_and_unknown_placeholders_kept():
+    static_part = {"items": [{"sku": "A"}, {"sku": "B"}]}
+    data = {"order": static_part, "user": "{user_id}", "note": "{unknown} left as is", "ref": "{order-ref}"}
+
+    rendered = replace_placeholders(data, {"user_id": 42, "order-ref": "R1"})
+
+    assert rendered["user"] == "42"
+    assert rendered["note"] == "{unknown} left as is"
+    assert rendered["ref"] == "R1"
+    assert rendered["order"] == static_part and rendered["order"] is not static_part
+    rendered["order"]["items"].append({"sku": "C"})
+    assert len(static_part["items"]) == 2
+    assert build_url("https://api", "/api/v1/users/{user_id}/orders", {"user_id": 7}) == "https://api/api/v1/users/7/orders"
+
+
+def test_provider_called_once_per_render():
+    calls = []
+    register_provider("test_sequence", lambda context: calls.append(1) or len(calls))
+    tree = TemplateTree({"a": "{test_sequence}", "b": ["x-{test_sequence}"]})
+
+    assert tree.render() == {"a": "1", "b": ["x-1"]}
+    assert tree.render() == {"a": "2", "b": ["x-2"]}
+    assert compile_template("{a}-{b}").segments == ((True, "a"), (False, "-"), (True, "b"))
+
+
+def test_replace_placeholders_sees_changes_to_the_same_dict():
+    payload = {"email": "{e}", "name": "a"}
+    assert replace_placeholders(payload, {"e": "x"}) == {"email": "x", "name": "a"}
+
+    payload["name"] = "b"
+    payload["extra"] = 1
+    payload["email"] = "new-{e}"
+    assert replace_placeholders(payload, {"e": "y"}) == {"email": "new-y", "name": "b", "extra": 1}
+
+
+def test_header_templates_recompiled_when_config_changes(monkeypatch):
+    stamp = [(1, 1)]
+    monkeypatch.setattr(api_helper, "config_stamp", lambda path: stamp[0])
+    monkeypatch.setattr(api_helper, "_load_header_set", lambda env, header_type: {"X-Version": "v1"})
+    assert get_headers(env="dev", header_type="test_versioned")["X-Version"] == "v1"
+
+    monkeypatch.setattr(api_helper, "_load_header_set", lambda env, header_type: {"X-Version": "v2"})
+    assert get_headers(env="dev", header_type="test_versioned")["X-Version"] == "v1"
+    stamp[0] = (2, 1)
+    assert get_headers(env="dev", header_type="test_versioned")["X-Version"] == "v2"